@@ -1,3 +1,65 @@
+import importlib
 import logging
+import typing
 
-logging.basicConfig(level=logging.INFO)
\ No newline at end of file
+# Applications configure logging, the library only makes sure nothing is printed by default
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Public API is imported on first access (PEP 562), so ``import sqlprunr`` stays cheap and
+# heavy dependencies are loaded only by the functions that need them
+_API = {
+    "Column": "sqlprunr.data.generic",
+    "Database": "sqlprunr.data.generic",
+    "Schema": "sqlprunr.data.generic",
+    "Table": "sqlprunr.data.generic",
+    "Frequencies": "sqlprunr.data.query_data",
+    "QueryData": "sqlprunr.data.query_data",
+    "read_csv": "sqlprunr.data.loaders",
+    "read_query_data": "sqlprunr.data.loaders",
+    "SnowflakeCSVData": "sqlprunr.engine.parser",
+    "SnowflakeCSVTableParser": "sqlprunr.engine.parser",
+    "get_parser": "sqlprunr.engine.parser",
+    "TableResolver": "sqlprunr.engine.resolver",
+    "analyze_query": "sqlprunr.engine.analyzer",
+    "analyze_script": "sqlprunr.engine.analyzer",
+    "find_unused_columns": "sqlprunr.engine.analyzer",
+    "find_unused_tables": "sqlprunr.engine.analyzer",
+    "get_frequencies": "sqlprunr.engine.analyzer",
+    "get_time_spent": "sqlprunr.engine.analyzer",
+    "FrequencyStore": "sqlprunr.engine.store",
+    "run_batch": "sqlprunr.engine.batch",
+}
+
+__all__ = sorted(_API)
+
+if typing.TYPE_CHECKING:
+    from sqlprunr.data.generic import Column, Database, Schema, Table
+    from sqlprunr.data.loaders import read_csv, read_query_data
+    from sqlprunr.data.query_data import Frequencies, QueryData
+    from sqlprunr.engine.analyzer import (
+        analyze_query,
+        analyze_script,
+        find_unused_columns,
+        find_unused_tables,
+        get_frequencies,
+        get_time_spent,
+    )
+    from sqlprunr.engine.batch import run_batch
+    from sqlprunr.engine.parser import SnowflakeCSVData, SnowflakeCSVTableParser, get_parser
+    from sqlprunr.engine.resolver import TableResolver
+    from sqlprunr.engine.store import FrequencyStore
+
+
+def __getattr__(name: str) -> typing.Any:
+    module = _API.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    # Later lookups find the attribute directly and skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_API})
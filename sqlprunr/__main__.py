@@ -0,0 +1,5 @@
+import sys
+
+from sqlprunr.cli import main
+
+sys.exit(main())
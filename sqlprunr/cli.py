@@ -0,0 +1,174 @@
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+import typing
+
+from sqlprunr.data.loaders import read_query_data
+from sqlprunr.data.query_data import Frequencies
+from sqlprunr.engine.analyzer import find_unused_columns
+from sqlprunr.engine.batch import BatchProgress, CheckpointExistsError, run_batch
+from sqlprunr.engine.parser.dialects import available_dialects, get_parser
+from sqlprunr.engine.resolver import TableResolver
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m sqlprunr",
+        description="Find tables and columns that are never used in a query history.",
+    )
+    parser.add_argument("schema", help="Schema export in CSV (information_schema.columns)")
+    parser.add_argument("queries", help="Query history in CSV with QUERY_TEXT,START_TIME,END_TIME columns")
+    parser.add_argument(
+        "-o", "--output", default="sqlprunr-report", help="Directory of the reports (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--checkpoint", help="Path to the checkpoint, <output>/checkpoint.sqlite by default"
+    )
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument(
+        "--resume", action="store_true", help="Resume from the checkpoint of a previous run"
+    )
+    start.add_argument(
+        "--force",
+        action="store_true",
+        help="Remove the checkpoint of a previous run and start over",
+    )
+    parser.add_argument(
+        "--dialect",
+        default="snowflake",
+        choices=available_dialects(),
+        help="Dialect of the schema export and queries (default: %(default)s)",
+    )
+    parser.add_argument("--default-database", help="Database of references without a database")
+    parser.add_argument("--default-schema", help="Schema of references without a schema")
+    parser.add_argument(
+        "--chunk-size", type=int, default=10_000, help="Queries analyzed at once (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10,
+        help="Chunks between checkpoints (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1, help="Worker processes (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Write a checkpoint early when partial frequencies take more memory",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not report progress and warnings"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log debug messages")
+    return parser
+
+
+class _ProgressReporter:
+    """
+    Print progress to stderr, at most once per interval.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, progress: BatchProgress) -> None:
+        now = time.perf_counter()
+        if now - self._last < self.interval:
+            return
+        self._last = now
+        print(
+            f"{progress.processed} queries processed, {progress.throughput:.0f} queries/s, "
+            f"{progress.checkpoints} checkpoints",
+            file=sys.stderr,
+        )
+
+
+def _write_reports(
+    frequencies: Frequencies, resolver: TableResolver, output: str
+) -> typing.Tuple[int, int]:
+    os.makedirs(output, exist_ok=True)
+
+    unused_tables = resolver.unused(frequencies.tables.keys())
+    with open(os.path.join(output, "unused_tables.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["DATABASE_NAME", "SCHEMA_NAME", "TABLE_NAME", "COLUMN_COUNT"])
+        for key in unused_tables:
+            database, schema, table = resolver.get(key)
+            writer.writerow([database.name, schema.name, table.name, len(table.columns)])
+
+    unused_columns = find_unused_columns(frequencies, resolver)
+    with open(os.path.join(output, "unused_columns.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["TABLE", "COLUMN_NAME", "DATA_TYPE"])
+        for table, columns in unused_columns.items():
+            writer.writerows([table, column.name, column.data_type] for column in columns)
+
+    return len(unused_tables), sum(len(columns) for columns in unused_columns.values())
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """
+    Run the command line interface, see ``python -m sqlprunr --help``.
+
+    :param argv: Command line arguments, sys.argv by default
+    :return: Exit code
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.checkpoint_every < 1 or args.workers < 1:
+        parser.error("--chunk-size, --checkpoint-every and --workers must be positive")
+
+    if args.verbose:
+        level = logging.DEBUG
+    elif args.quiet:
+        level = logging.ERROR
+    else:
+        level = logging.WARNING
+    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
+
+    schema_parser = get_parser(args.dialect)
+    try:
+        databases = schema_parser.parse_csv(args.schema)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot read schema: {e}")
+
+    checkpoint = args.checkpoint or os.path.join(args.output, "checkpoint.sqlite")
+    os.makedirs(os.path.dirname(os.path.abspath(checkpoint)), exist_ok=True)
+    if args.force and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    try:
+        frequencies = run_batch(
+            read_query_data(args.queries),
+            checkpoint,
+            source=os.path.abspath(args.queries),
+            resume=args.resume,
+            chunk_size=args.chunk_size,
+            checkpoint_every=args.checkpoint_every,
+            workers=args.workers,
+            memory_budget=None if args.memory_budget is None else args.memory_budget * 2**20,
+            progress=None if args.quiet else _ProgressReporter(),
+        )
+    except CheckpointExistsError as e:
+        parser.error(f"{e}; use --resume to continue the checkpoint or --force to start over")
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    resolver = TableResolver(
+        databases,
+        default_database=args.default_database,
+        default_schema=args.default_schema,
+        dialect=schema_parser.dialect,
+    )
+    tables, columns = _write_reports(frequencies, resolver, args.output)
+    print(
+        f"{sum(frequencies.queries.values())} queries analyzed, {tables} unused tables and "
+        f"{columns} unused columns, reports written to {args.output}"
+    )
+    return 0
@@ -0,0 +1,375 @@
+import json
+import os
+import typing
+
+import numpy as np
+
+from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.data.query_data import Frequencies
+
+FORMAT = "sqlprunr.columnar"
+VERSION = 1
+
+Path = typing.Union[str, os.PathLike]
+
+
+class _StringTableBuilder:
+    """
+    Deduplicated strings stored as a single UTF-8 blob with offsets.
+    """
+
+    def __init__(self):
+        self.ids: typing.Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        return self.ids.setdefault(value, len(self.ids))
+
+    def add_all(self, values: typing.Iterable[str]) -> np.ndarray:
+        ids = [self.add(value) for value in values]
+        return np.asarray(ids, dtype=np.int32)
+
+    def arrays(self) -> typing.Dict[str, np.ndarray]:
+        encoded = [value.encode("utf-8") for value in self.ids]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return {
+            "strings": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "string_offsets": offsets,
+        }
+
+
+def _decode_strings(data: np.ndarray, offsets: np.ndarray) -> typing.List[str]:
+    blob = data.tobytes()
+    offsets = offsets.tolist()
+    text = blob.decode("utf-8")
+    if len(text) != len(blob):
+        # Byte offsets match character offsets only for ASCII
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+    return [text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def _write(path: Path, kind: str, arrays: typing.Dict[str, np.ndarray]) -> None:
+    os.makedirs(path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array, allow_pickle=False)
+
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"format": FORMAT, "version": VERSION, "kind": kind}, f)
+
+
+def _read(path: Path, kind: str, names: typing.Iterable[str]) -> typing.Dict[str, np.ndarray]:
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT or meta.get("kind") != kind:
+        raise ValueError(f"{path!r} does not contain columnar {kind}")
+    if meta.get("version", 0) > VERSION:
+        raise ValueError(f"{path!r} was written by a newer version (format version {meta['version']})")
+
+    return {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+        for name in names
+    }
+
+
+_SCHEMA_ARRAYS = (
+    "strings",
+    "string_offsets",
+    "database_names",
+    "database_schemas",
+    "schema_names",
+    "schema_tables",
+    "table_names",
+    "table_columns",
+    "column_names",
+    "column_types",
+)
+
+
+def save_databases(databases: typing.Iterable[Database], path: Path) -> None:
+    """
+    Save databases in a columnar, memory-mappable layout.
+
+    Names are stored once in a string table, every level of the tree is an array of name ids
+    with offsets into the next level.
+
+    :param databases: Databases to save
+    :param path: Directory to write the arrays to, created when missing
+    """
+    strings = _StringTableBuilder()
+    database_names, schema_names, table_names, column_names, column_types = [], [], [], [], []
+    database_schemas, schema_tables, table_columns = [0], [0], [0]
+
+    for database in databases:
+        database_names.append(strings.add(database.name))
+        for schema in database.schemas:
+            schema_names.append(strings.add(schema.name))
+            for table in schema.tables:
+                table_names.append(strings.add(table.name))
+                for column in table.columns:
+                    column_names.append(strings.add(column.name))
+                    column_types.append(strings.add(column.data_type))
+                table_columns.append(len(column_names))
+            schema_tables.append(len(table_names))
+        database_schemas.append(len(schema_names))
+
+    _write(
+        path,
+        "schema",
+        {
+            **strings.arrays(),
+            "database_names": np.asarray(database_names, dtype=np.int32),
+            "database_schemas": np.asarray(database_schemas, dtype=np.int64),
+            "schema_names": np.asarray(schema_names, dtype=np.int32),
+            "schema_tables": np.asarray(schema_tables, dtype=np.int64),
+            "table_names": np.asarray(table_names, dtype=np.int32),
+            "table_columns": np.asarray(table_columns, dtype=np.int64),
+            "column_names": np.asarray(column_names, dtype=np.int32),
+            "column_types": np.asarray(column_types, dtype=np.int32),
+        },
+    )
+
+
+class ColumnarSchema:
+    """
+    ColumnarSchema is a read-only sequence of databases backed by memory-mapped arrays.
+
+    Loading maps the files only, Database objects of the tree are built on first access and
+    kept afterwards. It can be used wherever a list of databases is expected.
+
+    :param arrays: Arrays written by save_databases
+    """
+
+    def __init__(self, arrays: typing.Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self._strings: typing.Optional[typing.List[str]] = None
+        self._databases: typing.List[typing.Optional[Database]] = [None] * len(
+            arrays["database_names"]
+        )
+
+    @property
+    def strings(self) -> typing.List[str]:
+        if self._strings is None:
+            self._strings = _decode_strings(self.arrays["strings"], self.arrays["string_offsets"])
+        return self._strings
+
+    def names(self) -> typing.List[str]:
+        """
+        Return names of the databases.
+        """
+        strings = self.strings
+        return [strings[i] for i in self.arrays["database_names"].tolist()]
+
+    def get_database(self, name: str) -> typing.Optional[Database]:
+        """
+        Return database with the given name or None, only this database is built.
+
+        :param name: Name of the database
+        """
+        try:
+            return self[self.names().index(name)]
+        except ValueError:
+            return None
+
+    def table_count(self) -> int:
+        """
+        Return number of tables in all databases, without building them.
+        """
+        return len(self.arrays["table_names"])
+
+    def column_count(self) -> int:
+        """
+        Return number of columns in all databases, without building them.
+        """
+        return len(self.arrays["column_names"])
+
+    def _build(self, position: int) -> Database:
+        arrays = self.arrays
+        strings = self.strings
+        schema_start, schema_stop = arrays["database_schemas"][position:position + 2].tolist()
+        table_offsets = arrays["schema_tables"][schema_start:schema_stop + 1].tolist()
+        column_offsets = arrays["table_columns"][table_offsets[0]:table_offsets[-1] + 1].tolist()
+        column_names = arrays["column_names"][column_offsets[0]:column_offsets[-1]].tolist()
+        column_types = arrays["column_types"][column_offsets[0]:column_offsets[-1]].tolist()
+        table_names = arrays["table_names"][table_offsets[0]:table_offsets[-1]].tolist()
+        schema_names = arrays["schema_names"][schema_start:schema_stop].tolist()
+
+        first_table, first_column = table_offsets[0], column_offsets[0]
+        schemas = []
+        for schema, name in enumerate(schema_names):
+            tables = []
+            for table in range(table_offsets[schema], table_offsets[schema + 1]):
+                local = table - first_table
+                columns = [
+                    Column(strings[column_names[i]], strings[column_types[i]])
+                    for i in range(
+                        column_offsets[local] - first_column,
+                        column_offsets[local + 1] - first_column,
+                    )
+                ]
+                tables.append(Table(strings[table_names[local]], columns))
+            schemas.append(Schema(strings[name], tables))
+
+        return Database(strings[int(arrays["database_names"][position])], schemas)
+
+    def __getitem__(self, position: int) -> Database:
+        database = self._databases[position]
+        if database is None:
+            database = self._databases[position] = self._build(position % len(self))
+        return database
+
+    def __iter__(self) -> typing.Iterator[Database]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def __len__(self) -> int:
+        return len(self._databases)
+
+    def to_databases(self) -> typing.List[Database]:
+        """
+        Build and return all databases.
+        """
+        return list(self)
+
+
+def load_databases(path: Path) -> ColumnarSchema:
+    """
+    Load databases saved with save_databases, arrays are memory-mapped.
+
+    :param path: Directory the databases were saved to
+    :raises ValueError: If the directory does not contain saved databases
+    """
+    return ColumnarSchema(_read(path, "schema", _SCHEMA_ARRAYS))
+
+
+_KINDS = ("tables", "columns", "queries")
+_FREQUENCY_ARRAYS = (
+    "strings",
+    "string_offsets",
+    *(f"{kind}_{part}" for kind in _KINDS for part in ("names", "counts")),
+    "table_column_tables",
+    "table_column_offsets",
+    "table_column_names",
+    "table_column_counts",
+)
+
+
+def save_frequencies(frequencies: Frequencies, path: Path) -> None:
+    """
+    Save frequencies in a columnar, memory-mappable layout, order of the entries is kept.
+
+    :param frequencies: Frequencies, FrequencyStore or loaded ColumnarFrequencies
+    :param path: Directory to write the arrays to, created when missing
+    """
+    strings = _StringTableBuilder()
+    arrays = {}
+    for kind in _KINDS:
+        counts = getattr(frequencies, kind)
+        arrays[f"{kind}_names"] = strings.add_all(counts.keys())
+        arrays[f"{kind}_counts"] = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+
+    table_columns = frequencies.table_columns
+    offsets = np.zeros(len(table_columns) + 1, dtype=np.int64)
+    np.cumsum([len(columns) for columns in table_columns.values()], out=offsets[1:])
+    arrays["table_column_tables"] = strings.add_all(table_columns.keys())
+    arrays["table_column_offsets"] = offsets
+    arrays["table_column_names"] = strings.add_all(
+        column for columns in table_columns.values() for column in columns
+    )
+    arrays["table_column_counts"] = np.fromiter(
+        (count for columns in table_columns.values() for count in columns.values()),
+        dtype=np.int64,
+        count=int(offsets[-1]),
+    )
+
+    _write(path, "frequencies", {**strings.arrays(), **arrays})
+
+
+class ColumnarFrequencies:
+    """
+    ColumnarFrequencies exposes frequencies backed by memory-mapped arrays.
+
+    ``tables``, ``columns``, ``queries`` and ``table_columns`` dicts are built on first access,
+    so it can be passed wherever Frequencies are expected. Counts are also available as arrays.
+
+    :param arrays: Arrays written by save_frequencies
+    """
+
+    def __init__(self, arrays: typing.Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self._strings: typing.Optional[typing.List[str]] = None
+        self._dicts: typing.Dict[str, dict] = {}
+
+    @property
+    def strings(self) -> typing.List[str]:
+        if self._strings is None:
+            self._strings = _decode_strings(self.arrays["strings"], self.arrays["string_offsets"])
+        return self._strings
+
+    def counts(self, kind: str) -> np.ndarray:
+        """
+        Return counts of ``tables``, ``columns`` or ``queries`` as an array, without building dicts.
+
+        :param kind: ``tables``, ``columns`` or ``queries``
+        """
+        return self.arrays[f"{kind}_counts"]
+
+    def _counts(self, kind: str) -> dict:
+        counts = self._dicts.get(kind)
+        if counts is None:
+            strings = self.strings
+            counts = self._dicts[kind] = {
+                strings[name]: count
+                for name, count in zip(
+                    self.arrays[f"{kind}_names"].tolist(), self.arrays[f"{kind}_counts"].tolist()
+                )
+            }
+        return counts
+
+    @property
+    def tables(self) -> dict:
+        return self._counts("tables")
+
+    @property
+    def columns(self) -> dict:
+        return self._counts("columns")
+
+    @property
+    def queries(self) -> dict:
+        return self._counts("queries")
+
+    @property
+    def table_columns(self) -> dict:
+        table_columns = self._dicts.get("table_columns")
+        if table_columns is None:
+            strings = self.strings
+            offsets = self.arrays["table_column_offsets"].tolist()
+            names = self.arrays["table_column_names"].tolist()
+            counts = self.arrays["table_column_counts"].tolist()
+            table_columns = self._dicts["table_columns"] = {
+                strings[table]: {
+                    strings[names[i]]: counts[i] for i in range(offsets[j], offsets[j + 1])
+                }
+                for j, table in enumerate(self.arrays["table_column_tables"].tolist())
+            }
+        return table_columns
+
+    def to_frequencies(self) -> Frequencies:
+        """
+        Build and return Frequencies.
+        """
+        return Frequencies(
+            tables=self.tables,
+            columns=self.columns,
+            queries=self.queries,
+            table_columns=self.table_columns,
+        )
+
+
+def load_frequencies(path: Path) -> ColumnarFrequencies:
+    """
+    Load frequencies saved with save_frequencies, arrays are memory-mapped.
+
+    :param path: Directory the frequencies were saved to
+    :raises ValueError: If the directory does not contain saved frequencies
+    """
+    return ColumnarFrequencies(_read(path, "frequencies", _FREQUENCY_ARRAYS))
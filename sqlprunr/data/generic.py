@@ -2,6 +2,62 @@ from dataclasses import dataclass
 import typing
 
 
+class _NameIndex:
+    """
+    Name to position index kept next to a list of named objects.
+
+    Items appended to the list directly are indexed lazily on the next lookup. The index is
+    rebuilt when the list is replaced or shrinks, when its last indexed item changes (e.g.
+    ``del items[0]`` followed by an append) and when a found position holds another name
+    (e.g. ``items[i] = item``). An item replaced in place by one with a new name is found
+    only after the list is reassigned.
+    """
+
+    __slots__ = ("_items", "_size", "_last", "_positions")
+
+    def __init__(self):
+        self._items = None
+        self._size = 0
+        self._last = None
+        self._positions = {}
+
+    def _sync(self, items: list, rebuild: bool = False) -> None:
+        if (
+            rebuild
+            or items is not self._items
+            or len(items) < self._size
+            or (self._size and items[self._size - 1].name != self._last)
+        ):
+            self._items = items
+            self._size = 0
+            self._positions = {}
+
+        for position in range(self._size, len(items)):
+            self._positions.setdefault(items[position].name, position)
+        self._size = len(items)
+        self._last = items[-1].name if items else None
+
+    def position(self, items: list, name: str) -> typing.Optional[int]:
+        self._sync(items)
+        position = self._positions.get(name)
+        if position is not None and items[position].name != name:
+            self._sync(items, rebuild=True)
+            position = self._positions.get(name)
+        return position
+
+    def get(self, items: list, name: str) -> typing.Optional[typing.Any]:
+        position = self.position(items, name)
+        return None if position is None else items[position]
+
+    def add(self, items: list, item: typing.Any, owner: str) -> typing.Any:
+        if self.position(items, item.name) is not None:
+            raise ValueError(f"{type(item).__name__} {item.name} already exists in {owner}")
+
+        items.append(item)
+        self._sync(items)
+        return item
+
+
 @dataclass
 class Database:
     """
@@ -10,12 +66,34 @@ class Database:
     :param name: Name of the database
     :param tables: List of tables in the database
     """
+    __slots__ = ("name", "schemas", "_schema_index")
+
     name: str
     schemas: typing.List["Schema"]
 
+    def __post_init__(self):
+        self._schema_index = _NameIndex()
+
     def __hash__(self):
         return hash(self.name)
 
+    def get_schema(self, name: str) -> typing.Optional["Schema"]:
+        """
+        Return schema with the given name or None, in constant time.
+
+        :param name: Name of the schema
+        """
+        return self._schema_index.get(self.schemas, name)
+
+    def add_schema(self, schema: "Schema") -> "Schema":
+        """
+        Add schema to the database and return it.
+
+        :param schema: Schema to add
+        :raises ValueError: If schema with the same name already exists
+        """
+        return self._schema_index.add(self.schemas, schema, self.name)
+
 
 @dataclass
 class Schema:
@@ -24,12 +102,34 @@ class Schema:
 
     :param name: Name of the column
     """
+    __slots__ = ("name", "tables", "_table_index")
+
     name: str
     tables: typing.List["Table"]
 
+    def __post_init__(self):
+        self._table_index = _NameIndex()
+
     def __hash__(self):
         return hash(self.name)
 
+    def get_table(self, name: str) -> typing.Optional["Table"]:
+        """
+        Return table with the given name or None, in constant time.
+
+        :param name: Name of the table
+        """
+        return self._table_index.get(self.tables, name)
+
+    def add_table(self, table: "Table") -> "Table":
+        """
+        Add table to the schema and return it.
+
+        :param table: Table to add
+        :raises ValueError: If table with the same name already exists
+        """
+        return self._table_index.add(self.tables, table, self.name)
+
 
 @dataclass
 class Table:
@@ -39,12 +139,42 @@ class Table:
     :param name: Name of the table
     :param columns: List of columns in the table
     """
+    __slots__ = ("name", "columns", "_column_index")
+
     name: str
     columns: typing.List["Column"]
 
+    def __post_init__(self):
+        self._column_index = _NameIndex()
+
     def __hash__(self):
         return hash(self.name)
 
+    def get_column(self, name: str) -> typing.Optional["Column"]:
+        """
+        Return column with the given name or None, in constant time.
+
+        :param name: Name of the column
+        """
+        return self._column_index.get(self.columns, name)
+
+    def column_position(self, name: str) -> typing.Optional[int]:
+        """
+        Return position of the column with the given name or None, in constant time.
+
+        :param name: Name of the column
+        """
+        return self._column_index.position(self.columns, name)
+
+    def add_column(self, column: "Column") -> "Column":
+        """
+        Add column to the table and return it.
+
+        :param column: Column to add
+        :raises ValueError: If column with the same name already exists
+        """
+        return self._column_index.add(self.columns, column, self.name)
+
 
 @dataclass(frozen=True)
 class Column:
@@ -53,8 +183,18 @@ class Column:
 
     :param name: Name of the column
     """
+    __slots__ = ("name", "data_type")
+
     name: str
     data_type: str
 
     def __hash__(self):
         return hash(self.name)
+
+    def __getstate__(self):
+        return self.name, self.data_type
+
+    def __setstate__(self, state):
+        # Frozen dataclass with slots cannot be restored with setattr
+        object.__setattr__(self, "name", state[0])
+        object.__setattr__(self, "data_type", state[1])
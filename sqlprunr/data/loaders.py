@@ -0,0 +1,152 @@
+import csv
+import dataclasses
+import os
+import typing
+
+from sqlprunr.data.query_data import QueryData
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+T = typing.TypeVar("T")
+
+Source = typing.Union[str, os.PathLike, typing.TextIO]
+
+
+def _read_rows(
+    source: Source, record_type: typing.Type[T], file: typing.TextIO
+) -> typing.Iterator[T]:
+    reader = csv.DictReader(file)
+    if reader.fieldnames is None:
+        return
+
+    keys = _record_keys(source, record_type, reader.fieldnames)
+    for row in reader:
+        yield record_type(**{key: row[key] for key in keys})
+
+
+def _record_keys(
+    source: typing.Any, record_type: typing.Type[T], fieldnames: typing.Sequence[str]
+) -> typing.List[str]:
+    field_names = {field.name for field in dataclasses.fields(record_type)}
+    missing = field_names.difference(fieldnames)
+    if missing:
+        raise ValueError(
+            f"CSV file {source!r} is missing columns required by {record_type.__name__}: {sorted(missing)}"
+        )
+
+    # Exports often carry more columns than the record needs, they are skipped
+    return [name for name in fieldnames if name in field_names]
+
+
+def read_csv(source: Source, record_type: typing.Type[T]) -> typing.Iterator[T]:
+    """
+    Lazily read records from a CSV file, one row at a time.
+
+    :param source: Path to the CSV file or an opened file object
+    :param record_type: Dataclass created from every row, e.g. QueryData or SnowflakeCSVData
+    :return: Iterator of records
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", newline="", encoding="utf-8-sig") as f:
+            yield from _read_rows(source, record_type, f)
+    else:
+        yield from _read_rows(source, record_type, source)
+
+
+def read_query_data(source: Source) -> typing.Iterator[QueryData]:
+    """
+    Lazily read query history exported as CSV with QUERY_TEXT,START_TIME,END_TIME columns.
+
+    :param source: Path to the CSV file or an opened file object
+    :return: Iterator of QueryData
+    """
+    return read_csv(source, QueryData)
+
+
+class _RecordAssembler:
+    """
+    Assemble records from CSV lines arriving one at a time, the first record is the header.
+    """
+
+    def __init__(self, source: typing.Any, record_type: typing.Type[T]):
+        self.source = source
+        self.record_type = record_type
+        self.keys = None
+        self.positions = None
+        self.lines = []
+        self.quotes = 0
+
+    def feed(self, line: str) -> typing.Optional[T]:
+        self.lines.append(line)
+        # Quoted fields may span lines, the record is complete once every quote is closed
+        self.quotes += line.count('"')
+        if self.quotes % 2:
+            return None
+
+        row = next(csv.reader(["".join(self.lines)]), None)
+        self.lines = []
+        self.quotes = 0
+        if not row:
+            return None
+
+        if self.keys is None:
+            self.keys = _record_keys(self.source, self.record_type, row)
+            self.positions = [row.index(key) for key in self.keys]
+            return None
+
+        return self.record_type(
+            **{key: row[position] for key, position in zip(self.keys, self.positions)}
+        )
+
+
+async def follow_query_data(
+    source: typing.Union[str, os.PathLike],
+    *,
+    poll_interval: float = 0.5,
+    stop: typing.Optional["asyncio.Event"] = None,
+) -> typing.AsyncIterator[QueryData]:
+    """
+    Follow query history CSV file that is being appended to, like ``tail -f``.
+
+    :param source: Path to the CSV file with QUERY_TEXT,START_TIME,END_TIME columns
+    :param poll_interval: Seconds to wait for new rows at the end of the file
+    :param stop: Event that ends the iteration once the end of the file is reached,
+        the file is followed forever when not specified
+    :return: Async iterator of QueryData
+    """
+    import asyncio
+
+    assembler = _RecordAssembler(source, QueryData)
+    with open(source, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                # End of file or partially written line, rewind and wait for the rest of it
+                f.seek(-len(line), os.SEEK_CUR)
+                if stop is not None and stop.is_set():
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+
+            record = assembler.feed(line.decode("utf-8-sig"))
+            if record is not None:
+                yield record
+
+
+async def read_query_stream(reader: "asyncio.StreamReader") -> typing.AsyncIterator[QueryData]:
+    """
+    Read query history CSV from a stream, e.g. a socket connection of a log shipper.
+
+    :param reader: Stream with QUERY_TEXT,START_TIME,END_TIME header followed by rows
+    :return: Async iterator of QueryData, ends when the stream is closed
+    """
+    assembler = _RecordAssembler(reader, QueryData)
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+
+        record = assembler.feed(line.decode("utf-8-sig"))
+        if record is not None:
+            yield record
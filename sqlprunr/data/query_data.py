@@ -1,11 +1,21 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
 class Frequencies:
+    """
+    Frequencies of tables, columns and queries.
+
+    :param tables: Table reference to number of uses
+    :param columns: Column reference to number of uses
+    :param queries: Query text to number of runs
+    :param table_columns: Table reference to column name to number of uses, columns are
+        attributed to the tables of the query they were read in
+    """
     tables: dict
     columns: dict
     queries: dict
+    table_columns: dict = field(default_factory=dict)
 
     def __hash__(self) -> int:
         return hash(self.tables) + hash(self.columns) + hash(self.queries)
@@ -19,3 +29,23 @@ class QueryData:
 
     def __hash__(self) -> int:
         return hash(self.QUERY_TEXT) + hash(self.START_TIME) + hash(self.END_TIME)
+
+
+@dataclass
+class QueryCost:
+    """
+    Execution time statistics of a query, in seconds.
+
+    :param count: Number of runs
+    :param total: Total execution time
+    :param mean: Mean execution time
+    :param p50: Median execution time
+    :param p95: 95th percentile of execution time
+    :param max: Longest execution time
+    """
+    count: int
+    total: float
+    mean: float
+    p50: float
+    p95: float
+    max: float
@@ -0,0 +1,98 @@
+from collections import Counter
+import typing
+
+from sqlprunr.data.query_data import Frequencies
+
+
+def _sorted_counts(counter: Counter) -> dict:
+    return dict(counter.most_common())
+
+
+def _nested_counts(counter: Counter) -> dict:
+    nested = {}
+    for (table, column), count in counter.most_common():
+        nested.setdefault(table, {})[column] = count
+    return nested
+
+
+def attribute_columns(
+    tables: typing.Sequence[str], columns: typing.Iterable[str]
+) -> typing.Iterator[typing.Tuple[str, str]]:
+    """
+    Attribute columns of a query to the tables of the query.
+
+    Qualified columns (``db.schema.table.column``) are attributed to their table. Unqualified
+    columns, and columns qualified with a name that is not a table of the query, are attributed
+    to every table of the query and matched against the schema later.
+
+    :param tables: Tables used in the query
+    :param columns: Columns used in the query
+    :return: Iterator of (table, column) pairs
+    """
+    for column in columns:
+        table, _, name = column.rpartition(".")
+        if table in tables:
+            yield table, name
+        else:
+            for table in tables:
+                yield table, name
+
+
+class FrequencyAggregator:
+    """
+    FrequencyAggregator counts tables, columns and query texts incrementally.
+
+    Every ``add`` call is O(len(tables) + len(columns)), so aggregating a query history
+    is a single linear pass. Aggregators can be merged, which allows partial results to be
+    computed separately (in chunks, processes or batches) and combined afterwards.
+    """
+
+    def __init__(self):
+        self.tables = Counter()
+        self.columns = Counter()
+        self.queries = Counter()
+        self.table_columns = Counter()
+
+    def add(
+        self,
+        query_text: str,
+        tables: typing.Iterable[str] = (),
+        columns: typing.Iterable[str] = (),
+        table_columns: typing.Iterable[typing.Tuple[str, str]] = (),
+    ) -> None:
+        """
+        Add a single analyzed query to the aggregator.
+
+        :param query_text: Original query text
+        :param tables: Tables used in the query
+        :param columns: Columns used in the query
+        :param table_columns: (table, column) pairs used in the query, see attribute_columns
+        """
+        self.queries[query_text] += 1
+        self.tables.update(tables)
+        self.columns.update(columns)
+        self.table_columns.update(table_columns)
+
+    def merge(self, other: "FrequencyAggregator") -> "FrequencyAggregator":
+        """
+        Merge counts of another aggregator into this one.
+
+        :param other: Aggregator to merge
+        :return: This aggregator
+        """
+        self.tables.update(other.tables)
+        self.columns.update(other.columns)
+        self.queries.update(other.queries)
+        self.table_columns.update(other.table_columns)
+        return self
+
+    def to_frequencies(self) -> Frequencies:
+        """
+        Return aggregated counts as Frequencies sorted by count in descending order.
+        """
+        return Frequencies(
+            tables=_sorted_counts(self.tables),
+            columns=_sorted_counts(self.columns),
+            queries=_sorted_counts(self.queries),
+            table_columns=_nested_counts(self.table_columns),
+        )
@@ -1,133 +1,419 @@
-from datetime import datetime
+from collections import namedtuple
 import typing
 import logging
-from sql_metadata import Parser
+import time
 
-from sqlprunr.data.generic import Database, Table
+from sqlprunr.data.generic import Column, Database, Table
 from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.aggregator import FrequencyAggregator, attribute_columns
+from sqlprunr.engine.fastpath import extract_simple
+from sqlprunr.engine.fingerprint import QueryCache, fingerprint_query
+from sqlprunr.engine.instrumentation import Instrumentation, get_instrumentation
+from sqlprunr.engine.resolver import TableResolver
+from sqlprunr.engine.statements import split_statements
 
-# from functools import lru_cache
+logger = logging.getLogger(__name__)
+
+# Cached in place of the parse result of statements the parser rejects, exception objects are
+# not cached as their tracebacks keep the frames of the failed parse alive
+_ParseFailure = namedtuple("_ParseFailure", ["type", "args"])
 
 
 def clean_query(query: str) -> str:
     return query.strip().replace("\n", " ")
 
 
-# @lru_cache()
-def analyze_query(query_data: QueryData, *, execution_time: int = 0) -> dict:
+def _parse_query(
+    query: str, instrumentation: typing.Optional[Instrumentation] = None
+) -> typing.Tuple[tuple, tuple]:
+    simple = extract_simple(query)
+    if simple is not None:
+        if instrumentation is not None:
+            instrumentation.increment("fast_path")
+        return tuple(simple[0]), tuple(simple[1])
+
+    # sql_metadata pulls in sqlparse, it is imported when the first query misses the fast path
+    from sql_metadata import Parser
+
+    parser = Parser(query, disable_logging=True)
+    return tuple(parser.tables), tuple(parser.columns)
+
+
+def analyze_statement(
+    statement: str,
+    cache: typing.Optional[QueryCache],
+    instrumentation: typing.Optional[Instrumentation] = None,
+) -> typing.Tuple[tuple, tuple]:
+    """
+    Parse a single statement, reusing the cached result of its fingerprint.
+
+    :param statement: Cleaned statement without a trailing semicolon
+    :param cache: Cache of parsed statements, failures are cached as well
+    :param instrumentation: Instrumentation to record the parse into
+    :return: Tables and columns of the statement
+    :raises ValueError: If the statement cannot be parsed, IndexError for some malformed ones
+    """
+    if cache is not None:
+        fingerprint = fingerprint_query(statement)
+        parsed = cache.get(fingerprint)
+        if parsed is not None:
+            if instrumentation is not None:
+                instrumentation.increment("cached")
+            if isinstance(parsed, _ParseFailure):
+                raise parsed.type(*parsed.args)
+            return parsed
+
+    try:
+        if instrumentation is None:
+            parsed = _parse_query(statement)
+        else:
+            start = time.perf_counter()
+            parsed = _parse_query(statement, instrumentation)
+            instrumentation.record("parse", time.perf_counter() - start)
+            instrumentation.increment("parsed")
+    except (ValueError, IndexError) as e:
+        # Unsupported statements (BEGIN, COMMIT, ...) repeat as often as any other template
+        if cache is not None:
+            cache.put(fingerprint, _ParseFailure(type(e), e.args))
+        raise
+
+    if cache is not None:
+        cache.put(fingerprint, parsed)
+    return parsed
+
+
+def analyze_script(
+    query_data: QueryData, *, cache: typing.Optional[QueryCache] = None
+) -> typing.List[dict]:
+    """
+    Split the query into statements and return the dimensions of every statement, statements
+    that cannot be analyzed (BEGIN, USE, ...) are skipped
+
+    :param query_data: Query with one or more statements to analyze
+    :param cache: Cache of parsed statements keyed by statement fingerprint
+    """
+    instrumentation = get_instrumentation()
+    result = []
+    for statement in split_statements(query_data.QUERY_TEXT):
+        statement = clean_query(statement)
+        try:
+            tables, columns = analyze_statement(statement, cache, instrumentation)
+        except (ValueError, IndexError):
+            logger.debug("Skipped statement that cannot be analyzed: %s", statement)
+            if instrumentation is not None:
+                instrumentation.increment("failed")
+            continue
+
+        result.append(
+            {"query_ref": statement, "tables": list(tables), "columns": list(columns)}
+        )
+
+    return result
+
+
+def analyze_query(
+    query_data: QueryData,
+    *,
+    execution_time: int = 0,
+    cache: typing.Optional[QueryCache] = None,
+) -> dict:
     """
     Analyze the query and return the dimensions
 
+    Queries with several statements return tables and columns of all of them, see analyze_script
+    for dimensions of every statement. Statements of a script that cannot be analyzed are
+    skipped, as long as at least one statement can be.
+
     :param query: Query to analyze
+    :param execution_time: Execution time of the query
+    :param cache: Cache of parsed queries keyed by query fingerprint, queries sharing a
+        template are parsed only once
+    :raises ValueError: If no statement of the query can be analyzed
     """
-    query = query_data.QUERY_TEXT
-    if query.count(";") > 1:
-        raise ValueError("Only one query per input is supported.")
+    statements = analyze_script(query_data, cache=cache)
+    if not statements:
+        raise ValueError(f"Query cannot be analyzed: {clean_query(query_data.QUERY_TEXT)}")
 
-    query = clean_query(query)
-
-    parser = Parser(query, disable_logging=True)
+    tables = {}
+    columns = {}
+    for statement in statements:
+        tables.update(dict.fromkeys(statement["tables"]))
+        columns.update(dict.fromkeys(statement["columns"]))
 
     return {
-        "query_ref": query,
+        "query_ref": clean_query(query_data.QUERY_TEXT),
         "execution_time": execution_time,
-        "tables": parser.tables,
-        "columns": parser.columns,
+        "tables": list(tables),
+        "columns": list(columns),
     }
 
 
+def _get_resolver(
+    database: typing.Union[Database, typing.List[Database], TableResolver],
+    default_database: typing.Optional[str],
+    default_schema: typing.Optional[str],
+) -> TableResolver:
+    if isinstance(database, TableResolver):
+        return database
+
+    if isinstance(database, Database) and default_database is None:
+        default_database = database.name
+
+    return TableResolver(
+        database, default_database=default_database, default_schema=default_schema
+    )
+
+
 def find_unused_tables(
-    frequencies: Frequencies, database: Database
+    frequencies: Frequencies,
+    database: typing.Union[Database, typing.List[Database], TableResolver],
+    *,
+    default_database: typing.Optional[str] = None,
+    default_schema: typing.Optional[str] = None,
 ) -> typing.List[Table]:
     """
     Find tables that are not used in the queries
 
-    :param queries: List of queries
-    :param database: Database schema
+    Table references are matched as ``db.schema.table``, ``schema.table`` or bare table names,
+    case-insensitively. Build a TableResolver once and pass it instead of the database to
+    reuse the index between calls.
+
+    :param frequencies: Frequencies of the queries or a FrequencyStore
+    :param database: Database schema, list of databases or prebuilt TableResolver
+    :param default_database: Database of references without a database, defaults to the
+        name of the database when a single database is given
+    :param default_schema: Schema of references without a schema
     """
-    used_tables = set(frequencies.tables.keys())
+    instrumentation = get_instrumentation()
+    start = time.perf_counter()
+    resolver = _get_resolver(database, default_database, default_schema)
 
+    debug = logger.isEnabledFor(logging.DEBUG)
     unused_tables = []
-    for schema in database.schemas:
-        for table in schema.tables:
-            if table.name not in used_tables:
-                logging.debug(
-                    f"Found unused table: {database.name}.{schema.name}.{table.name} ({len(table.columns) if table.columns else 0} columns)"
-                )
-                unused_tables.append(table)
-
-    logging.warning(
+    for key in resolver.unused(frequencies.tables.keys()):
+        table = resolver.get(key)[2]
+        if debug:
+            logger.debug(
+                "Found unused table: %s (%d columns)", ".".join(key), len(table.columns)
+            )
+        unused_tables.append(table)
+
+    logger.warning(
         "Keep in mind that these tables are not used in specified queries, but they might be used in other."
     )
-    logging.warning(
+    logger.warning(
         "Keep in mind that tables were checked only according to the selected database schema, check if specified queries were only executed in selected database area."
     )
 
+    if instrumentation is not None:
+        instrumentation.record("find_unused_tables", time.perf_counter() - start)
     return unused_tables
 
 
-def get_frequencies(
-    queries: typing.List[QueryData],
+def find_unused_columns(
+    frequencies: Frequencies,
+    database: typing.Union[Database, typing.List[Database], TableResolver],
     *,
-    tables: bool = True,
-    columns: bool = True,
-) -> Frequencies:
+    default_database: typing.Optional[str] = None,
+    default_schema: typing.Optional[str] = None,
+) -> typing.Dict[str, typing.List[Column]]:
     """
-    Get frequencies of tables and columns in the queries.
+    Find columns that are not read in the queries
 
-    :param queries: List of queries to analyze
-    :param tables: Whether to analyze tables
-    :param columns: Whether to analyze columns
+    Every column of the account gets a slot in a usage bitmap, tables own consecutive slots in
+    column order. Columns attributed to tables in ``frequencies.table_columns`` are marked in a
+    single vectorized pass, ``*`` marks every column of the table.
+
+    :param frequencies: Frequencies of the queries or a FrequencyStore
+    :param database: Database schema, list of databases or prebuilt TableResolver
+    :param default_database: Database of references without a database, defaults to the
+        name of the database when a single database is given
+    :param default_schema: Schema of references without a schema
+    :return: Fully qualified table name to list of its unused columns, for tables with any
     """
-    table_list = []
-    column_list = []
-    for query in queries:
-        try:
-            z = analyze_query(query, execution_time=0)
-        except (ValueError, IndexError):
-            continue
+    import numpy as np
 
-        if tables:
-            table_list.extend(z["tables"])
-        if columns:
-            column_list.extend(z["columns"])
+    instrumentation = get_instrumentation()
+    start = time.perf_counter()
+    resolver = _get_resolver(database, default_database, default_schema)
+    if not frequencies.table_columns:
+        logger.warning(
+            "Frequencies do not contain columns attributed to tables, every column will be reported as unused."
+        )
 
-    frequencies = Frequencies(
-        tables={table: table_list.count(table) for table in set(table_list)},
-        columns={column: column_list.count(column) for column in set(column_list)},
-        queries={query.QUERY_TEXT: queries.count(query) for query in set(queries)},
+    keys = list(resolver.keys())
+    key_positions = {key: i for i, key in enumerate(keys)}
+    counts = np.fromiter(
+        (len(resolver.get(key)[2].columns) for key in keys), dtype=np.int64, count=len(keys)
     )
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
 
-    frequencies.tables = dict(
-        sorted(frequencies.tables.items(), key=lambda item: item[1], reverse=True)
-    )
-    frequencies.columns = dict(
-        sorted(frequencies.columns.items(), key=lambda item: item[1], reverse=True)
-    )
+    used_ids = []
+    star_tables = []
+    for reference, columns in frequencies.table_columns.items():
+        for key in resolver.resolve(reference):
+            offset = offsets[key_positions[key]]
+            for column in columns:
+                if column == "*":
+                    star_tables.append(key_positions[key])
+                    continue
+
+                position = resolver.column_position(key, column)
+                if position is not None:
+                    used_ids.append(offset + position)
+
+    used = np.zeros(offsets[-1], dtype=bool)
+    used[np.asarray(used_ids, dtype=np.int64)] = True
+    if star_tables:
+        star_tables = np.asarray(star_tables, dtype=np.int64)
+        # Mark whole column ranges of tables read with * using a difference array
+        marks = np.zeros(offsets[-1] + 1, dtype=np.int64)
+        np.add.at(marks, offsets[star_tables], 1)
+        np.add.at(marks, offsets[star_tables + 1], -1)
+        used |= np.cumsum(marks[:-1]) > 0
 
-    frequencies.queries = dict(
-        sorted(frequencies.queries.items(), key=lambda item: item[1], reverse=True)
+    unused_ids = np.flatnonzero(~used)
+    table_ids = np.searchsorted(offsets, unused_ids, side="right") - 1
+
+    offsets = offsets.tolist()
+    unused_columns = {}
+    for table_id, column_id in zip(table_ids.tolist(), unused_ids.tolist()):
+        db, schema, table = resolver.get(keys[table_id])
+        name = f"{db.name}.{schema.name}.{table.name}"
+        column = table.columns[column_id - offsets[table_id]]
+        unused_columns.setdefault(name, []).append(column)
+
+    logger.warning(
+        "Keep in mind that these columns are not read in specified queries, but they might be read in other."
     )
 
-    return frequencies
+    if instrumentation is not None:
+        instrumentation.record("find_unused_columns", time.perf_counter() - start)
+    return unused_columns
 
 
-def get_time_spent(queries: typing.List[QueryData]):
+def analyze_text(
+    query_text: str,
+    tables: bool,
+    columns: bool,
+    cache: typing.Optional[QueryCache],
+    instrumentation: typing.Optional[Instrumentation],
+) -> typing.Tuple[list, list, list]:
     """
-    Get the time spent on each query.
+    Analyze every statement of the query text, statements that cannot be analyzed are skipped.
 
-    :param queries: List of queries to analyze
+    :param query_text: Text of the query with one or more statements
+    :param tables: Whether to return tables
+    :param columns: Whether to return columns
+    :param cache: Cache of parsed statements
+    :param instrumentation: Instrumentation to record the query into
+    :return: Tables, columns and (table, column) pairs of the analyzable statements
     """
-    time_spent = {}
+    if instrumentation is not None:
+        start = time.perf_counter()
+
+    analyzed = False
+    query_tables = []
+    query_columns = []
+    table_columns = []
+    for statement in split_statements(query_text):
+        try:
+            statement_tables, statement_columns = analyze_statement(
+                clean_query(statement), cache, instrumentation
+            )
+        except (ValueError, IndexError):
+            if instrumentation is not None:
+                instrumentation.increment("failed")
+            continue
+
+        analyzed = True
+        query_tables.extend(statement_tables)
+        query_columns.extend(statement_columns)
+        if tables and columns:
+            table_columns.extend(attribute_columns(statement_tables, statement_columns))
+
+    if instrumentation is not None:
+        if not analyzed:
+            instrumentation.increment("skipped")
+        instrumentation.observe_query(query_text, time.perf_counter() - start)
 
-    for query in queries:
-        start_time = datetime.fromisoformat(query.START_TIME)
-        end_time = datetime.fromisoformat(query.END_TIME)
+    return query_tables if tables else [], query_columns if columns else [], table_columns
 
-        time_spent[query.QUERY_TEXT] = (end_time - start_time).total_seconds()
 
-    sorted_time_spent = dict(
-        sorted(time_spent.items(), key=lambda item: item[1], reverse=True)
+def aggregate_query(
+    aggregator: FrequencyAggregator,
+    query: QueryData,
+    *,
+    tables: bool = True,
+    columns: bool = True,
+    cache: typing.Optional[QueryCache] = None,
+) -> None:
+    """
+    Analyze the query and add it to the aggregator. Every statement of a script is analyzed
+    and counted, statements that cannot be analyzed are skipped and the query is still counted.
+
+    :param aggregator: Aggregator to add the query to
+    :param query: Query to analyze
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param cache: Cache of parsed queries
+    """
+    query_tables, query_columns, table_columns = analyze_text(
+        query.QUERY_TEXT, tables, columns, cache, get_instrumentation()
     )
+    aggregator.add(query.QUERY_TEXT, query_tables, query_columns, table_columns)
+
+
+def get_frequencies(
+    queries: typing.Iterable[QueryData],
+    *,
+    tables: bool = True,
+    columns: bool = True,
+    cache: typing.Optional[QueryCache] = None,
+    workers: int = 1,
+    chunksize: int = 10_000,
+) -> Frequencies:
+    """
+    Get frequencies of tables and columns in the queries.
+
+    :param queries: Iterable of queries to analyze, consumed in a single pass
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param cache: Cache of parsed queries, a new one is created when not specified. Worker
+        processes keep caches of their own, so it cannot be combined with workers > 1
+    :param workers: Number of worker processes, queries are analyzed in the current process when 1
+    :param chunksize: Number of queries sent to a worker process at once
+    :raises ValueError: If a cache is passed together with workers > 1
+    """
+    # The chunk helpers build on aggregate_query, they are imported here to avoid a cycle
+    from sqlprunr.engine.chunks import aggregate_parallel, aggregate_queries
+
+    if workers > 1:
+        if cache is not None:
+            raise ValueError("cache cannot be shared with worker processes, use workers=1 or cache=None")
+        aggregator = aggregate_parallel(
+            queries, tables=tables, columns=columns, workers=workers, chunksize=chunksize
+        )
+    else:
+        aggregator = aggregate_queries(
+            queries,
+            tables=tables,
+            columns=columns,
+            cache=QueryCache() if cache is None else cache,
+        )
+
+    return aggregator.to_frequencies()
+
+
+def get_time_spent(queries: typing.Iterable[QueryData]) -> typing.Dict[str, float]:
+    """
+    Get the total time spent on each query, in seconds.
+
+    Runs of the same query text are summed, see get_query_costs for count, mean and percentiles.
+
+    :param queries: Iterable of queries to analyze, consumed in a single pass
+    """
+    from sqlprunr.engine.cost import get_query_costs
 
-    return sorted_time_spent
+    return {query: cost.total for query, cost in get_query_costs(queries).items()}
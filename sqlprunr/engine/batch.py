@@ -0,0 +1,220 @@
+from collections import deque
+from dataclasses import dataclass
+from itertools import chain, islice
+import logging
+import os
+import time
+import typing
+
+from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.aggregator import FrequencyAggregator
+from sqlprunr.engine.chunks import (
+    ChunkResult,
+    aggregate_chunk,
+    aggregate_queries,
+    chunked,
+    init_worker,
+    merge_chunk,
+)
+from sqlprunr.engine.fingerprint import QueryCache
+from sqlprunr.engine.instrumentation import Instrumentation, get_instrumentation
+from sqlprunr.engine.store import FrequencyStore
+
+logger = logging.getLogger(__name__)
+
+BATCH_BUCKET = "batch"
+
+# Rough per-entry overhead of a counter entry (dict slot, key object, int), used together
+# with the length of the key to estimate memory held by partial frequencies
+_ENTRY_SIZE = 120
+# Overhead of the (table, column) tuple keying a table_columns entry, on top of its strings
+_PAIR_SIZE = 56
+
+
+class CheckpointExistsError(ValueError):
+    """
+    Raised when the checkpoint of a previous run exists and resume is not set.
+    """
+
+
+@dataclass
+class BatchProgress:
+    """
+    Progress of a batch run.
+
+    :param processed: Number of queries included in the frequencies, including resumed ones
+    :param resumed: Number of queries taken over from the checkpoint
+    :param checkpoints: Number of checkpoints written by this run
+    :param elapsed: Seconds since the run started
+    :param throughput: Queries analyzed by this run per second
+    """
+    processed: int
+    resumed: int
+    checkpoints: int
+    elapsed: float
+    throughput: float
+
+
+def _estimate_size(aggregator: FrequencyAggregator) -> int:
+    size = 0
+    for counter in (aggregator.tables, aggregator.columns, aggregator.queries):
+        size += len(counter) * _ENTRY_SIZE + sum(map(len, counter))
+    size += len(aggregator.table_columns) * (_ENTRY_SIZE + _PAIR_SIZE)
+    return size + sum(len(table) + len(column) for table, column in aggregator.table_columns)
+
+
+def _aggregate_chunks(
+    chunks: typing.Iterable[typing.List[QueryData]],
+    *,
+    tables: bool,
+    columns: bool,
+    workers: int,
+    cache: QueryCache,
+) -> typing.Iterator[typing.Tuple[int, ChunkResult]]:
+    if workers <= 1:
+        for chunk in chunks:
+            aggregator = aggregate_queries(chunk, tables=tables, columns=columns, cache=cache)
+            yield len(chunk), (aggregator, None)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    instrumentation = get_instrumentation()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        for chunk in chunks:
+            chunk_instrumentation = (
+                None if instrumentation is None else Instrumentation(instrumentation.slowest)
+            )
+            future = executor.submit(aggregate_chunk, chunk, tables, columns, chunk_instrumentation)
+            pending.append((len(chunk), future))
+            # Chunks are yielded in submission order, a checkpoint always covers a prefix of
+            # the history no matter which worker finishes first
+            if len(pending) >= workers * 2:
+                size, future = pending.popleft()
+                yield size, future.result()
+
+        while pending:
+            size, future = pending.popleft()
+            yield size, future.result()
+
+
+def run_batch(
+    queries: typing.Iterable[QueryData],
+    checkpoint: typing.Union[str, os.PathLike],
+    *,
+    source: str = "",
+    resume: bool = False,
+    tables: bool = True,
+    columns: bool = True,
+    chunk_size: int = 10_000,
+    checkpoint_every: int = 10,
+    workers: int = 1,
+    memory_budget: typing.Optional[int] = None,
+    progress: typing.Optional[typing.Callable[[BatchProgress], None]] = None,
+) -> Frequencies:
+    """
+    Get frequencies of a large query history in chunks, with periodic checkpoints to disk.
+
+    Partial frequencies are folded into a FrequencyStore at the checkpoint path together with
+    the number of queries they cover, in a single transaction. A run that dies is resumed from
+    its last checkpoint: queries covered by it are skipped without being analyzed. A finished
+    run can be resumed as well, e.g. after new queries were appended to the history.
+
+    :param queries: Iterable of queries in a stable order, consumed in a single pass
+    :param checkpoint: Path to the SQLite checkpoint, created when missing
+    :param source: Name of the history (e.g. its path), a checkpoint is resumed only for the
+        history it was written for
+    :param resume: Whether to resume the checkpoint, an existing checkpoint is never
+        overwritten
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param chunk_size: Number of queries analyzed at once, in a worker process when workers > 1
+    :param checkpoint_every: Number of chunks between checkpoints
+    :param workers: Number of worker processes, queries are analyzed in the current process when 1
+    :param memory_budget: Approximate number of bytes partial frequencies may take before a
+        checkpoint is written early, the rest of the run is bounded by chunk_size and workers
+    :param progress: Called with progress of the run after every chunk
+    :return: Frequencies of the whole history, sorted by count in descending order
+    :raises CheckpointExistsError: If resume is not set for an existing checkpoint
+    :raises ValueError: If the checkpoint cannot be resumed or the queries cannot be read
+    """
+    # The first query is read before the checkpoint is created, a history that cannot be
+    # read (e.g. a CSV missing required columns) fails without leaving a checkpoint behind
+    iterator = iter(queries)
+    for first in iterator:
+        iterator = chain([first], iterator)
+        break
+
+    with FrequencyStore(checkpoint) as store:
+        options = {"source": source, "tables": tables, "columns": columns}
+        metadata = store.metadata()
+        resumed = metadata.get("processed", 0)
+        if resumed and not resume:
+            raise CheckpointExistsError(
+                f"Checkpoint {os.fspath(checkpoint)!r} already covers {resumed} queries, "
+                "resume it or remove it to start over"
+            )
+        for key, value in options.items():
+            if resumed and metadata.get(key) != value:
+                raise ValueError(
+                    f"Checkpoint {os.fspath(checkpoint)!r} was written with {key}={metadata.get(key)!r}, "
+                    f"cannot resume it with {key}={value!r}"
+                )
+        if resumed:
+            logger.info("Resuming from checkpoint with %d queries", resumed)
+
+        instrumentation = get_instrumentation()
+        # Covered queries are only read, skipping them is far cheaper than analyzing them
+        skipped = sum(1 for _ in islice(iterator, resumed))
+        if skipped < resumed:
+            raise ValueError(
+                f"Checkpoint {os.fspath(checkpoint)!r} covers {resumed} queries, "
+                f"but the history has only {skipped}"
+            )
+
+        start = time.perf_counter()
+        aggregator = FrequencyAggregator()
+        processed = resumed
+        checkpoints = 0
+        pending_chunks = 0
+
+        def write_checkpoint() -> None:
+            nonlocal aggregator, checkpoints, pending_chunks
+            store.merge(aggregator, BATCH_BUCKET, metadata={**options, "processed": processed})
+            logger.debug("Checkpoint written at %d queries", processed)
+            aggregator = FrequencyAggregator()
+            checkpoints += 1
+            pending_chunks = 0
+
+        chunks = _aggregate_chunks(
+            chunked(iterator, chunk_size),
+            tables=tables,
+            columns=columns,
+            workers=workers,
+            cache=QueryCache(),
+        )
+        for size, partial in chunks:
+            merge_chunk(aggregator, partial, instrumentation)
+            processed += size
+            pending_chunks += 1
+            if pending_chunks >= checkpoint_every or (
+                memory_budget is not None and _estimate_size(aggregator) > memory_budget
+            ):
+                write_checkpoint()
+
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress(
+                    BatchProgress(
+                        processed=processed,
+                        resumed=resumed,
+                        checkpoints=checkpoints,
+                        elapsed=elapsed,
+                        throughput=(processed - resumed) / elapsed if elapsed else 0.0,
+                    )
+                )
+
+        if pending_chunks or not resumed:
+            write_checkpoint()
+        return store.frequencies()
@@ -0,0 +1,156 @@
+from collections import deque
+from itertools import islice
+import typing
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.aggregator import FrequencyAggregator
+from sqlprunr.engine.analyzer import aggregate_query
+from sqlprunr.engine.fingerprint import QueryCache
+from sqlprunr.engine.instrumentation import (
+    Instrumentation,
+    get_instrumentation,
+    set_instrumentation,
+)
+
+ChunkResult = typing.Tuple[FrequencyAggregator, typing.Optional[Instrumentation]]
+
+_worker_cache: typing.Optional[QueryCache] = None
+
+
+def aggregate_queries(
+    queries: typing.Iterable[QueryData],
+    *,
+    tables: bool,
+    columns: bool,
+    cache: QueryCache,
+) -> FrequencyAggregator:
+    """
+    Analyze the queries in the current process and return their partial frequencies.
+
+    :param queries: Iterable of queries to analyze
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param cache: Cache of parsed queries
+    """
+    aggregator = FrequencyAggregator()
+    for query in queries:
+        aggregate_query(aggregator, query, tables=tables, columns=columns, cache=cache)
+
+    return aggregator
+
+
+def init_worker() -> None:
+    """
+    Initialize a worker process with a cache of its own, used as a ProcessPoolExecutor initializer.
+    """
+    global _worker_cache
+    _worker_cache = QueryCache()
+
+
+def aggregate_chunk(
+    queries: typing.List[QueryData],
+    tables: bool,
+    columns: bool,
+    instrumentation: typing.Optional[Instrumentation] = None,
+) -> ChunkResult:
+    """
+    Analyze a chunk of queries in a worker process.
+
+    Worker processes do not share the instrumentation of the parent, measurements are collected
+    into the passed instance and sent back with the partial result.
+
+    :param queries: Chunk of queries to analyze
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param instrumentation: Instrumentation to collect measurements of the chunk into
+    :return: Partial frequencies and the instrumentation
+    """
+    previous = set_instrumentation(instrumentation)
+    try:
+        aggregator = aggregate_queries(
+            queries, tables=tables, columns=columns, cache=_worker_cache or QueryCache()
+        )
+    finally:
+        set_instrumentation(previous)
+    return aggregator, instrumentation
+
+
+def merge_chunk(
+    aggregator: FrequencyAggregator,
+    partial: ChunkResult,
+    instrumentation: typing.Optional[Instrumentation],
+) -> None:
+    """
+    Merge the result of aggregate_chunk into the aggregator and the instrumentation.
+
+    :param aggregator: Aggregator to merge into
+    :param partial: Result of aggregate_chunk
+    :param instrumentation: Instrumentation of the current process
+    """
+    chunk_aggregator, chunk_instrumentation = partial
+    if instrumentation is None:
+        aggregator.merge(chunk_aggregator)
+        return
+
+    with instrumentation.timer("merge"):
+        aggregator.merge(chunk_aggregator)
+    if chunk_instrumentation is not None:
+        instrumentation.merge(chunk_instrumentation)
+
+
+def chunked(
+    iterable: typing.Iterable[QueryData], size: int
+) -> typing.Iterator[typing.List[QueryData]]:
+    """
+    Split the iterable into lists of at most size queries, consumed lazily.
+
+    :param iterable: Iterable of queries
+    :param size: Maximum number of queries in a chunk
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def aggregate_parallel(
+    queries: typing.Iterable[QueryData],
+    *,
+    tables: bool,
+    columns: bool,
+    workers: int,
+    chunksize: int,
+) -> FrequencyAggregator:
+    """
+    Analyze the queries in worker processes and return their frequencies.
+
+    :param queries: Iterable of queries to analyze, consumed in a single pass
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param workers: Number of worker processes
+    :param chunksize: Number of queries sent to a worker process at once
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    instrumentation = get_instrumentation()
+    aggregator = FrequencyAggregator()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        for chunk in chunked(queries, chunksize):
+            chunk_instrumentation = (
+                None if instrumentation is None else Instrumentation(instrumentation.slowest)
+            )
+            pending.append(
+                executor.submit(aggregate_chunk, chunk, tables, columns, chunk_instrumentation)
+            )
+            # Bound the number of chunks in flight, partials are merged in submission order
+            # so the result does not depend on which worker finishes first
+            if len(pending) >= workers * 2:
+                merge_chunk(aggregator, pending.popleft().result(), instrumentation)
+
+        while pending:
+            merge_chunk(aggregator, pending.popleft().result(), instrumentation)
+
+    return aggregator
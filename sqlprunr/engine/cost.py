@@ -0,0 +1,81 @@
+import typing
+
+import numpy as np
+
+from sqlprunr.data.query_data import QueryCost, QueryData
+from sqlprunr.engine.fingerprint import fingerprint_query
+from sqlprunr.engine.timestamps import parse_timestamps
+
+
+def _group_percentile(
+    durations: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float
+) -> np.ndarray:
+    # Linear interpolation between closest ranks, same as numpy.percentile default
+    position = starts + q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    return durations[lower] + (durations[upper] - durations[lower]) * (position - lower)
+
+
+def get_query_costs(
+    queries: typing.Iterable[QueryData], *, by: str = "text"
+) -> typing.Dict[str, QueryCost]:
+    """
+    Get execution time statistics of the queries.
+
+    Timestamps are parsed in batch and statistics of all groups are computed with array operations.
+
+    :param queries: Iterable of queries to analyze, consumed in a single pass
+    :param by: ``text`` to group runs by query text, ``fingerprint`` to group queries built
+        from the same template
+    :return: Query text or fingerprint to its cost, sorted by total time in descending order
+    """
+    if by == "text":
+        key = None
+    elif by == "fingerprint":
+        key = fingerprint_query
+    else:
+        raise ValueError(f"Unsupported grouping: {by}, use 'text' or 'fingerprint'.")
+
+    groups = {}
+    group_ids = []
+    start_times = []
+    end_times = []
+    for query in queries:
+        name = query.QUERY_TEXT if key is None else key(query.QUERY_TEXT)
+        group_ids.append(groups.setdefault(name, len(groups)))
+        start_times.append(query.START_TIME)
+        end_times.append(query.END_TIME)
+
+    if not groups:
+        return {}
+
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+    durations = (parse_timestamps(end_times) - parse_timestamps(start_times)).astype(
+        np.float64
+    ) / 1000
+
+    counts = np.bincount(group_ids, minlength=len(groups))
+    totals = np.bincount(group_ids, weights=durations, minlength=len(groups))
+
+    # Sort durations by group and duration, every group becomes a sorted slice
+    durations = durations[np.lexsort((durations, group_ids))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    p50 = _group_percentile(durations, starts, counts, 0.5)
+    p95 = _group_percentile(durations, starts, counts, 0.95)
+    maxima = durations[starts + counts - 1]
+
+    names = list(groups)
+    costs = {}
+    for i in np.argsort(-totals, kind="stable").tolist():
+        costs[names[i]] = QueryCost(
+            count=int(counts[i]),
+            total=float(totals[i]),
+            mean=float(totals[i] / counts[i]),
+            p50=float(p50[i]),
+            p95=float(p95[i]),
+            max=float(maxima[i]),
+        )
+
+    return costs
@@ -0,0 +1,270 @@
+from dataclasses import dataclass, field
+import hashlib
+import typing
+
+from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.data.loaders import Source, read_csv
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData
+
+TableName = typing.Tuple[str, str, str]
+TableColumns = typing.Dict[TableName, typing.Dict[str, str]]
+
+
+@dataclass
+class SchemaDiff:
+    """
+    Changes between two snapshots of a schema, tables are identified by (database, schema, table).
+
+    :param added_tables: New tables with their (column, data type) pairs
+    :param dropped_tables: Tables that no longer exist
+    :param added_columns: New columns of existing tables, (column, data type) pairs
+    :param dropped_columns: Columns that no longer exist in existing tables
+    :param retyped_columns: Columns with a new data type, (column, old type, new type)
+    """
+    added_tables: typing.Dict[TableName, typing.List[typing.Tuple[str, str]]] = field(
+        default_factory=dict
+    )
+    dropped_tables: typing.List[TableName] = field(default_factory=list)
+    added_columns: typing.Dict[TableName, typing.List[typing.Tuple[str, str]]] = field(
+        default_factory=dict
+    )
+    dropped_columns: typing.Dict[TableName, typing.List[str]] = field(default_factory=dict)
+    retyped_columns: typing.Dict[TableName, typing.List[typing.Tuple[str, str, str]]] = field(
+        default_factory=dict
+    )
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.added_tables
+            or self.dropped_tables
+            or self.added_columns
+            or self.dropped_columns
+            or self.retyped_columns
+        )
+
+    def changed_tables(self) -> typing.Set[TableName]:
+        """
+        Return existing tables with added, dropped or retyped columns.
+        """
+        return {*self.added_columns, *self.dropped_columns, *self.retyped_columns}
+
+
+TableHashes = typing.Dict[TableName, bytes]
+
+
+def _content_hash(columns: typing.Dict[str, str]) -> bytes:
+    # Pairs are sorted, a table whose columns were only reordered keeps its hash
+    content = "\x1e".join(
+        f"{column}\x1f{data_type}" for column, data_type in sorted(columns.items())
+    )
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def table_hashes(databases: typing.Iterable[Database]) -> TableHashes:
+    """
+    Return content hash of every table, the hash changes when a column is added, dropped or
+    retyped, not when columns are reordered.
+
+    Hashes are stable between processes and can be stored next to a snapshot, pass them to
+    diff_databases or diff_schema_data to skip hashing the snapshot on every diff.
+
+    :param databases: Databases to hash
+    """
+    return {name: _content_hash(columns) for name, columns in _databases_columns(databases).items()}
+
+
+def _databases_columns(databases: typing.Iterable[Database]) -> TableColumns:
+    tables = {}
+    for database in databases:
+        for schema in database.schemas:
+            for table in schema.tables:
+                columns = tables.setdefault((database.name, schema.name, table.name), {})
+                for column in table.columns:
+                    columns.setdefault(column.name, column.data_type)
+    return tables
+
+
+def _rows_columns(rows: typing.Iterable[SnowflakeCSVData]) -> TableColumns:
+    tables = {}
+    for row in rows:
+        columns = tables.get((row.DATABASE_NAME, row.SCHEMA_NAME, row.TABLE_NAME))
+        if columns is None:
+            columns = tables[row.DATABASE_NAME, row.SCHEMA_NAME, row.TABLE_NAME] = {}
+        columns.setdefault(row.COLUMN_NAME, row.DATA_TYPE)
+    return tables
+
+
+def _table_hash(
+    hashes: typing.Optional[TableHashes], name: TableName, columns: typing.Dict[str, str]
+) -> bytes:
+    content_hash = None if hashes is None else hashes.get(name)
+    return _content_hash(columns) if content_hash is None else content_hash
+
+
+def _diff(
+    old: TableColumns,
+    new: TableColumns,
+    old_hashes: typing.Optional[TableHashes] = None,
+    new_hashes: typing.Optional[TableHashes] = None,
+) -> SchemaDiff:
+    diff = SchemaDiff()
+    old_names = old.keys()
+    new_names = new.keys()
+
+    # Dict views support set operations without copying, order of the snapshots is kept
+    dropped = old_names - new_names
+    diff.dropped_tables = [name for name in old if name in dropped]
+    added = new_names - old_names
+    diff.added_tables = {name: list(new[name].items()) for name in new if name in added}
+
+    for name, new_columns in new.items():
+        old_columns = old.get(name)
+        if old_columns is None:
+            continue
+        if old_hashes is None and new_hashes is None:
+            # Dict equality ignores the order of columns and is cheaper than hashing both
+            if old_columns == new_columns:
+                continue
+        elif _table_hash(old_hashes, name, old_columns) == _table_hash(
+            new_hashes, name, new_columns
+        ):
+            continue
+
+        added_columns = [
+            (column, data_type)
+            for column, data_type in new_columns.items()
+            if column not in old_columns
+        ]
+        dropped_columns = [column for column in old_columns if column not in new_columns]
+        retyped_columns = [
+            (column, old_columns[column], data_type)
+            for column, data_type in new_columns.items()
+            if column in old_columns and old_columns[column] != data_type
+        ]
+        if added_columns:
+            diff.added_columns[name] = added_columns
+        if dropped_columns:
+            diff.dropped_columns[name] = dropped_columns
+        if retyped_columns:
+            diff.retyped_columns[name] = retyped_columns
+
+    return diff
+
+
+def diff_databases(
+    old: typing.Iterable[Database],
+    new: typing.Iterable[Database],
+    *,
+    old_hashes: typing.Optional[TableHashes] = None,
+    new_hashes: typing.Optional[TableHashes] = None,
+) -> SchemaDiff:
+    """
+    Compare two snapshots of databases, e.g. parsed from yesterday's and today's export.
+
+    Tables are matched with set operations on their names, column lists are compared only for
+    tables whose content differs, so the diff takes linear time. Columns that were only
+    reordered are not a change.
+
+    :param old: Previous snapshot
+    :param new: Current snapshot
+    :param old_hashes: table_hashes of the previous snapshot, tables are compared by hash
+        instead of column by column when given
+    :param new_hashes: table_hashes of the current snapshot
+    """
+    return _diff(_databases_columns(old), _databases_columns(new), old_hashes, new_hashes)
+
+
+def diff_schema_data(
+    old: typing.Iterable[SnowflakeCSVData],
+    new: typing.Iterable[SnowflakeCSVData],
+    *,
+    old_hashes: typing.Optional[TableHashes] = None,
+    new_hashes: typing.Optional[TableHashes] = None,
+) -> SchemaDiff:
+    """
+    Compare two snapshots of schema rows without building databases, see diff_databases.
+
+    :param old: Rows of the previous snapshot, consumed in a single pass
+    :param new: Rows of the current snapshot, consumed in a single pass
+    :param old_hashes: table_hashes of the previous snapshot
+    :param new_hashes: table_hashes of the current snapshot
+    """
+    return _diff(_rows_columns(old), _rows_columns(new), old_hashes, new_hashes)
+
+
+def diff_schema_csv(
+    old: Source,
+    new: Source,
+    *,
+    old_hashes: typing.Optional[TableHashes] = None,
+    new_hashes: typing.Optional[TableHashes] = None,
+) -> SchemaDiff:
+    """
+    Compare two Snowflake schema exports in CSV, rows are streamed, see diff_schema_data.
+
+    :param old: Path to the previous export or an opened file object
+    :param new: Path to the current export or an opened file object
+    :param old_hashes: table_hashes of the previous export
+    :param new_hashes: table_hashes of the current export
+    """
+    return diff_schema_data(
+        read_csv(old, SnowflakeCSVData),
+        read_csv(new, SnowflakeCSVData),
+        old_hashes=old_hashes,
+        new_hashes=new_hashes,
+    )
+
+
+def apply_diff(databases: typing.List[Database], diff: SchemaDiff) -> typing.List[Database]:
+    """
+    Apply the diff to the previous snapshot in place, instead of parsing the current one again.
+
+    :param databases: Previous snapshot, databases and schemas missing in it are created
+    :param diff: Changes to apply
+    :return: The updated list of databases
+    """
+    by_name = {database.name: database for database in databases}
+
+    def get_schema(name: TableName) -> Schema:
+        database = by_name.get(name[0])
+        if database is None:
+            database = by_name[name[0]] = Database(name[0], [])
+            databases.append(database)
+        schema = database.get_schema(name[1])
+        if schema is None:
+            schema = database.add_schema(Schema(name[1], []))
+        return schema
+
+    dropped = {}
+    for name in diff.dropped_tables:
+        dropped.setdefault(name[:2], set()).add(name[2])
+    for (database_name, schema_name), tables in dropped.items():
+        database = by_name.get(database_name)
+        schema = database.get_schema(schema_name) if database is not None else None
+        if schema is not None:
+            # Replacing the list rebuilds the name index of the schema on next lookup
+            schema.tables = [table for table in schema.tables if table.name not in tables]
+
+    for name, columns in diff.added_tables.items():
+        get_schema(name).add_table(
+            Table(name[2], [Column(column, data_type) for column, data_type in columns])
+        )
+
+    for name in diff.changed_tables():
+        table = get_schema(name).get_table(name[2])
+        if table is None:
+            raise ValueError(f"Table {'.'.join(name)} of the diff does not exist")
+
+        dropped_columns = set(diff.dropped_columns.get(name, ()))
+        new_types = {column: data_type for column, _, data_type in diff.retyped_columns.get(name, ())}
+        columns = [
+            Column(column.name, new_types[column.name]) if column.name in new_types else column
+            for column in table.columns
+            if column.name not in dropped_columns
+        ]
+        columns.extend(
+            Column(column, data_type) for column, data_type in diff.added_columns.get(name, ())
+        )
+        table.columns = columns
+
+    return databases
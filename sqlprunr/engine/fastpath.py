@@ -0,0 +1,419 @@
+import re
+import typing
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+)
+    |(?P<unsupported>--|/\*|"|`|\[|::)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<number>\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+    |(?P<name>[A-Za-z_][A-Za-z0-9_$]*(?:\.[A-Za-z_][A-Za-z0-9_$]*)*(?:\.\*)?)
+    |(?P<param>\?|:[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<operator><>|!=|<=|>=|=|<|>)
+    |(?P<minus>-)
+    |(?P<punctuation>[(),*;])
+    """,
+    re.VERBOSE,
+)
+
+# Keywords consumed by the grammar below, any other SQL keyword sends the query to sql_metadata
+_GRAMMAR_KEYWORDS = frozenset(
+    {
+        "SELECT", "DISTINCT", "FROM", "AS", "WHERE", "AND", "OR", "NOT", "IS", "NULL", "IN",
+        "BETWEEN", "LIKE", "ILIKE", "TRUE", "FALSE", "GROUP", "ORDER", "BY", "ASC", "DESC",
+        "NULLS", "FIRST", "LAST", "LIMIT", "OFFSET", "INSERT", "INTO", "VALUES", "UPDATE", "SET",
+    }
+)
+_LITERAL_KEYWORDS = frozenset({"NULL", "TRUE", "FALSE"})
+_CONDITION_KEYWORDS = frozenset({"AND", "OR", "NOT", "IS", "IN", "BETWEEN", "LIKE", "ILIKE"})
+# Keywords of all dialects known to sqlparse, an identifier that is one of them is tokenized
+# differently by sql_metadata, so the query is sent there. The set is static, the fast path never
+# imports sqlparse.
+_SQL_KEYWORDS = frozenset(
+    {
+        "ABORT", "ABS", "ABSOLUTE", "ACCESS", "ACCOUNT", "ADA", "ADD", "ADMIN", "AFTER",
+        "AGGREGATE", "ALIAS", "ALL", "ALLOCATE", "ALTER", "ANALYSE", "ANALYZE", "AND", "ANY",
+        "ARCHIVE", "ARCHIVELOG", "ARE", "ARRAY", "ARRAYLEN", "ARRAY_CONTAINS", "AS", "ASC",
+        "ASENSITIVE", "ASSERTION", "ASSERT_ROWS_MODIFIED", "ASSIGNMENT", "ASYMMETRIC", "AT",
+        "ATOMIC", "AUDIT", "AUTHORIZATION", "AUTO_INCREMENT", "AVG", "BACKUP", "BACKWARD", "BECOME",
+        "BEFORE", "BEGIN", "BETWEEN", "BIGINT", "BIGNUMERIC", "BIGSERIAL", "BINARY", "BIT",
+        "BITVAR", "BIT_LENGTH", "BLOB", "BLOCK", "BODY", "BOOLEAN", "BOTH", "BOX", "BREADTH",
+        "BREAK", "BY", "BYTEA", "CACHE", "CALL", "CALLED", "CANCEL", "CARDINALITY", "CASCADE",
+        "CASCADED", "CASE", "CAST", "CATALOG", "CATALOG_NAME", "CHAIN", "CHANGE", "CHAR",
+        "CHARACTER", "CHARACTERISTICS", "CHARACTER_LENGTH", "CHARACTER_SET_CATALOG",
+        "CHARACTER_SET_NAME", "CHARACTER_SET_SCHEMA", "CHARSET", "CHAR_LENGTH", "CHECK", "CHECKED",
+        "CHECKPOINT", "CIDR", "CIRCLE", "CLASS", "CLASS_ORIGIN", "CLOB", "CLOSE", "CLUSTER", "CMP",
+        "COALESCE", "COBOL", "COLLATE", "COLLATION", "COLLATION_CATALOG", "COLLATION_NAME",
+        "COLLATION_SCHEMA", "COLLECT", "COLLECT_LIST", "COLUMN", "COLUMN_NAME", "COMMAND_FUNCTION",
+        "COMMAND_FUNCTION_CODE", "COMMENT", "COMMIT", "COMMITTED", "COMPILE", "COMPLETION",
+        "COMPRESS", "CONCAT", "CONCURRENTLY", "CONDITION", "CONDITION_NUMBER", "CONFLICT",
+        "CONNECT", "CONNECTION", "CONNECTION_NAME", "CONSTRAINT", "CONSTRAINTS",
+        "CONSTRAINT_CATALOG", "CONSTRAINT_NAME", "CONSTRAINT_SCHEMA", "CONSTRUCTOR", "CONTAINS",
+        "CONTENTS", "CONTINUE", "CONTROLFILE", "CONVERSION", "CONVERT", "COPY", "CORRESPONDING",
+        "COUNT", "CREATE", "CREATEDB", "CREATEUSER", "CROSS", "CUBE", "CURRENT", "CURRENT_DATE",
+        "CURRENT_PATH", "CURRENT_ROLE", "CURRENT_TIME", "CURRENT_TIMESTAMP", "CURRENT_USER",
+        "CURSOR", "CURSOR_NAME", "CYCLE", "DATA", "DATABASE", "DATAFILE", "DATE",
+        "DATETIME_INTERVAL_CODE", "DATETIME_INTERVAL_PRECISION", "DATE_ADD", "DATE_SUB", "DAY",
+        "DBA", "DBMS_OUTPUT", "DEALLOCATE", "DEC", "DECIMAL", "DECLARE", "DECODE", "DEFAULT",
+        "DEFAULTS", "DEFERRABLE", "DEFERRED", "DEFINE", "DEFINED", "DEFINER", "DELETE", "DELIMITER",
+        "DELIMITERS", "DEREF", "DESC", "DESCRIBE", "DESCRIPTOR", "DESTROY", "DESTRUCTOR",
+        "DETERMINISTIC", "DIAGNOSTICS", "DICTIONARY", "DIRECTORY", "DISABLE", "DISCONNECT",
+        "DISMOUNT", "DISPATCH", "DISTINCT", "DISTINCTROW", "DISTRIBUTE", "DIV", "DO", "DOMAIN",
+        "DOUBLE", "DROP", "DUMP", "DYNAMIC", "DYNAMIC_FUNCTION", "DYNAMIC_FUNCTION_CODE", "EACH",
+        "ELEMENTS", "ELSE", "ELSIF", "ENABLE", "ENCODING", "ENCRYPTED", "END", "ENGINE", "ENUM",
+        "EQUALS", "ESCAPE", "EVENTS", "EVERY", "EXCEPT", "EXCEPTION", "EXCEPTIONS", "EXCHANGE",
+        "EXCLUDING", "EXCLUSIVE", "EXEC", "EXECUTE", "EXISTING", "EXISTS", "EXIT", "EXPLAIN",
+        "EXPLODE", "EXTENDED", "EXTENT", "EXTERNAL", "EXTERNALLY", "EXTRACT", "FALSE", "FETCH",
+        "FILE", "FILE_TYPE", "FINAL", "FIRST", "FLOAT", "FLOOR", "FLUSH", "FOLLOWING", "FOR",
+        "FORCE", "FOREACH", "FOREIGN", "FORTRAN", "FORWARD", "FOUND", "FREE", "FREELIST",
+        "FREELISTS", "FREEZE", "FROM", "FROM_UNIXTIME", "FTP", "FULL", "FUNCTION", "GENERAL",
+        "GENERATED", "GET", "GLOBAL", "GO", "GOTO", "GRANT", "GRANTED", "GROUP", "GROUPING",
+        "GSCLUSTER", "HASH", "HAVING", "HIERARCHY", "HOLD", "HOST", "HOUR", "IDENTIFIED",
+        "IDENTITY", "IF", "IGNORE", "ILIKE", "IMMEDIATE", "IMMUTABLE", "IMPLEMENTATION", "IMPLICIT",
+        "IN", "INCLUDE", "INCLUDING", "INCREMENT", "INDEX", "INDEXES", "INDICATOR", "INET", "INFIX",
+        "INHERIT", "INHERITS", "INITIAL", "INITIALIZE", "INITIALLY", "INITRANS", "INLINE", "INNER",
+        "INOUT", "INPUT", "INSENSITIVE", "INSERT", "INSTANCE", "INSTANTIABLE", "INSTEAD", "INSTR",
+        "INT", "INT8", "INTEGER", "INTERSECT", "INTERVAL", "INTO", "INVOKER", "IS", "ISNULL",
+        "ISOLATION", "ISSUE", "ITERATE", "JOIN", "JSON", "JSONB", "KEY", "KEY_MEMBER", "KEY_TYPE",
+        "LANCOMPILER", "LANGUAGE", "LARGE", "LAST", "LATERAL", "LAYER", "LEADING", "LEAVE", "LEFT",
+        "LEN", "LENGTH", "LESS", "LEVEL", "LIKE", "LIMIT", "LINE", "LINK", "LISTEN", "LISTS",
+        "LOAD", "LOCAL", "LOCALTIME", "LOCALTIMESTAMP", "LOCATE", "LOCATION", "LOCATOR", "LOCK",
+        "LOGFILE", "LONG", "LOOKUP", "LOOP", "LOWER", "LSEG", "MACADDR", "MANAGE", "MANUAL", "MAP",
+        "MATCH", "MAX", "MAXDATAFILES", "MAXELEMENT", "MAXEXTENTS", "MAXINDEX", "MAXINSTANCES",
+        "MAXLOGFILES", "MAXLOGHISTORY", "MAXLOGMEMBERS", "MAXTRANS", "MAXVALUE", "MAX_PART_DATE",
+        "MAX_PART_INT", "MAX_PART_STRING", "MERGE", "MESSAGE_LENGTH", "MESSAGE_OCTET_LENGTH",
+        "MESSAGE_TEXT", "METHOD", "MIN", "MINELEMENT", "MINEXTENTS", "MININDEX", "MINUS", "MINUTE",
+        "MINVALUE", "MIN_PART_DATE", "MIN_PART_INT", "MIN_PART_STRING", "MOD", "MODE", "MODIFIES",
+        "MODIFY", "MODULE", "MONEY", "MONTH", "MORE", "MOUNT", "MOVE", "MUMPS", "NAMES", "NATIONAL",
+        "NATURAL", "NATURALN", "NCHAR", "NCLOB", "NEW", "NEXT", "NO", "NOARCHIVELOG", "NOAUDIT",
+        "NOCACHE", "NOCOMPRESS", "NOCREATEDB", "NOCREATEUSER", "NOCYCLE", "NOMAXVALUE",
+        "NOMINVALUE", "NONE", "NOORDER", "NORESETLOGS", "NORMAL", "NOSORT", "NOT", "NOTFOUND",
+        "NOTHING", "NOTICE", "NOTIFY", "NOTNULL", "NOW", "NOWAIT", "NULL", "NULLABLE", "NULLIF",
+        "NUMBER", "NUMERIC", "NVARCHAR", "NVL", "NVL2", "OBJECT", "OCTET_LENGTH", "OF", "OFF",
+        "OFFLINE", "OFFSET", "OIDS", "OLD", "ON", "ONLINE", "ONLY", "ON_ERROR_STOP", "OPEN",
+        "OPERATION", "OPERATOR", "OPTIMAL", "OPTION", "OPTIONS", "OR", "ORDER", "ORDINALITY",
+        "ORGANIZATION", "OUT", "OUTER", "OUTPUT", "OVER", "OVERLAPS", "OVERLAY", "OVERRIDING",
+        "OVERWRITE", "OWN", "OWNER", "PACKAGE", "PAD", "PARALLEL", "PARAMETER", "PARAMETERS",
+        "PARAMETER_MODE", "PARAMETER_NAME", "PARAMETER_ORDINAL_POSITION",
+        "PARAMETER_SPECIFIC_CATALOG", "PARAMETER_SPECIFIC_NAME", "PARAMETER_SPECIFIC_SCHEMA",
+        "PARSE_URL_TUPLE", "PARTIAL", "PARTITION", "PART_COUNT", "PART_COUNT_BY", "PART_LOC",
+        "PASCAL", "PATH", "PCTFREE", "PCTINCREASE", "PCTUSED", "PENDANT", "PERFORM", "PG_LSN",
+        "PIVOT", "PLACING", "PLAN", "PLI", "PLPGSQL", "PLS_INTEGER", "POINT", "POLYGON",
+        "POSEXPLODE", "POSITION", "POSITIVE", "POSITIVEN", "POSTFIX", "PRECEDING", "PRECISION",
+        "PREFIX", "PREORDER", "PREPARE", "PRESERVE", "PRIMARY", "PRINT", "PRIOR", "PRIVATE",
+        "PRIVILEGES", "PROCEDURAL", "PROCEDURE", "PROFILE", "PROTO", "PUBLIC", "PUT_LINE",
+        "QUALIFY", "QUARTER", "QUOTA", "RAISE", "RANGE", "RAW", "READ", "READS", "REAL", "RECHECK",
+        "RECOVER", "RECURSIVE", "REDUCE", "REF", "REFERENCES", "REFERENCING", "REGEXP",
+        "REGEXP_REPLACE", "REINDEX", "RELATIVE", "RENAME", "REPEATABLE", "REPLACE", "RESET",
+        "RESETLOGS", "RESIGNAL", "RESOURCE", "RESPECT", "RESTART", "RESTRICT", "RESTRICTED",
+        "RESULT", "RETURN", "RETURNED_LENGTH", "RETURNED_OCTET_LENGTH", "RETURNED_SQLSTATE",
+        "RETURNING", "RETURNS", "REUSE", "REVOKE", "RIGHT", "RLIKE", "ROLE", "ROLES", "ROLLBACK",
+        "ROLLUP", "ROUTINE", "ROUTINE_CATALOG", "ROUTINE_NAME", "ROUTINE_SCHEMA", "ROW", "ROWID",
+        "ROWLABEL", "ROWNUM", "ROWS", "ROW_COUNT", "RTRIM", "RULE", "SAMPLE", "SAVEPOINT",
+        "SAVE_POINT", "SCALE", "SCHEMA", "SCHEMA_NAME", "SCN", "SCOPE", "SCROLL", "SEARCH",
+        "SECOND", "SECTION", "SECURITY", "SEGMENT", "SELECT", "SELF", "SENSITIVE", "SEQUENCE",
+        "SERIAL", "SERIAL8", "SERIALIZABLE", "SERVER_NAME", "SESSION", "SESSION_USER", "SET",
+        "SETOF", "SETS", "SHARE", "SHARED", "SHOW", "SIGN", "SIGNAL", "SIGNED", "SIGNTYPE",
+        "SIMILAR", "SIMPLE", "SIMPLE_DOUBLE", "SIMPLE_FLOAT", "SIMPLE_INTEGER", "SIN", "SIZE",
+        "SMALLINT", "SMALLSERIAL", "SNAPSHOT", "SOME", "SORT", "SOURCE", "SPACE", "SPECIFIC",
+        "SPECIFICTYPE", "SPECIFIC_NAME", "SPLIT", "SQL", "SQLBUF", "SQLCODE", "SQLERROR",
+        "SQLEXCEPTION", "SQLSTATE", "SQLWARNING", "SQRT", "STABLE", "STACK", "START", "STATEMENT",
+        "STATEMENT_ID", "STATIC", "STATISTICS", "STDIN", "STDOUT", "STOP", "STORAGE", "STR",
+        "STRAIGHT_JOIN", "STRICT", "STRING", "STRUCT", "STRUCTURE", "STYPE", "SUBCLASS_ORIGIN",
+        "SUBLIST", "SUBSTR", "SUBSTRING", "SUCCESSFUL", "SUM", "SUMMARY", "SWITCH", "SYMMETRIC",
+        "SYNONYM", "SYSDATE", "SYSID", "SYSTEM", "SYSTEM_USER", "SYS_REFCURSOR", "TABLE", "TABLES",
+        "TABLESAMPLE", "TABLESPACE", "TABLE_NAME", "TBLPROPERTIES", "TEMP", "TEMPLATE", "TEMPORARY",
+        "TERMINATE", "TEXT", "THAN", "THEN", "THREAD", "TIME", "TIMESTAMP", "TIMESTAMP_ISO",
+        "TIMEZONE_HOUR", "TIMEZONE_MINUTE", "TINYINT", "TO", "TOAST", "TO_CHAR", "TO_DATE",
+        "TO_TIMESTAMP", "TRACING", "TRAILING", "TRANSACTION", "TRANSACTIONS_COMMITTED",
+        "TRANSACTIONS_ROLLED_BACK", "TRANSATION", "TRANSATION_ACTIVE", "TRANSFORM", "TRANSFORMS",
+        "TRANSLATE", "TRANSLATION", "TREAT", "TRIGGER", "TRIGGERS", "TRIGGER_CATALOG",
+        "TRIGGER_NAME", "TRIGGER_SCHEMA", "TRIM", "TRUE", "TRUNC", "TRUNCATE", "TRUSTED",
+        "TRY_CAST", "TSQUERY", "TSVECTOR", "TXID_SNAPSHOT", "TYPE", "UID", "UNBOUNDED",
+        "UNCOMMITTED", "UNDER", "UNENCRYPTED", "UNION", "UNIQUE", "UNIQUEJOIN", "UNIX_TIMESTAMP",
+        "UNKNOWN", "UNLIMITED", "UNLISTEN", "UNLOCK", "UNNAMED", "UNNEST", "UNPIVOT", "UNSIGNED",
+        "UNTIL", "UPDATE", "UPPER", "UPSERT", "UROWID", "USAGE", "USE", "USER",
+        "USER_DEFINED_TYPE_CATALOG", "USER_DEFINED_TYPE_NAME", "USER_DEFINED_TYPE_SCHEMA", "USING",
+        "UTC_TIMESTAMP", "UTL_FILE", "UUID", "VACUUM", "VALID", "VALIDATE", "VALIDATOR", "VALUES",
+        "VARCHAR", "VARCHAR2", "VARIABLE", "VARIANT", "VARYING", "VERBOSE", "VERSION", "VIEW",
+        "VIEWS", "VOLATILE", "WEEK", "WHEN", "WHENEVER", "WHERE", "WHILE", "WINDOW", "WITH",
+        "WITHOUT", "WORK", "WRITE", "XML", "YEAR", "ZONE",
+    }
+)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _tokenize(query: str) -> typing.List[typing.Tuple[str, str]]:
+    tokens = []
+    position = 0
+    for match in _TOKEN_RE.finditer(query):
+        if match.start() != position:
+            raise _Unsupported()
+        position = match.end()
+
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        if kind == "unsupported":
+            raise _Unsupported()
+
+        value = match.group()
+        if kind == "name":
+            upper = value.upper()
+            if upper in _GRAMMAR_KEYWORDS:
+                kind, value = "keyword", upper
+            elif any(part.upper() in _SQL_KEYWORDS for part in value.split(".")):
+                raise _Unsupported()
+        tokens.append((kind, value))
+
+    if position != len(query):
+        raise _Unsupported()
+    return tokens
+
+
+class _Extractor:
+    """
+    Recursive descent over the supported subset of SELECT, INSERT and UPDATE statements.
+    """
+
+    def __init__(self, tokens: typing.List[typing.Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+        self.table = None
+        self.alias = None
+        self.columns = []
+        self.select_size = 0
+        self.column_aliases = set()
+
+    def peek(self, offset: int = 0) -> typing.Tuple[str, typing.Optional[str]]:
+        position = self.position + offset
+        if position < len(self.tokens):
+            return self.tokens[position]
+        return ("end", None)
+
+    def take(self, kind: str, value: typing.Optional[str] = None) -> str:
+        token_kind, token_value = self.peek()
+        if token_kind != kind or (value is not None and token_value != value):
+            raise _Unsupported()
+        self.position += 1
+        return token_value
+
+    def accept(self, kind: str, value: typing.Optional[str] = None) -> bool:
+        token_kind, token_value = self.peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self.position += 1
+            return True
+        return False
+
+    def accept_keyword(self, *values: str) -> bool:
+        token_kind, token_value = self.peek()
+        if token_kind == "keyword" and token_value in values:
+            self.position += 1
+            return True
+        return False
+
+    def extract(self) -> typing.Tuple[typing.List[str], typing.List[str]]:
+        if self.accept_keyword("SELECT"):
+            self.select()
+        elif self.accept_keyword("INSERT"):
+            self.insert()
+        elif self.accept_keyword("UPDATE"):
+            self.update()
+        else:
+            raise _Unsupported()
+
+        self.accept("punctuation", ";")
+        self.take("end")
+
+        # sql_metadata resolves names shadowed by aliases differently, leave those to it
+        names = {column.rpartition(".")[2] for column in self.columns[:self.select_size]}
+        names.add(self.table.rpartition(".")[2])
+        if not self.column_aliases.isdisjoint(names):
+            raise _Unsupported()
+        if self.alias is not None and (
+            self.alias in names or self.alias in self.column_aliases or self.alias in self.columns
+        ):
+            raise _Unsupported()
+
+        columns = []
+        for position, column in enumerate(self.columns):
+            qualifier, _, name = column.rpartition(".")
+            if not qualifier:
+                # Aliases of the select list can be referenced in other clauses
+                if position >= self.select_size and column in self.column_aliases:
+                    continue
+            elif qualifier == self.alias:
+                column = f"{self.table}.{name}"
+            elif qualifier != self.table:
+                raise _Unsupported()
+            if column not in columns:
+                columns.append(column)
+
+        return [self.table], columns
+
+    def select(self) -> None:
+        self.accept_keyword("DISTINCT")
+        while True:
+            if self.accept("punctuation", "*"):
+                self.columns.append("*")
+            else:
+                self.columns.append(self.take("name"))
+                if self.accept_keyword("AS"):
+                    self.column_aliases.add(self.take("name"))
+                elif self.peek()[0] == "name":
+                    self.column_aliases.add(self.take("name"))
+            if not self.accept("punctuation", ","):
+                break
+        self.select_size = len(self.columns)
+
+        self.take("keyword", "FROM")
+        self.table_reference(allow_alias=True)
+
+        if self.accept_keyword("WHERE"):
+            self.condition()
+        if self.accept_keyword("GROUP"):
+            self.take("keyword", "BY")
+            self.column_list(ordering=False)
+        if self.accept_keyword("ORDER"):
+            self.take("keyword", "BY")
+            self.column_list(ordering=True)
+        if self.accept_keyword("LIMIT"):
+            self.take("number")
+            if self.accept_keyword("OFFSET"):
+                self.take("number")
+
+    def insert(self) -> None:
+        self.take("keyword", "INTO")
+        self.table_reference(allow_alias=False)
+        if self.accept("punctuation", "("):
+            while True:
+                self.columns.append(self.take("name"))
+                if not self.accept("punctuation", ","):
+                    break
+            self.take("punctuation", ")")
+
+        self.take("keyword", "VALUES")
+        while True:
+            self.take("punctuation", "(")
+            while True:
+                self.literal()
+                if not self.accept("punctuation", ","):
+                    break
+            self.take("punctuation", ")")
+            if not self.accept("punctuation", ","):
+                break
+
+    def update(self) -> None:
+        self.table_reference(allow_alias=False)
+        self.take("keyword", "SET")
+        while True:
+            self.columns.append(self.take("name"))
+            self.take("operator", "=")
+            self.operand()
+            if not self.accept("punctuation", ","):
+                break
+
+        if self.accept_keyword("WHERE"):
+            self.condition()
+
+    def table_reference(self, allow_alias: bool) -> None:
+        table = self.take("name")
+        if table.endswith("*"):
+            raise _Unsupported()
+        self.table = table
+
+        if allow_alias:
+            if self.accept_keyword("AS"):
+                self.alias = self.take("name")
+            elif self.peek()[0] == "name":
+                self.alias = self.take("name")
+
+    def column_list(self, ordering: bool) -> None:
+        while True:
+            if not self.accept("number"):
+                self.columns.append(self.take("name"))
+            if ordering:
+                self.accept_keyword("ASC", "DESC")
+                if self.accept_keyword("NULLS"):
+                    if not self.accept_keyword("FIRST", "LAST"):
+                        raise _Unsupported()
+            if not self.accept("punctuation", ","):
+                break
+
+    def literal(self) -> None:
+        kind, value = self.peek()
+        if kind == "minus":
+            self.position += 1
+            self.take("number")
+        elif kind in ("number", "string", "param") or (
+            kind == "keyword" and value in _LITERAL_KEYWORDS
+        ):
+            self.position += 1
+        else:
+            raise _Unsupported()
+
+    def operand(self) -> None:
+        if self.peek()[0] == "name":
+            self.columns.append(self.take("name"))
+        else:
+            self.literal()
+
+    def condition(self) -> None:
+        # True for parentheses opened by IN, sql_metadata reads NULL and parameters there as columns
+        parentheses = []
+        expect_operand = True
+        while True:
+            kind, value = self.peek()
+            if kind == "punctuation" and value == "(":
+                parentheses.append(self.tokens[self.position - 1] == ("keyword", "IN"))
+            elif kind == "punctuation" and value == ")":
+                if not parentheses:
+                    raise _Unsupported()
+                parentheses.pop()
+            elif kind == "punctuation" and value == ",":
+                if not parentheses:
+                    raise _Unsupported()
+                expect_operand = True
+            elif kind == "keyword" and value in _CONDITION_KEYWORDS:
+                expect_operand = True
+            elif kind == "operator":
+                expect_operand = True
+            elif kind == "name" and expect_operand:
+                self.columns.append(value)
+                expect_operand = False
+                if self.peek(1) == ("punctuation", "("):
+                    raise _Unsupported()
+            elif kind in ("number", "string", "minus"):
+                expect_operand = kind == "minus"
+            elif kind == "param" or (kind == "keyword" and value in _LITERAL_KEYWORDS):
+                if parentheses and parentheses[-1]:
+                    raise _Unsupported()
+                expect_operand = False
+            else:
+                break
+            self.position += 1
+
+        if parentheses:
+            raise _Unsupported()
+
+
+def extract_simple(
+    query: str,
+) -> typing.Optional[typing.Tuple[typing.List[str], typing.List[str]]]:
+    """
+    Extract tables and columns of simple statements without sql_metadata.
+
+    Supports single-table ``SELECT cols FROM table [WHERE ...] [GROUP BY ...] [ORDER BY ...] [LIMIT n]``,
+    ``INSERT INTO table [(cols)] VALUES (...)`` and ``UPDATE table SET col = ... [WHERE ...]``
+    with plain comparisons in conditions. Output matches ``sql_metadata.Parser``.
+
+    :param query: Query to analyze
+    :return: Tables and columns, or None when the query needs the full parser
+    """
+    try:
+        return _Extractor(_tokenize(query)).extract()
+    except _Unsupported:
+        return None
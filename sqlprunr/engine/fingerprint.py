@@ -0,0 +1,140 @@
+from collections import OrderedDict, namedtuple
+import re
+import typing
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<string>'(?:[^']|'')*'|\$\$.*?\$\$)
+    |(?P<identifier>"(?:[^"]|"")*")
+    |(?P<number>\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b)
+    |(?P<space>\s+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_LITERAL_RE = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<string>'(?:[^']|'')*'|\$\$.*?\$\$)
+    |(?P<number>\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# Reserved words only, words that are also common column names (date, name, type, ...) keep
+# their case like any other identifier
+_KEYWORDS = frozenset((
+    "select", "distinct", "from", "where", "join", "inner", "left", "right", "full", "outer",
+    "cross", "on", "and", "or", "not", "in", "is", "null", "as", "group", "by", "order",
+    "having", "limit", "offset", "union", "all", "intersect", "except", "insert", "into",
+    "values", "update", "set", "delete", "merge", "using", "when", "then", "else", "end",
+    "case", "with", "between", "like", "ilike", "exists", "asc", "desc", "create", "table",
+    "drop", "alter", "over", "partition", "qualify", "lateral", "natural", "true", "false",
+))
+_VALUE_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROW_LIST_RE = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Normalize query to a fingerprint shared by all queries built from the same template.
+
+    Comments are removed, string and numeric literals are replaced with ``?``, value lists
+    are collapsed, whitespace is collapsed and keywords are lowercased. Identifiers keep their
+    case, queries sharing a fingerprint share the cached parse result and the parser returns
+    identifiers as written.
+
+    :param query: Query to fingerprint
+    :return: Normalized query
+    """
+    if '"' not in query:
+        # Without quoted identifiers literals are replaced in one pass, whitespace separated
+        # words are folded when they are keywords
+        words = _LITERAL_RE.sub(_replace_literal, query).split()
+        fingerprint = " ".join([_fold_keyword(word) for word in words])
+    else:
+        fingerprint = _fingerprint_tokens(query)
+
+    fingerprint = _VALUE_LIST_RE.sub("(?)", fingerprint)
+    return _ROW_LIST_RE.sub("(?)", fingerprint)
+
+
+def _fold_keyword(word: str) -> str:
+    # Keywords glued to punctuation (e.g. ``(SELECT``) keep their case, which only costs
+    # a cache miss, never a wrong result
+    lowered = word.lower()
+    return lowered if lowered in _KEYWORDS else word
+
+
+def _replace_literal(match: re.Match) -> str:
+    return " " if match.lastgroup == "comment" else "?"
+
+
+def _fingerprint_tokens(query: str) -> str:
+    parts = []
+    position = 0
+    for match in _TOKEN_RE.finditer(query):
+        parts.append(_fold_keyword(query[position:match.start()]))
+        kind = match.lastgroup
+        if kind == "identifier":
+            parts.append(match.group())
+        elif kind in ("string", "number"):
+            parts.append("?")
+        else:
+            parts.append(" ")
+        position = match.end()
+    parts.append(_fold_keyword(query[position:]))
+    return "".join(parts).strip()
+
+
+class QueryCache:
+    """
+    QueryCache is a bounded LRU cache of parsed queries keyed by query fingerprint.
+
+    :param maxsize: Maximum number of cached fingerprints
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key: str) -> typing.Optional[typing.Any]:
+        """
+        Return cached value for the key or None, counting the hit or miss.
+
+        :param key: Query fingerprint
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: typing.Any) -> None:
+        """
+        Store value for the key, evicting the least recently used entry when full.
+
+        :param key: Query fingerprint
+        :param value: Parsed query data
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
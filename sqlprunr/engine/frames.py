@@ -0,0 +1,215 @@
+from dataclasses import dataclass, fields
+import typing
+
+import numpy as np
+import pandas as pd
+
+from sqlprunr.data.generic import Database
+from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.analyzer import analyze_text
+from sqlprunr.engine.fingerprint import QueryCache, fingerprint_query
+from sqlprunr.engine.instrumentation import get_instrumentation
+from sqlprunr.engine.parser.builder import build_databases
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData
+from sqlprunr.engine.timestamps import parse_timestamps
+
+
+@dataclass
+class FrequencyFrames:
+    """
+    Frequencies of tables, columns and queries as DataFrames sorted by ``COUNT`` in
+    descending order, ties keep the order of first use.
+
+    :param tables: ``TABLE``, ``COUNT``
+    :param columns: ``COLUMN``, ``COUNT``
+    :param queries: ``QUERY_TEXT``, ``COUNT``
+    :param table_columns: ``TABLE``, ``COLUMN``, ``COUNT``, columns attributed to the tables
+        of the query they were read in
+    """
+    tables: pd.DataFrame
+    columns: pd.DataFrame
+    queries: pd.DataFrame
+    table_columns: pd.DataFrame
+
+    def to_frequencies(self) -> Frequencies:
+        """
+        Return the frequencies as Frequencies, e.g. for find_unused_tables.
+        """
+        table_columns = {}
+        for table, column, count in zip(
+            self.table_columns["TABLE"].tolist(),
+            self.table_columns["COLUMN"].tolist(),
+            self.table_columns["COUNT"].tolist(),
+        ):
+            table_columns.setdefault(table, {})[column] = count
+
+        return Frequencies(
+            tables=dict(zip(self.tables["TABLE"].tolist(), self.tables["COUNT"].tolist())),
+            columns=dict(zip(self.columns["COLUMN"].tolist(), self.columns["COUNT"].tolist())),
+            queries=dict(
+                zip(self.queries["QUERY_TEXT"].tolist(), self.queries["COUNT"].tolist())
+            ),
+            table_columns=table_columns,
+        )
+
+
+def _check_columns(frame: pd.DataFrame, record_type: type) -> typing.List[str]:
+    names = [field.name for field in fields(record_type)]
+    missing = set(names).difference(frame.columns)
+    if missing:
+        raise ValueError(
+            f"DataFrame is missing columns required by {record_type.__name__}: {sorted(missing)}"
+        )
+    return names
+
+
+def parse_schema_frame(frame: pd.DataFrame) -> typing.List[Database]:
+    """
+    Parse schema from a DataFrame of Snowflake ``INFORMATION_SCHEMA.COLUMNS``, see
+    SnowflakeCSVTableParser for the same from CSV rows.
+
+    Repeated columns are dropped with a single vectorized pass, the remaining rows are built
+    with the same schema builder as CSV exports, so both give equal databases.
+
+    :param frame: DataFrame with DATABASE_NAME, SCHEMA_NAME, TABLE_NAME, COLUMN_NAME and
+        DATA_TYPE columns, other columns are ignored
+    :return: List of databases
+    :raises ValueError: If the frame is missing required columns or any of them has missing
+        values
+    """
+    names = _check_columns(frame, SnowflakeCSVData)
+    frame = frame[names]
+    missing = frame.isna().any()
+    if missing.any():
+        raise ValueError(
+            f"DataFrame has missing values in columns: {missing[missing].index.tolist()}"
+        )
+
+    frame = frame.drop_duplicates(subset=names[:4])
+    return build_databases(frame.itertuples(index=False, name=None))
+
+
+def _counts(
+    query_ids: typing.List[int], runs: np.ndarray, keys: typing.Dict[str, list], name: str = "COUNT"
+) -> pd.DataFrame:
+    # Every reference counts once per run of its query, references are summed in order of first use
+    frame = pd.DataFrame({**keys, name: runs[np.asarray(query_ids, dtype=np.int64)]})
+    counts = frame.groupby(list(keys), sort=False)[name].sum().reset_index()
+    return counts.sort_values(name, ascending=False, kind="stable", ignore_index=True)
+
+
+def get_frequencies_frame(
+    frame: pd.DataFrame,
+    *,
+    tables: bool = True,
+    columns: bool = True,
+    cache: typing.Optional[QueryCache] = None,
+) -> FrequencyFrames:
+    """
+    Get frequencies of tables and columns in a DataFrame of Snowflake ``QUERY_HISTORY``.
+
+    Query texts are deduplicated first, every distinct text is analyzed once and the
+    references are counted with groupbys weighted by the number of runs of the text.
+    The result is the same as get_frequencies of the rows, rows without a query text are
+    skipped.
+
+    :param frame: DataFrame with a QUERY_TEXT column
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param cache: Cache of parsed queries, a new one is created when not specified
+    :raises ValueError: If the frame is missing the QUERY_TEXT column
+    """
+    if "QUERY_TEXT" not in frame.columns:
+        raise ValueError("DataFrame is missing columns required by QueryData: ['QUERY_TEXT']")
+
+    codes, texts = pd.factorize(frame["QUERY_TEXT"].dropna(), sort=False)
+    runs = np.bincount(codes, minlength=len(texts))
+    texts = texts.tolist()
+
+    cache = QueryCache() if cache is None else cache
+    instrumentation = get_instrumentation()
+    # References of all texts are collected into flat lists of strings and query ids,
+    # per-query containers would keep the garbage collector busy on large histories
+    table_ids, table_names = [], []
+    column_ids, column_names = [], []
+    pair_ids, pair_tables, pair_columns = [], [], []
+    for query_id, text in enumerate(texts):
+        query_tables, query_columns, table_columns = analyze_text(
+            text, tables, columns, cache, instrumentation
+        )
+        table_ids.extend([query_id] * len(query_tables))
+        table_names.extend(query_tables)
+        column_ids.extend([query_id] * len(query_columns))
+        column_names.extend(query_columns)
+        pair_ids.extend([query_id] * len(table_columns))
+        for table, column in table_columns:
+            pair_tables.append(table)
+            pair_columns.append(column)
+
+    return FrequencyFrames(
+        tables=_counts(table_ids, runs, {"TABLE": table_names}),
+        columns=_counts(column_ids, runs, {"COLUMN": column_names}),
+        queries=pd.DataFrame({"QUERY_TEXT": texts, "COUNT": runs}).sort_values(
+            "COUNT", ascending=False, kind="stable", ignore_index=True
+        ),
+        table_columns=_counts(pair_ids, runs, {"TABLE": pair_tables, "COLUMN": pair_columns}),
+    )
+
+
+def _timestamps(values: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if getattr(values.dt, "tz", None) is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        return values.to_numpy().astype("datetime64[ms]")
+    return parse_timestamps(values.astype(str).tolist())
+
+
+def get_time_spent_frame(frame: pd.DataFrame, *, by: str = "text") -> pd.DataFrame:
+    """
+    Get execution time statistics of the queries in a DataFrame of Snowflake ``QUERY_HISTORY``,
+    in seconds, see get_query_costs for the same from QueryData.
+
+    START_TIME and END_TIME may be strings in any format supported by parse_timestamp or
+    datetime columns, timezone-aware columns are compared in UTC. Rows without a query text
+    are skipped.
+
+    :param frame: DataFrame with QUERY_TEXT, START_TIME and END_TIME columns
+    :param by: ``text`` to group runs by query text, ``fingerprint`` to group queries built
+        from the same template
+    :return: DataFrame with QUERY_TEXT (or FINGERPRINT), COUNT, TOTAL, MEAN, P50, P95 and MAX
+        columns, sorted by TOTAL in descending order
+    :raises ValueError: If the frame is missing required columns or grouping is not supported
+    """
+    _check_columns(frame, QueryData)
+    if by not in ("text", "fingerprint"):
+        raise ValueError(f"Unsupported grouping: {by}, use 'text' or 'fingerprint'.")
+
+    frame = frame[frame["QUERY_TEXT"].notna()]
+    codes, texts = pd.factorize(frame["QUERY_TEXT"], sort=False)
+    name = "QUERY_TEXT"
+    if by == "fingerprint":
+        # Every distinct text is fingerprinted once, runs are regrouped by fingerprint
+        text_codes, texts = pd.factorize(
+            pd.Series([fingerprint_query(text) for text in texts.tolist()], dtype=object),
+            sort=False,
+        )
+        codes = text_codes[codes]
+        name = "FINGERPRINT"
+
+    durations = (
+        _timestamps(frame["END_TIME"]) - _timestamps(frame["START_TIME"])
+    ).astype(np.float64) / 1000
+    groups = pd.Series(durations).groupby(codes, sort=True)
+
+    costs = pd.DataFrame(
+        {
+            name: np.asarray(texts, dtype=object),
+            "COUNT": groups.count().to_numpy(),
+            "TOTAL": groups.sum().to_numpy(),
+            "MEAN": groups.mean().to_numpy(),
+            "P50": groups.quantile(0.5).to_numpy(),
+            "P95": groups.quantile(0.95).to_numpy(),
+            "MAX": groups.max().to_numpy(),
+        }
+    )
+    return costs.sort_values("TOTAL", ascending=False, kind="stable", ignore_index=True)
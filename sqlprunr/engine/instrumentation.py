@@ -0,0 +1,212 @@
+from contextlib import contextmanager
+import heapq
+import time
+import typing
+
+_current: typing.Optional["Instrumentation"] = None
+
+
+class Instrumentation:
+    """
+    Instrumentation collects stage timings, counters and the slowest queries of a run.
+
+    Instrumentation is off until an instance is enabled with ``instrument`` or
+    ``set_instrumentation``, hooks then cost a single ``None`` check per query.
+
+    Stages recorded by SQLPrunr: ``parse`` (statements parsed by the parser), ``analyze``
+    (whole queries in get_frequencies and friends), ``merge`` (partial results of worker
+    processes), ``parse_schema``, ``find_unused_tables`` and ``find_unused_columns``.
+    Counters: ``parsed``, ``fast_path`` (parsed without sql_metadata), ``cached``, ``failed``
+    (statements), ``skipped`` (queries without any analyzed statement).
+
+    :param slowest: Number of slowest queries to keep
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.slowest = slowest
+        self.stages: typing.Dict[str, typing.List[float]] = {}
+        self.counters: typing.Dict[str, int] = {}
+        self._slowest: typing.List[typing.Tuple[float, str]] = []
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """
+        Increment the counter.
+
+        :param counter: Name of the counter
+        :param value: Value to add
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Record a single run of the stage.
+
+        :param stage: Name of the stage
+        :param seconds: Duration of the run
+        """
+        stats = self.stages.get(stage)
+        if stats is None:
+            self.stages[stage] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            if seconds > stats[2]:
+                stats[2] = seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> typing.Iterator[None]:
+        """
+        Record duration of the block as a run of the stage.
+
+        :param stage: Name of the stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def observe_query(self, query: str, seconds: float) -> None:
+        """
+        Record analysis of a query, the slowest ones are kept.
+
+        :param query: Query text
+        :param seconds: Time spent analyzing the query
+        """
+        self.record("analyze", seconds)
+        self._keep_slowest(query, seconds)
+
+    def _keep_slowest(self, query: str, seconds: float) -> None:
+        if len(self._slowest) < self.slowest:
+            heapq.heappush(self._slowest, (seconds, query))
+        elif self._slowest and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, query))
+
+    def slowest_queries(self) -> typing.List[typing.Tuple[str, float]]:
+        """
+        Return the slowest queries with their analysis time, slowest first.
+        """
+        return [(query, seconds) for seconds, query in sorted(self._slowest, reverse=True)]
+
+    def merge(self, other: "Instrumentation") -> "Instrumentation":
+        """
+        Merge measurements of another instance into this one, e.g. from a worker process.
+
+        :param other: Instrumentation to merge
+        :return: This instrumentation
+        """
+        for counter, value in other.counters.items():
+            self.increment(counter, value)
+        for stage, (count, total, maximum) in other.stages.items():
+            stats = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            stats[0] += count
+            stats[1] += total
+            stats[2] = max(stats[2], maximum)
+        for seconds, query in other._slowest:
+            self._keep_slowest(query, seconds)
+        return self
+
+    def reset(self) -> None:
+        """
+        Remove all measurements.
+        """
+        self.stages.clear()
+        self.counters.clear()
+        self._slowest.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Return all measurements as a JSON serializable dict.
+        """
+        return {
+            "stages": {
+                stage: {
+                    "count": count,
+                    "total_seconds": total,
+                    "mean_seconds": total / count,
+                    "max_seconds": maximum,
+                }
+                for stage, (count, total, maximum) in list(self.stages.items())
+            },
+            "counters": dict(self.counters),
+            "slowest_queries": [
+                {"query": query, "seconds": seconds} for query, seconds in self.slowest_queries()
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = "sqlprunr") -> str:
+        """
+        Return stage timings and counters in Prometheus text exposition format.
+
+        Slowest queries are left out, query texts are not suitable as label values.
+
+        :param prefix: Prefix of the metric names
+        """
+        stages = list(self.stages.items())
+        lines = [
+            f"# HELP {prefix}_stage_seconds_total Time spent in the stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        lines.extend(
+            f'{prefix}_stage_seconds_total{{stage="{stage}"}} {total!r}'
+            for stage, (_, total, _) in stages
+        )
+        lines.append(f"# HELP {prefix}_stage_runs_total Number of runs of the stage.")
+        lines.append(f"# TYPE {prefix}_stage_runs_total counter")
+        lines.extend(
+            f'{prefix}_stage_runs_total{{stage="{stage}"}} {count}' for stage, (count, _, _) in stages
+        )
+        lines.append(f"# HELP {prefix}_stage_max_seconds Longest run of the stage.")
+        lines.append(f"# TYPE {prefix}_stage_max_seconds gauge")
+        lines.extend(
+            f'{prefix}_stage_max_seconds{{stage="{stage}"}} {maximum!r}'
+            for stage, (_, _, maximum) in stages
+        )
+        lines.append(f"# HELP {prefix}_events_total Number of queries and statements by outcome.")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        lines.extend(
+            f'{prefix}_events_total{{event="{counter}"}} {value}'
+            for counter, value in list(self.counters.items())
+        )
+        return "\n".join(lines) + "\n"
+
+
+def get_instrumentation() -> typing.Optional[Instrumentation]:
+    """
+    Return enabled instrumentation, None when instrumentation is off.
+    """
+    return _current
+
+
+def set_instrumentation(
+    instrumentation: typing.Optional[Instrumentation],
+) -> typing.Optional[Instrumentation]:
+    """
+    Enable the instrumentation, or turn instrumentation off with None.
+
+    :param instrumentation: Instrumentation to enable
+    :return: Previously enabled instrumentation
+    """
+    global _current
+    previous = _current
+    _current = instrumentation
+    return previous
+
+
+@contextmanager
+def instrument(
+    instrumentation: typing.Optional[Instrumentation] = None,
+) -> typing.Iterator[Instrumentation]:
+    """
+    Enable the instrumentation for the block.
+
+    :param instrumentation: Instrumentation to enable, a new one is created when not specified
+    """
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+
+    previous = set_instrumentation(instrumentation)
+    try:
+        yield instrumentation
+    finally:
+        set_instrumentation(previous)
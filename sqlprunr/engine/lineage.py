@@ -0,0 +1,328 @@
+import re
+import typing
+
+import numpy as np
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import analyze_statement, clean_query
+from sqlprunr.engine.fingerprint import QueryCache
+from sqlprunr.engine.instrumentation import Instrumentation, get_instrumentation
+from sqlprunr.engine.resolver import split_reference
+from sqlprunr.engine.statements import split_statements
+
+_NAME = r'(?:"[^"]*"|[\w$]+)(?:\s*\.\s*(?:"[^"]*"|[\w$]+))*'
+
+_WRITE_RE = re.compile(
+    rf"""
+    ^\s*(?:
+        (?P<insert>insert\s+(?:overwrite\s+)?(?:into\s+)?)
+        |(?P<create>create\s+(?:or\s+replace\s+)?(?:(?:local|global)\s+)?
+            (?:(?:temp|temporary|transient|volatile)\s+)?table\s+(?:if\s+not\s+exists\s+)?)
+        |(?P<merge>merge\s+into\s+)
+        |(?P<update>update\s+)
+    )
+    (?P<target>{_NAME})
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+_CTAS_RE = re.compile(r"\bas\s*(?P<paren>\()?\s*(?=(?:select|with)\b)", re.IGNORECASE)
+_USING_RE = re.compile(rf"\busing\s+(?:(?P<name>{_NAME})|\()", re.IGNORECASE)
+
+
+def table_key(reference: str) -> str:
+    """
+    Return the node name of a table reference, identifiers are normalized and unquoted.
+
+    :param reference: Table reference as found in a query
+    """
+    return ".".join(split_reference(reference))
+
+
+def _closing_paren(text: str, start: int) -> int:
+    depth = 1
+    for position in range(start, len(text)):
+        if text[position] == "(":
+            depth += 1
+        elif text[position] == ")":
+            depth -= 1
+            if depth == 0:
+                return position
+    return len(text)
+
+
+def analyze_lineage(
+    statement: str,
+    *,
+    cache: typing.Optional[QueryCache] = None,
+    instrumentation: typing.Optional[Instrumentation] = None,
+) -> typing.Tuple[typing.List[str], typing.Optional[str]]:
+    """
+    Return tables of the statement and the table it writes to.
+
+    INSERT, UPDATE, MERGE and CREATE TABLE ... AS SELECT write to their target table, the
+    other tables of such statement are its sources. CTAS and MERGE are not supported by the
+    parser, tables of their query part are analyzed instead.
+
+    :param statement: Single SQL statement
+    :param cache: Cache of parsed queries
+    :param instrumentation: Instrumentation to record parsing into
+    :return: Tables used in the statement, including the target, and the target or None
+    :raises ValueError: If the statement cannot be parsed
+    """
+    match = _WRITE_RE.match(statement)
+    if match is None:
+        return list(analyze_statement(statement, cache, instrumentation)[0]), None
+
+    target = match.group("target")
+    rest = statement[match.end():]
+    if match.group("create"):
+        select = _CTAS_RE.search(rest)
+        if select is None:
+            return [target], target
+        stop = _closing_paren(rest, select.end()) if select.group("paren") else len(rest)
+        sources = analyze_statement(rest[select.end():stop], cache, instrumentation)[0]
+    elif match.group("merge"):
+        using = _USING_RE.search(rest)
+        if using is None:
+            return [target], target
+        if using.group("name"):
+            sources = (using.group("name"),)
+        else:
+            subquery = rest[using.end():_closing_paren(rest, using.end())]
+            sources = analyze_statement(subquery, cache, instrumentation)[0]
+    else:
+        tables = list(analyze_statement(statement, cache, instrumentation)[0])
+        # The parser returns the target as written, match it against the parsed tables
+        key = table_key(target)
+        for table in tables:
+            if table_key(table) == key:
+                return tables, table
+        return [target, *tables], target
+
+    return [target, *sources], target
+
+
+class TableGraph:
+    """
+    TableGraph indexes lineage (source table to the table written from it) and co-access
+    (tables used in the same statement) of analyzed queries.
+
+    Edges are kept as dict-of-counters, so queries can be added at any time. Traversals run
+    over CSR arrays built from the counters on first use after an update and answer
+    downstream/upstream queries level by level with array operations.
+
+    Tables are identified by normalized references (see table_key), references that are
+    qualified differently in different queries are separate nodes.
+    """
+
+    def __init__(self):
+        self._ids: typing.Dict[str, int] = {}
+        self._names: typing.List[str] = []
+        self._lineage: typing.List[typing.Dict[int, int]] = []
+        self._co_access: typing.List[typing.Dict[int, int]] = []
+        self._csr: typing.Dict[str, typing.Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _id(self, table: str) -> int:
+        key = table_key(table)
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self._names)
+            self._names.append(key)
+            self._lineage.append({})
+            self._co_access.append({})
+        return node
+
+    def add_statement(
+        self, tables: typing.Iterable[str], target: typing.Optional[str] = None, count: int = 1
+    ) -> None:
+        """
+        Add tables of a single statement.
+
+        :param tables: Tables used in the statement
+        :param target: Table the statement writes to, every other table becomes its source
+        :param count: Number of runs of the statement
+        """
+        nodes = list(dict.fromkeys(self._id(table) for table in tables))
+        for i, node in enumerate(nodes):
+            co_access = self._co_access[node]
+            for other in nodes[:i] + nodes[i + 1:]:
+                co_access[other] = co_access.get(other, 0) + count
+
+        if target is not None:
+            target = self._id(target)
+            for node in nodes:
+                if node != target:
+                    lineage = self._lineage[node]
+                    lineage[target] = lineage.get(target, 0) + count
+        self._csr.clear()
+
+    def add_query(self, query: QueryData, *, cache: typing.Optional[QueryCache] = None) -> None:
+        """
+        Analyze the query and add every statement of it, statements that cannot be analyzed
+        are skipped.
+
+        :param query: Query to add
+        :param cache: Cache of parsed queries
+        """
+        instrumentation = get_instrumentation()
+        for statement in split_statements(query.QUERY_TEXT):
+            try:
+                tables, target = analyze_lineage(
+                    clean_query(statement), cache=cache, instrumentation=instrumentation
+                )
+            except (ValueError, IndexError):
+                if instrumentation is not None:
+                    instrumentation.increment("failed")
+                continue
+            self.add_statement(tables, target)
+
+    def merge(self, other: "TableGraph") -> "TableGraph":
+        """
+        Merge edges of another graph into this one.
+
+        :param other: Graph to merge
+        :return: This graph
+        """
+        ids = [self._id(name) for name in other._names]
+        for edges, other_edges in ((self._lineage, other._lineage), (self._co_access, other._co_access)):
+            for node, targets in enumerate(other_edges):
+                counts = edges[ids[node]]
+                for target, count in targets.items():
+                    counts[ids[target]] = counts.get(ids[target], 0) + count
+        self._csr.clear()
+        return self
+
+    def to_csr(self, kind: str = "lineage") -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return adjacency of the graph as CSR arrays, row of every node lists its neighbours.
+
+        :param kind: ``lineage`` (sources to targets), ``upstream`` (targets to sources) or
+            ``co_access``
+        :return: indptr, indices and counts, nodes are numbered in order of tables()
+        """
+        csr = self._csr.get(kind)
+        if csr is not None:
+            return csr
+
+        if kind == "upstream":
+            indptr, indices, counts = self.to_csr("lineage")
+            sources = np.repeat(np.arange(len(self._names)), np.diff(indptr))
+            order = np.argsort(indices, kind="stable")
+            indptr = np.zeros(len(self._names) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(indices, minlength=len(self._names)), out=indptr[1:])
+            csr = indptr, sources[order].astype(np.int32), counts[order]
+        elif kind in ("lineage", "co_access"):
+            edges = self._lineage if kind == "lineage" else self._co_access
+            indptr = np.zeros(len(edges) + 1, dtype=np.int64)
+            np.cumsum([len(targets) for targets in edges], out=indptr[1:])
+            indices = np.fromiter(
+                (target for targets in edges for target in targets), dtype=np.int32, count=indptr[-1]
+            )
+            counts = np.fromiter(
+                (count for targets in edges for count in targets.values()),
+                dtype=np.int64,
+                count=indptr[-1],
+            )
+            csr = indptr, indices, counts
+        else:
+            raise ValueError(f"Unsupported kind: {kind}, use 'lineage', 'upstream' or 'co_access'.")
+
+        self._csr[kind] = csr
+        return csr
+
+    def _traverse(
+        self, table: str, kind: str, stop: typing.Optional[int] = None
+    ) -> typing.List[int]:
+        start = self._ids.get(table_key(table))
+        if start is None:
+            return []
+
+        indptr, indices, _ = self.to_csr(kind)
+        visited = np.zeros(len(self._names), dtype=bool)
+        visited[start] = True
+        frontier = np.array([start], dtype=np.int64)
+        reached = []
+        while len(frontier):
+            starts = indptr[frontier]
+            lengths = indptr[frontier + 1] - starts
+            total = lengths.sum()
+            if not total:
+                break
+
+            # Positions of all neighbours of the frontier, without a Python loop over nodes
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+            neighbours = np.unique(indices[positions])
+            frontier = neighbours[~visited[neighbours]]
+            visited[frontier] = True
+            reached.extend(frontier.tolist())
+            if stop is not None and visited[stop]:
+                break
+        return reached
+
+    def downstream(self, table: str) -> typing.List[str]:
+        """
+        Return all tables written from the table, directly or through other tables, nearest first.
+
+        :param table: Table reference
+        """
+        return [self._names[node] for node in self._traverse(table, "lineage")]
+
+    def upstream(self, table: str) -> typing.List[str]:
+        """
+        Return all tables the table is written from, directly or through other tables, nearest first.
+
+        :param table: Table reference
+        """
+        return [self._names[node] for node in self._traverse(table, "upstream")]
+
+    def reachable(self, source: str, target: str) -> bool:
+        """
+        Return whether the target is written from the source, directly or through other tables.
+
+        :param source: Table reference
+        :param target: Table reference
+        """
+        stop = self._ids.get(table_key(target))
+        if stop is None:
+            return False
+        return stop in self._traverse(source, "lineage", stop)
+
+    def co_accessed(self, table: str) -> typing.Dict[str, int]:
+        """
+        Return tables used in the same statements as the table, sorted by count in descending order.
+
+        :param table: Table reference
+        """
+        node = self._ids.get(table_key(table))
+        if node is None:
+            return {}
+        counts = sorted(self._co_access[node].items(), key=lambda item: item[1], reverse=True)
+        return {self._names[other]: count for other, count in counts}
+
+    def tables(self) -> typing.List[str]:
+        """
+        Return names of all tables of the graph, in order of node ids.
+        """
+        return list(self._names)
+
+    def __contains__(self, table: str) -> bool:
+        return table_key(table) in self._ids
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def build_table_graph(
+    queries: typing.Iterable[QueryData], *, cache: typing.Optional[QueryCache] = None
+) -> TableGraph:
+    """
+    Build lineage and co-access graph of the queries.
+
+    :param queries: Iterable of queries to analyze, consumed in a single pass
+    :param cache: Cache of parsed queries, a new one is created when not specified
+    """
+    cache = QueryCache() if cache is None else cache
+    graph = TableGraph()
+    for query in queries:
+        graph.add_query(query, cache=cache)
+    return graph
@@ -1,3 +1,16 @@
+from .builder import SchemaBuilder, build_databases
+from .dialects import Dialect, DialectTableParser, available_dialects, get_dialect, get_parser, register_dialect
 from .snowflake import SnowflakeCSVTableParser, SnowflakeCSVData
 
-__all__ = ["SnowflakeCSVTableParser", "SnowflakeCSVData"]
+__all__ = [
+    "SnowflakeCSVTableParser",
+    "SnowflakeCSVData",
+    "SchemaBuilder",
+    "build_databases",
+    "Dialect",
+    "DialectTableParser",
+    "available_dialects",
+    "get_dialect",
+    "get_parser",
+    "register_dialect",
+]
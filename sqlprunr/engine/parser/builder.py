@@ -0,0 +1,109 @@
+import logging
+import sys
+import time
+import typing
+
+from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.engine.instrumentation import get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+SchemaRow = typing.Tuple[str, str, str, str, str]
+
+
+class SchemaBuilder:
+    """
+    SchemaBuilder assembles databases from (database, schema, table, column, data type) rows.
+
+    Every row takes constant time: databases are kept in a dict, schemas, tables and columns
+    are found through the name indexes of their parents, and consecutive rows of the same
+    table (the usual order of exports) skip the lookups altogether. Names are kept exactly as
+    stored, repeated columns of a table are skipped.
+    """
+
+    def __init__(self):
+        self.databases: typing.Dict[str, Database] = {}
+        self._last_key: typing.Optional[typing.Tuple[str, str, str]] = None
+        self._last_table: typing.Optional[Table] = None
+        # Checked once, building debug messages for millions of rows is not free
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+
+    def _table(self, database_name: str, schema_name: str, table_name: str) -> Table:
+        database = self.databases.get(database_name)
+        if database is None:
+            if self._debug:
+                logger.debug("Creating database: %s", database_name)
+            database = self.databases[database_name] = Database(database_name, [])
+
+        schema = database.get_schema(schema_name)
+        if schema is None:
+            if self._debug:
+                logger.debug("Creating schema: %s", schema_name)
+            schema = database.add_schema(Schema(schema_name, []))
+
+        table = schema.get_table(table_name)
+        if table is None:
+            if self._debug:
+                logger.debug("Creating table: %s", table_name)
+            table = schema.add_table(Table(table_name, []))
+        return table
+
+    def add(
+        self, database_name: str, schema_name: str, table_name: str, column_name: str, data_type: str
+    ) -> None:
+        """
+        Add a single column, its database, schema and table are created when missing.
+
+        :param database_name: Name of the database
+        :param schema_name: Name of the schema
+        :param table_name: Name of the table
+        :param column_name: Name of the column
+        :param data_type: Data type of the column
+        """
+        key = (database_name, schema_name, table_name)
+        if key == self._last_key:
+            table = self._last_table
+        else:
+            table = self._table(database_name, schema_name, table_name)
+            self._last_key = key
+            self._last_table = table
+
+        # Names and data types repeat across millions of rows, interning keeps a single copy
+        column_name = sys.intern(column_name)
+        if table.get_column(column_name) is None:
+            if self._debug:
+                logger.debug("Adding column: %s (%s)", column_name, data_type)
+            table.add_column(Column(column_name, sys.intern(data_type)))
+
+    def add_rows(self, rows: typing.Iterable[SchemaRow]) -> "SchemaBuilder":
+        """
+        Add all rows, consumed in a single pass.
+
+        :param rows: Iterable of (database, schema, table, column, data type) rows
+        :return: This builder
+        """
+        add = self.add
+        for row in rows:
+            add(*row)
+        return self
+
+    def build(self) -> typing.List[Database]:
+        """
+        Return list of databases in order of their first row.
+        """
+        return list(self.databases.values())
+
+
+def build_databases(rows: typing.Iterable[SchemaRow]) -> typing.List[Database]:
+    """
+    Build databases from (database, schema, table, column, data type) rows, see SchemaBuilder.
+
+    :param rows: Iterable of rows, consumed in a single pass
+    :return: List of databases
+    """
+    instrumentation = get_instrumentation()
+    start = time.perf_counter()
+    databases = SchemaBuilder().add_rows(rows).build()
+    if instrumentation is not None:
+        instrumentation.record("parse_schema", time.perf_counter() - start)
+    return databases
@@ -0,0 +1,251 @@
+import csv
+from dataclasses import dataclass
+from itertools import chain
+import os
+import re
+import typing
+
+from sqlprunr.data.generic import Database
+from sqlprunr.data.loaders import Source
+from sqlprunr.engine.parser.base import AbstractTableParser
+from sqlprunr.engine.parser.builder import SchemaRow, build_databases
+
+_FIELDS = ("database", "schema", "table", "column", "data_type")
+
+
+@dataclass(frozen=True)
+class Dialect:
+    """
+    Dialect describes schema exports and identifier rules of a warehouse.
+
+    :param name: Name of the dialect in the registry
+    :param database: Accepted headers of the database (catalog, project) column
+    :param schema: Accepted headers of the schema (dataset) column
+    :param table: Accepted headers of the table column
+    :param column: Accepted headers of the column name column
+    :param data_type: Accepted headers of the data type column
+    :param fold_case: Case folding of unquoted identifiers, ``upper``, ``lower`` or None when
+        identifiers are case-sensitive
+    :param fold_quoted: Whether quoted identifiers are folded as well
+    :param quote: Character quoting identifiers
+    :param quoted_paths: Whether a single quoted identifier may hold a whole dotted path,
+        e.g. BigQuery ```project.dataset.table```
+    """
+    name: str
+    database: typing.Tuple[str, ...] = ("table_catalog",)
+    schema: typing.Tuple[str, ...] = ("table_schema",)
+    table: typing.Tuple[str, ...] = ("table_name",)
+    column: typing.Tuple[str, ...] = ("column_name",)
+    data_type: typing.Tuple[str, ...] = ("data_type",)
+    fold_case: typing.Optional[str] = "lower"
+    fold_quoted: bool = False
+    quote: str = '"'
+    quoted_paths: bool = False
+
+    def _fold(self, name: str) -> str:
+        if self.fold_case == "upper":
+            return name.upper()
+        if self.fold_case == "lower":
+            return name.lower()
+        return name
+
+    def normalize_identifier(self, name: str) -> str:
+        """
+        Return the identifier as the warehouse stores it, unquoted identifiers are case-folded.
+
+        :param name: Identifier, optionally quoted
+        """
+        name = name.strip()
+        quote = self.quote
+        if len(name) > 1 and name[0] == name[-1] == quote:
+            name = name[1:-1].replace(quote * 2, quote)
+            return self._fold(name) if self.fold_quoted else name
+        return self._fold(name)
+
+    def split_reference(self, reference: str) -> typing.List[str]:
+        """
+        Split dotted object reference into normalized identifiers.
+
+        :param reference: Reference such as ``db.schema.table``
+        """
+        quote = re.escape(self.quote)
+        parts = re.findall(rf"{quote}(?:[^{quote}]|{quote}{quote})*{quote}|[^.]+", reference)
+        identifiers = []
+        for part in parts:
+            identifier = self.normalize_identifier(part)
+            if self.quoted_paths and part.strip().startswith(self.quote):
+                identifiers.extend(identifier.split("."))
+            else:
+                identifiers.append(identifier)
+        return identifiers
+
+    def header_positions(self, header: typing.Sequence[str]) -> typing.List[int]:
+        """
+        Return positions of database, schema, table, column and data type in the header,
+        headers are matched case-insensitively.
+
+        :param header: Header of the export
+        :raises ValueError: If any of the columns is missing
+        """
+        positions = {name.strip().lower(): i for i, name in enumerate(header)}
+        result = []
+        for field in _FIELDS:
+            accepted = getattr(self, field)
+            position = next(
+                (positions[name.lower()] for name in accepted if name.lower() in positions), None
+            )
+            if position is None:
+                raise ValueError(
+                    f"{self.name} schema export is missing the {field} column, expected one of {list(accepted)}"
+                )
+            result.append(position)
+        return result
+
+
+class DialectTableParser(AbstractTableParser):
+    """
+    DialectTableParser parses ``information_schema.columns`` exports of any registered dialect.
+
+    Rows are mapped to (database, schema, table, column, data type) and built with the shared
+    SchemaBuilder, in a single streaming pass. Quoted names in the export are unquoted,
+    names are otherwise kept as stored.
+
+    :param dialect: Dialect of the export
+    """
+
+    def __init__(self, dialect: Dialect):
+        self.dialect = dialect
+
+    def _unquote(self, name: str) -> str:
+        quote = self.dialect.quote
+        if len(name) > 1 and name[0] == name[-1] == quote:
+            return name[1:-1].replace(quote * 2, quote)
+        return name
+
+    def _rows(
+        self, header: typing.Sequence[str], rows: typing.Iterable[typing.Sequence[str]]
+    ) -> typing.Iterator[SchemaRow]:
+        database, schema, table, column, data_type = self.dialect.header_positions(header)
+        unquote = self._unquote
+        for row in rows:
+            yield (
+                unquote(row[database]),
+                unquote(row[schema]),
+                unquote(row[table]),
+                unquote(row[column]),
+                row[data_type],
+            )
+
+    def parse_table(
+        self, query: typing.Iterable[typing.Mapping[str, str]]
+    ) -> typing.List[Database]:
+        """
+        Parse schema rows and return a list of databases.
+
+        :param query: Iterable of rows as mappings (e.g. csv.DictReader or DataFrame records),
+            consumed in a single pass
+        :return: List of databases
+        """
+        iterator = iter(query)
+        first = next(iterator, None)
+        if first is None:
+            return []
+
+        header = list(first)
+        rows = ([row[name] for name in header] for row in chain((first,), iterator))
+        return build_databases(self._rows(header, rows))
+
+    def parse_csv(self, source: Source) -> typing.List[Database]:
+        """
+        Parse schema export in CSV, rows are streamed.
+
+        :param source: Path to the CSV file or an opened file object
+        :return: List of databases
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", newline="", encoding="utf-8-sig") as f:
+                return self.parse_csv(f)
+
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            return []
+        return build_databases(self._rows(header, reader))
+
+
+_DIALECTS: typing.Dict[str, Dialect] = {}
+
+
+def register_dialect(dialect: Dialect) -> Dialect:
+    """
+    Register the dialect, a dialect with the same name is replaced.
+
+    :param dialect: Dialect to register
+    :return: The registered dialect
+    """
+    _DIALECTS[dialect.name.lower()] = dialect
+    return dialect
+
+
+def get_dialect(name: str) -> Dialect:
+    """
+    Return registered dialect with the given name, case-insensitive.
+
+    :param name: Name of the dialect, e.g. ``snowflake``
+    :raises ValueError: If no dialect with the name is registered
+    """
+    dialect = _DIALECTS.get(name.lower())
+    if dialect is None:
+        raise ValueError(f"Unknown dialect: {name}, available dialects: {available_dialects()}")
+    return dialect
+
+
+def get_parser(name: str) -> DialectTableParser:
+    """
+    Return parser of schema exports of the registered dialect.
+
+    :param name: Name of the dialect
+    :raises ValueError: If no dialect with the name is registered
+    """
+    return DialectTableParser(get_dialect(name))
+
+
+def available_dialects() -> typing.List[str]:
+    """
+    Return names of registered dialects.
+    """
+    return sorted(_DIALECTS)
+
+
+SNOWFLAKE = register_dialect(
+    Dialect(
+        "snowflake",
+        database=("DATABASE_NAME", "TABLE_CATALOG"),
+        schema=("SCHEMA_NAME", "TABLE_SCHEMA"),
+        table=("TABLE_NAME",),
+        column=("COLUMN_NAME",),
+        data_type=("DATA_TYPE",),
+        fold_case="upper",
+    )
+)
+POSTGRES = register_dialect(Dialect("postgres", fold_case="lower"))
+# Redshift folds quoted identifiers as well unless enable_case_sensitive_identifier is on
+REDSHIFT = register_dialect(
+    Dialect(
+        "redshift",
+        database=("table_catalog", "database_name"),
+        schema=("table_schema", "schema_name"),
+        fold_case="lower",
+        fold_quoted=True,
+    )
+)
+BIGQUERY = register_dialect(
+    Dialect(
+        "bigquery",
+        database=("table_catalog", "project_id"),
+        schema=("table_schema", "dataset_id"),
+        fold_case=None,
+        quote="`",
+        quoted_paths=True,
+    )
+)
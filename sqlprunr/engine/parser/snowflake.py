@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 import typing
-import logging
 
-from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.data.generic import Database
 from sqlprunr.engine.parser.base import AbstractTableParser
+from sqlprunr.engine.parser.builder import build_databases
 
 
 @dataclass
@@ -25,39 +25,15 @@ class SnowflakeCSVTableParser(AbstractTableParser):
     """
 
     def parse_table(
-        self, query: typing.List[SnowflakeCSVData]
+        self, query: typing.Iterable[SnowflakeCSVData]
     ) -> typing.List[Database]:
-        databases = {}
-        for data in query:
-            database_name = data.DATABASE_NAME
-            schema_name = data.SCHEMA_NAME
-            table_name = data.TABLE_NAME
-            column_name = data.COLUMN_NAME
-            data_type = data.DATA_TYPE
-
-            logging.debug(
-                f"Database: {database_name}, Schema: {schema_name}, Table: {table_name}, Column: {column_name}, Data Type: {data_type}"
-            )
-
-            if database_name not in databases:
-                logging.debug(f"Creating database: {database_name}")
-                databases[database_name] = Database(database_name, [])
-            database = databases[database_name]
-
-            schema = next((s for s in database.schemas if s.name == schema_name), None)
-            if schema is None:
-                logging.debug(f"Creating schema: {schema_name}")
-                schema = Schema(schema_name, [])
-                database.schemas.append(schema)
-
-            table = next((t for t in schema.tables if t.name == table_name), None)
-            if table is None:
-                logging.debug(f"Creating table: {table_name}")
-                table = Table(table_name, [])
-                schema.tables.append(table)
-
-            if not any(c.name == column_name for c in table.columns):
-                logging.debug(f"Adding column: {column_name}")
-                table.columns.append(Column(column_name, data_type))
-
-        return list(databases.values())
+        """
+        Parse schema rows and return a list of databases.
+
+        :param query: Iterable of schema rows, consumed in a single pass
+        :return: List of databases
+        """
+        return build_databases(
+            (data.DATABASE_NAME, data.SCHEMA_NAME, data.TABLE_NAME, data.COLUMN_NAME, data.DATA_TYPE)
+            for data in query
+        )
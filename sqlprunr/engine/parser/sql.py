@@ -1,9 +1,8 @@
 import typing
 
-from sql_metadata import Parser
-
 from sqlprunr.data.generic import Column, Table
 from sqlprunr.engine.parser.base import AbstractTableParser
+from sqlprunr.engine.statements import split_statements
 
 
 class SQLTableParser(AbstractTableParser):
@@ -12,17 +11,22 @@ class SQLTableParser(AbstractTableParser):
     """
 
     def parse_table(self, query: str) -> typing.List[Table]:
-        queries = query.split(";")
+        """
+        Parse SQL script and return tables of its statements.
+
+        :param query: One or more SQL statements separated with ``;``
+        :return: List of tables with columns of the statement they were found in
+        """
+        from sql_metadata import Parser
 
         result = []
-        for query in queries:
-            parser = Parser(query)
-            tables = parser.tables
+        for statement in split_statements(query):
+            parser = Parser(statement)
+            # Column types are not known from the statement alone
+            columns = [Column(column, "") for column in parser.columns]
 
-            for table in tables:
-                columns = parser.columns
+            for table in parser.tables:
                 table_name = table.split(" ")[-1]
-                table_columns = [Column(column) for column in columns]
-                result.append(Table(table_name, table_columns))
+                result.append(Table(table_name, list(columns)))
 
         return result
@@ -0,0 +1,243 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+import time
+import typing
+
+from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.aggregator import FrequencyAggregator
+from sqlprunr.engine.chunks import aggregate_chunk, aggregate_queries, init_worker, merge_chunk
+from sqlprunr.engine.fingerprint import QueryCache
+from sqlprunr.engine.instrumentation import Instrumentation, get_instrumentation
+
+QuerySource = typing.Union[typing.AsyncIterable[QueryData], typing.Iterable[QueryData]]
+
+_DONE = object()
+
+
+@dataclass
+class PipelineMetrics:
+    """
+    Progress of an ingestion pipeline.
+
+    :param received: Number of queries read from the source
+    :param aggregated: Number of queries parsed and included in the frequencies
+    :param queued: Number of queries waiting to be parsed
+    :param queue_size: Maximum number of queries waiting to be parsed
+    :param in_flight: Number of batches being parsed
+    :param elapsed: Seconds since the pipeline started
+    :param throughput: Aggregated queries per second
+    """
+    received: int
+    aggregated: int
+    queued: int
+    queue_size: int
+    in_flight: int
+    elapsed: float
+    throughput: float
+
+
+class IngestionPipeline:
+    """
+    IngestionPipeline aggregates frequencies of a continuous feed of queries.
+
+    Queries flow through read, parse and aggregate stages connected with bounded queues, so a
+    fast source waits for parsing instead of buffering the feed in memory. Parsing runs in
+    batches in an executor, off the event loop, and the aggregate stage merges the parsed
+    batches in order. Frequencies of everything aggregated so far are available at any time.
+
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param queue_size: Maximum number of queries waiting to be parsed
+    :param batch_size: Maximum number of queries parsed at once
+    :param workers: Number of worker processes, queries are parsed in a background thread when 1
+    :param cache: Cache of parsed queries used by the background thread, a new one is created
+        when not specified
+    """
+
+    def __init__(
+        self,
+        *,
+        tables: bool = True,
+        columns: bool = True,
+        queue_size: int = 10_000,
+        batch_size: int = 500,
+        workers: int = 1,
+        cache: typing.Optional[QueryCache] = None,
+    ):
+        self.tables = tables
+        self.columns = columns
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.workers = workers
+        self.cache = QueryCache() if cache is None else cache
+
+        self._aggregator = FrequencyAggregator()
+        self._queries: typing.Optional[asyncio.Queue] = None
+        self._batches: typing.Optional[asyncio.Queue] = None
+        self._received = 0
+        self._aggregated = 0
+        self._in_flight = 0
+        self._started: typing.Optional[float] = None
+        self._finished: typing.Optional[float] = None
+
+    def snapshot(self) -> Frequencies:
+        """
+        Return frequencies of all queries aggregated so far, call it from the event loop thread.
+        """
+        return self._aggregator.to_frequencies()
+
+    def metrics(self) -> PipelineMetrics:
+        """
+        Return current progress of the pipeline.
+        """
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+
+        return PipelineMetrics(
+            received=self._received,
+            aggregated=self._aggregated,
+            queued=self._queries.qsize() if self._queries is not None else 0,
+            queue_size=self.queue_size,
+            in_flight=self._in_flight,
+            elapsed=elapsed,
+            throughput=self._aggregated / elapsed if elapsed else 0.0,
+        )
+
+    async def run(self, source: QuerySource) -> Frequencies:
+        """
+        Consume the source until it is exhausted and return the final frequencies.
+
+        Frequencies keep accumulating when the pipeline is run again with another source.
+
+        :param source: Async iterable (e.g. follow_query_data, read_query_stream) or iterable of queries
+        """
+        loop = asyncio.get_running_loop()
+        self._queries = asyncio.Queue(maxsize=self.queue_size)
+        # Submitted batches wait here for the aggregate stage, which bounds the batches in flight
+        self._batches = asyncio.Queue(maxsize=max(self.workers, 1) * 2)
+        self._started = time.perf_counter()
+        self._finished = None
+
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        else:
+            executor = ThreadPoolExecutor(max_workers=1)
+
+        tasks = [
+            asyncio.ensure_future(self._read(source)),
+            asyncio.ensure_future(self._parse(loop, executor)),
+            asyncio.ensure_future(self._aggregate()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False)
+            self._finished = time.perf_counter()
+
+        return self.snapshot()
+
+    async def _read(self, source: QuerySource) -> None:
+        if hasattr(source, "__aiter__"):
+            async for query in source:
+                await self._queries.put(query)
+                self._received += 1
+        else:
+            for query in source:
+                await self._queries.put(query)
+                self._received += 1
+
+        await self._queries.put(_DONE)
+
+    async def _parse(self, loop: asyncio.AbstractEventLoop, executor: Executor) -> None:
+        done = False
+        while not done:
+            # Take whatever is queued up to the batch size, a quiet feed is not held back
+            batch = []
+            query = await self._queries.get()
+            while True:
+                if query is _DONE:
+                    done = True
+                    break
+                batch.append(query)
+                if len(batch) >= self.batch_size or self._queries.empty():
+                    break
+                query = self._queries.get_nowait()
+
+            if batch:
+                self._in_flight += 1
+                await self._batches.put((len(batch), self._submit(loop, executor, batch)))
+
+        await self._batches.put(_DONE)
+
+    def _submit(
+        self, loop: asyncio.AbstractEventLoop, executor: Executor, batch: typing.List[QueryData]
+    ) -> asyncio.Future:
+        if isinstance(executor, ProcessPoolExecutor):
+            instrumentation = get_instrumentation()
+            function = functools.partial(
+                aggregate_chunk,
+                batch,
+                self.tables,
+                self.columns,
+                None if instrumentation is None else Instrumentation(instrumentation.slowest),
+            )
+        else:
+            # The background thread records into the enabled instrumentation directly
+            function = functools.partial(self._aggregate_batch, batch)
+        return loop.run_in_executor(executor, function)
+
+    def _aggregate_batch(
+        self, batch: typing.List[QueryData]
+    ) -> typing.Tuple[FrequencyAggregator, None]:
+        aggregator = aggregate_queries(
+            batch, tables=self.tables, columns=self.columns, cache=self.cache
+        )
+        return aggregator, None
+
+    async def _aggregate(self) -> None:
+        while True:
+            item = await self._batches.get()
+            if item is _DONE:
+                return
+
+            size, future = item
+            merge_chunk(self._aggregator, await future, get_instrumentation())
+            self._aggregated += size
+            self._in_flight -= 1
+
+
+async def stream_frequencies(
+    source: QuerySource,
+    *,
+    tables: bool = True,
+    columns: bool = True,
+    queue_size: int = 10_000,
+    batch_size: int = 500,
+    workers: int = 1,
+) -> Frequencies:
+    """
+    Get frequencies of tables and columns in a feed of queries, see IngestionPipeline.
+
+    :param source: Async iterable or iterable of queries
+    :param tables: Whether to analyze tables
+    :param columns: Whether to analyze columns
+    :param queue_size: Maximum number of queries waiting to be parsed
+    :param batch_size: Maximum number of queries parsed at once
+    :param workers: Number of worker processes, queries are parsed in a background thread when 1
+    """
+    pipeline = IngestionPipeline(
+        tables=tables,
+        columns=columns,
+        queue_size=queue_size,
+        batch_size=batch_size,
+        workers=workers,
+    )
+    return await pipeline.run(source)
@@ -0,0 +1,241 @@
+import re
+import typing
+
+from sqlprunr.data.generic import Database, Schema, Table
+
+if typing.TYPE_CHECKING:
+    from sqlprunr.engine.parser.dialects import Dialect
+
+TableKey = typing.Tuple[str, str, str]
+
+_IDENTIFIER_RE = re.compile(r'"(?:[^"]|"")*"|[^.]+')
+
+
+def normalize_identifier(name: str) -> str:
+    """
+    Normalize identifier for case-insensitive matching.
+
+    :param name: Identifier, optionally wrapped in double quotes
+    """
+    name = name.strip()
+    if len(name) > 1 and name[0] == name[-1] == '"':
+        name = name[1:-1].replace('""', '"')
+    return name.lower()
+
+
+def split_reference(reference: str) -> typing.List[str]:
+    """
+    Split dotted object reference into normalized identifiers.
+
+    :param reference: Reference such as ``db.schema.table``
+    """
+    return [normalize_identifier(part) for part in _IDENTIFIER_RE.findall(reference)]
+
+
+class TableResolver:
+    """
+    TableResolver maps table references found in queries to tables of the parsed schema.
+
+    The index is built once and resolves ``db.schema.table``, ``schema.table`` and bare
+    table names in constant time. References that match several tables resolve to all of them,
+    so a table is never reported as unused because of an ambiguous reference.
+
+    Names are matched case-insensitively by default. With a dialect, schema names are matched
+    exactly as stored and references follow the identifier rules of the dialect, e.g. unquoted
+    ``orders`` matches ``ORDERS`` in Snowflake but quoted ``"orders"`` does not. The query parser
+    returns quoted identifiers without their quotes, so references without quotes that match
+    nothing under the dialect rules are matched case-insensitively as well.
+
+    :param databases: Database or list of databases to index
+    :param default_database: Database used for references without a database
+    :param default_schema: Schema used for references without a schema
+    :param dialect: Dialect of the queries, see sqlprunr.engine.parser.dialects
+    """
+
+    def __init__(
+        self,
+        databases: typing.Union[Database, typing.Iterable[Database]],
+        *,
+        default_database: typing.Optional[str] = None,
+        default_schema: typing.Optional[str] = None,
+        dialect: typing.Optional["Dialect"] = None,
+    ):
+        if isinstance(databases, Database):
+            databases = [databases]
+
+        if dialect is None:
+            self._normalize = normalize_identifier
+            self._split = split_reference
+            self._stored = normalize_identifier
+            self._quote = None
+        else:
+            self._normalize = dialect.normalize_identifier
+            self._split = dialect.split_reference
+            self._stored = str
+            self._quote = dialect.quote
+
+        self.default_database = self._normalize(default_database) if default_database else None
+        self.default_schema = self._normalize(default_schema) if default_schema else None
+
+        self._tables: typing.Dict[TableKey, typing.Tuple[Database, Schema, Table]] = {}
+        self._by_schema_table: typing.Dict[typing.Tuple[str, str], typing.List[TableKey]] = {}
+        self._by_name: typing.Dict[str, typing.List[TableKey]] = {}
+        self._column_positions: typing.Dict[TableKey, typing.Dict[str, int]] = {}
+
+        # Case-insensitive indexes of the stored keys, for the fallback of unquoted references
+        # when a dialect is used
+        self._folded: typing.Optional[typing.Dict[TableKey, typing.List[TableKey]]] = None
+        self._folded_by_schema_table: typing.Dict[typing.Tuple[str, str], typing.List[TableKey]]
+        self._folded_by_schema_table = {}
+        self._folded_by_name: typing.Dict[str, typing.List[TableKey]] = {}
+        self._folded_column_positions: typing.Dict[TableKey, typing.Dict[str, int]] = {}
+        if dialect is not None:
+            self._folded = {}
+            self._folded_default_database = (
+                normalize_identifier(default_database) if default_database else None
+            )
+            self._folded_default_schema = (
+                normalize_identifier(default_schema) if default_schema else None
+            )
+
+        for database in databases:
+            for schema in database.schemas:
+                for table in schema.tables:
+                    self.add(database, schema, table)
+
+    def add(self, database: Database, schema: Schema, table: Table) -> TableKey:
+        """
+        Add table to the index and return its key.
+
+        :param database: Database of the table
+        :param schema: Schema of the table
+        :param table: Table to add
+        """
+        key = (self._stored(database.name), self._stored(schema.name), self._stored(table.name))
+        if key not in self._tables:
+            self._tables[key] = (database, schema, table)
+            self._by_schema_table.setdefault(key[1:], []).append(key)
+            self._by_name.setdefault(key[2], []).append(key)
+            if self._folded is not None:
+                folded = tuple(normalize_identifier(name) for name in key)
+                self._folded.setdefault(folded, []).append(key)
+                self._folded_by_schema_table.setdefault(folded[1:], []).append(key)
+                self._folded_by_name.setdefault(folded[2], []).append(key)
+        return key
+
+    def resolve(self, reference: str) -> typing.List[TableKey]:
+        """
+        Resolve table reference to keys of all matching tables.
+
+        :param reference: Table reference as found in a query
+        :return: List of matching table keys, empty when the table is not in the schema
+        """
+        keys = self._resolve_parts(self._split(reference), folded=False)
+        if not keys and self._folded is not None and self._quote not in reference:
+            keys = self._resolve_parts(split_reference(reference), folded=True)
+        return keys
+
+    def _lookup(self, key: TableKey, folded: bool) -> typing.List[TableKey]:
+        if folded:
+            return list(self._folded.get(key, ()))
+        return [key] if key in self._tables else []
+
+    def _resolve_parts(self, parts: typing.List[str], folded: bool) -> typing.List[TableKey]:
+        if folded:
+            default_database = self._folded_default_database
+            default_schema = self._folded_default_schema
+            by_schema_table = self._folded_by_schema_table
+            by_name = self._folded_by_name
+        else:
+            default_database = self.default_database
+            default_schema = self.default_schema
+            by_schema_table = self._by_schema_table
+            by_name = self._by_name
+
+        if len(parts) >= 3:
+            return self._lookup(tuple(parts[-3:]), folded)
+
+        if len(parts) == 2:
+            if default_database is not None:
+                keys = self._lookup((default_database, *parts), folded)
+                if keys:
+                    return keys
+            return list(by_schema_table.get(tuple(parts), ()))
+
+        if len(parts) == 1:
+            if default_database is not None and default_schema is not None:
+                keys = self._lookup((default_database, default_schema, parts[0]), folded)
+                if keys:
+                    return keys
+            return list(by_name.get(parts[0], ()))
+
+        return []
+
+    def resolve_all(self, references: typing.Iterable[str]) -> typing.Set[TableKey]:
+        """
+        Resolve table references to a set of keys of all matching tables.
+
+        :param references: Table references as found in queries
+        """
+        keys = set()
+        for reference in references:
+            keys.update(self.resolve(reference))
+        return keys
+
+    def unused(self, references: typing.Iterable[str]) -> typing.List[TableKey]:
+        """
+        Return keys of tables that none of the references resolve to, in schema order.
+
+        :param references: Table references as found in queries
+        """
+        used = self.resolve_all(references)
+        return [key for key in self._tables if key not in used]
+
+    def get(self, key: TableKey) -> typing.Tuple[Database, Schema, Table]:
+        """
+        Return database, schema and table for the key.
+
+        :param key: Table key returned by resolve
+        """
+        return self._tables[key]
+
+    def column_position(self, key: TableKey, column: str) -> typing.Optional[int]:
+        """
+        Return position of the column in the table or None, matched like table references.
+
+        Column indexes are built lazily, only for tables that columns are resolved against.
+
+        :param key: Table key returned by resolve
+        :param column: Column name as found in a query
+        """
+        position = self._positions(key, self._stored, self._column_positions).get(
+            self._normalize(column)
+        )
+        if position is None and self._folded is not None and self._quote not in column:
+            position = self._positions(
+                key, normalize_identifier, self._folded_column_positions
+            ).get(normalize_identifier(column))
+        return position
+
+    def _positions(
+        self,
+        key: TableKey,
+        normalize: typing.Callable[[str], str],
+        index: typing.Dict[TableKey, typing.Dict[str, int]],
+    ) -> typing.Dict[str, int]:
+        positions = index.get(key)
+        if positions is None:
+            positions = {}
+            for position, table_column in enumerate(self._tables[key][2].columns):
+                positions.setdefault(normalize(table_column.name), position)
+            index[key] = positions
+        return positions
+
+    def keys(self) -> typing.KeysView:
+        return self._tables.keys()
+
+    def __contains__(self, key: TableKey) -> bool:
+        return key in self._tables
+
+    def __len__(self) -> int:
+        return len(self._tables)
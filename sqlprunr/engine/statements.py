@@ -0,0 +1,53 @@
+import re
+import typing
+
+_SCRIPT_TOKEN_RE = re.compile(
+    r"""
+    [^-/;'"$]+
+    |(?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>'[^']*(?:''[^']*)*(?:'|\Z)|\$\$.*?(?:\$\$|\Z))
+    |(?P<identifier>"[^"]*(?:""[^"]*)*(?:"|\Z))
+    |(?P<end>;)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def split_statements(script: str) -> typing.Iterator[str]:
+    """
+    Split SQL script into statements, lazily.
+
+    Semicolons inside string literals, ``$$`` blocks, quoted identifiers and comments do not
+    end a statement. Comments are removed, statements are stripped and empty statements skipped.
+
+    :param script: One or more SQL statements separated with ``;``
+    :return: Iterator of statements without the trailing ``;``
+    """
+    if ";" not in script and "--" not in script and "/*" not in script:
+        statement = script.strip()
+        if statement:
+            yield statement
+        return
+
+    parts = []
+    position = 0
+    for match in _SCRIPT_TOKEN_RE.finditer(script):
+        kind = match.lastgroup
+        if kind == "comment":
+            parts.append(script[position:match.start()])
+            parts.append(" ")
+        elif kind == "end":
+            parts.append(script[position:match.start()])
+            statement = "".join(parts).strip()
+            if statement:
+                yield statement
+            parts = []
+        else:
+            # Plain code, strings and identifiers are kept as they are
+            continue
+        position = match.end()
+
+    parts.append(script[position:])
+    statement = "".join(parts).strip()
+    if statement:
+        yield statement
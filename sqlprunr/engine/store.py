@@ -0,0 +1,314 @@
+import json
+import os
+import sqlite3
+import typing
+
+from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.aggregator import FrequencyAggregator
+from sqlprunr.engine.analyzer import aggregate_query
+from sqlprunr.engine.fingerprint import QueryCache
+
+if typing.TYPE_CHECKING:
+    from sqlprunr.engine.diff import SchemaDiff
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, name, bucket)
+);
+CREATE TABLE IF NOT EXISTS table_column_usage (
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (table_name, column_name, bucket)
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS usage_bucket ON usage (bucket);
+CREATE INDEX IF NOT EXISTS table_column_usage_bucket ON table_column_usage (bucket);
+"""
+
+_UPSERT_USAGE = """
+INSERT INTO usage (kind, name, bucket, count) VALUES (?, ?, ?, ?)
+ON CONFLICT (kind, name, bucket) DO UPDATE SET count = count + excluded.count
+"""
+_UPSERT_TABLE_COLUMN_USAGE = """
+INSERT INTO table_column_usage (table_name, column_name, bucket, count) VALUES (?, ?, ?, ?)
+ON CONFLICT (table_name, column_name, bucket) DO UPDATE SET count = count + excluded.count
+"""
+
+_KINDS = ("tables", "columns", "queries")
+
+
+def get_bucket(query: QueryData) -> str:
+    """
+    Return day bucket (``YYYY-MM-DD``) of the query start time in UTC, like UsageTimeline.
+
+    :param query: Query to get the bucket for
+    :raises ValueError: If the start time cannot be parsed
+    """
+    # timestamps pulls in numpy, it is imported when the first query is bucketed
+    from sqlprunr.engine.timestamps import parse_timestamp
+
+    return str(parse_timestamp(query.START_TIME).astype("datetime64[D]"))
+
+
+class FrequencyStore:
+    """
+    FrequencyStore keeps frequencies on disk in SQLite, split into time buckets (days by default).
+
+    New query batches are folded in incrementally and old buckets can be subtracted or expired,
+    so keeping a rolling window up to date costs time proportional to the new data only.
+    The store exposes ``tables``, ``columns``, ``queries`` and ``table_columns`` like Frequencies,
+    so it can be passed to find_unused_tables and find_unused_columns directly.
+
+    :param path: Path to the SQLite database, in memory by default
+    """
+
+    def __init__(self, path: typing.Union[str, os.PathLike] = ":memory:"):
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def add(
+        self,
+        queries: typing.Iterable[QueryData],
+        *,
+        bucket: typing.Optional[str] = None,
+        cache: typing.Optional[QueryCache] = None,
+    ) -> None:
+        """
+        Analyze queries and fold their frequencies into the store.
+
+        :param queries: Iterable of queries to analyze, consumed in a single pass
+        :param bucket: Bucket of all queries, by default every query goes to the day it started
+        :param cache: Cache of parsed queries, a new one is created when not specified
+        """
+        if cache is None:
+            cache = QueryCache()
+
+        aggregators = {}
+        for query in queries:
+            query_bucket = get_bucket(query) if bucket is None else bucket
+            aggregator = aggregators.get(query_bucket)
+            if aggregator is None:
+                aggregator = aggregators[query_bucket] = FrequencyAggregator()
+            aggregate_query(aggregator, query, cache=cache)
+
+        with self._connection:
+            for query_bucket, aggregator in aggregators.items():
+                self._write(aggregator, query_bucket, 1)
+
+    def merge(
+        self,
+        frequencies: typing.Union[Frequencies, FrequencyAggregator],
+        bucket: str,
+        *,
+        metadata: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> None:
+        """
+        Add already computed frequencies to the bucket.
+
+        :param frequencies: Frequencies or aggregator to add
+        :param bucket: Bucket to add the frequencies to
+        :param metadata: JSON-serializable values stored in the same transaction as the
+            frequencies, e.g. progress of a batch, see metadata
+        """
+        with self._connection:
+            self._write(frequencies, bucket, 1)
+            if metadata:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                    ((key, json.dumps(value)) for key, value in metadata.items()),
+                )
+
+    def subtract(
+        self, frequencies: typing.Union[Frequencies, FrequencyAggregator], bucket: str
+    ) -> None:
+        """
+        Subtract frequencies from the bucket, entries that drop to zero are removed.
+
+        :param frequencies: Frequencies or aggregator to subtract
+        :param bucket: Bucket to subtract the frequencies from
+        """
+        with self._connection:
+            self._write(frequencies, bucket, -1)
+            self._connection.execute("DELETE FROM usage WHERE count <= 0")
+            self._connection.execute("DELETE FROM table_column_usage WHERE count <= 0")
+
+    def expire(self, before: str) -> None:
+        """
+        Remove all buckets older than the given one.
+
+        :param before: First bucket to keep, e.g. ``2024-06-01``
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM usage WHERE bucket < ?", (before,))
+            self._connection.execute(
+                "DELETE FROM table_column_usage WHERE bucket < ?", (before,)
+            )
+
+    def apply_diff(self, diff: "SchemaDiff") -> None:
+        """
+        Remove usage of tables and columns dropped from the schema, in all buckets.
+
+        Usage is matched by fully qualified table references (``db.schema.table``),
+        case-insensitively. Shorter references cannot be attributed to a single table and are kept.
+
+        :param diff: Schema changes, see diff_databases
+        """
+        tables = [(".".join(name).lower(),) for name in diff.dropped_tables]
+        columns = [
+            (".".join(name).lower(), column.lower())
+            for name, dropped in diff.dropped_columns.items()
+            for column in dropped
+        ]
+        with self._connection:
+            # Dropped names are joined in a single pass over the usage instead of a scan per name
+            self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS dropped_tables (name TEXT)")
+            self._connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS dropped_columns (table_name TEXT, column_name TEXT)"
+            )
+            self._connection.executemany("INSERT INTO dropped_tables VALUES (?)", tables)
+            self._connection.executemany("INSERT INTO dropped_columns VALUES (?, ?)", columns)
+            self._connection.execute(
+                "DELETE FROM usage WHERE kind = 'tables' "
+                "AND lower(name) IN (SELECT name FROM dropped_tables)"
+            )
+            self._connection.execute(
+                "DELETE FROM table_column_usage "
+                "WHERE lower(table_name) IN (SELECT name FROM dropped_tables) "
+                "OR (lower(table_name), lower(column_name)) IN "
+                "(SELECT table_name, column_name FROM dropped_columns)"
+            )
+            self._connection.execute("DELETE FROM dropped_tables")
+            self._connection.execute("DELETE FROM dropped_columns")
+
+    def metadata(self) -> typing.Dict[str, typing.Any]:
+        """
+        Return values stored with merge.
+        """
+        rows = self._connection.execute("SELECT key, value FROM metadata ORDER BY key")
+        return {key: json.loads(value) for key, value in rows}
+
+    def buckets(self) -> typing.List[str]:
+        """
+        Return sorted list of buckets in the store.
+        """
+        rows = self._connection.execute("SELECT DISTINCT bucket FROM usage ORDER BY bucket")
+        return [bucket for bucket, in rows]
+
+    def frequencies(
+        self, *, since: typing.Optional[str] = None, until: typing.Optional[str] = None
+    ) -> Frequencies:
+        """
+        Return frequencies summed over buckets in the window, sorted by count in descending order.
+
+        :param since: First bucket of the window, inclusive
+        :param until: Last bucket of the window, exclusive
+        """
+        return Frequencies(
+            tables=self._counts("tables", since, until),
+            columns=self._counts("columns", since, until),
+            queries=self._counts("queries", since, until),
+            table_columns=self._table_columns(since, until),
+        )
+
+    @property
+    def tables(self) -> dict:
+        return self._counts("tables")
+
+    @property
+    def columns(self) -> dict:
+        return self._counts("columns")
+
+    @property
+    def queries(self) -> dict:
+        return self._counts("queries")
+
+    @property
+    def table_columns(self) -> dict:
+        return self._table_columns()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "FrequencyStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _write(
+        self,
+        frequencies: typing.Union[Frequencies, FrequencyAggregator],
+        bucket: str,
+        sign: int,
+    ) -> None:
+        for kind in _KINDS:
+            self._connection.executemany(
+                _UPSERT_USAGE,
+                (
+                    (kind, name, bucket, sign * count)
+                    for name, count in getattr(frequencies, kind).items()
+                ),
+            )
+
+        if isinstance(frequencies, FrequencyAggregator):
+            table_columns = frequencies.table_columns.items()
+        else:
+            table_columns = (
+                ((table, column), count)
+                for table, columns in frequencies.table_columns.items()
+                for column, count in columns.items()
+            )
+        self._connection.executemany(
+            _UPSERT_TABLE_COLUMN_USAGE,
+            ((table, column, bucket, sign * count) for (table, column), count in table_columns),
+        )
+
+    def _window(
+        self, since: typing.Optional[str], until: typing.Optional[str]
+    ) -> typing.Tuple[str, tuple]:
+        conditions = []
+        parameters = []
+        if since is not None:
+            conditions.append("bucket >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("bucket < ?")
+            parameters.append(until)
+        return "".join(f" AND {condition}" for condition in conditions), tuple(parameters)
+
+    def _counts(
+        self,
+        kind: str,
+        since: typing.Optional[str] = None,
+        until: typing.Optional[str] = None,
+    ) -> dict:
+        window, parameters = self._window(since, until)
+        rows = self._connection.execute(
+            f"SELECT name, SUM(count) AS total FROM usage WHERE kind = ?{window} "
+            "GROUP BY name ORDER BY total DESC, name",
+            (kind, *parameters),
+        )
+        return dict(rows)
+
+    def _table_columns(
+        self, since: typing.Optional[str] = None, until: typing.Optional[str] = None
+    ) -> dict:
+        window, parameters = self._window(since, until)
+        rows = self._connection.execute(
+            "SELECT table_name, column_name, SUM(count) AS total FROM table_column_usage "
+            f"WHERE 1 = 1{window} GROUP BY table_name, column_name ORDER BY total DESC, column_name",
+            parameters,
+        )
+        table_columns = {}
+        for table, column, count in rows:
+            table_columns.setdefault(table, {})[column] = count
+        return table_columns
@@ -0,0 +1,154 @@
+import typing
+
+import numpy as np
+
+from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.aggregator import FrequencyAggregator
+from sqlprunr.engine.analyzer import aggregate_query
+from sqlprunr.engine.fingerprint import QueryCache
+from sqlprunr.engine.timestamps import parse_timestamp
+
+_KINDS = ("tables", "columns")
+
+
+class UsageTimeline:
+    """
+    UsageTimeline keeps table and column usage bucketed in time.
+
+    Counts are stored as dense ``entity x bucket`` arrays, so windows, rolling sums and
+    last-used dates are answered with array operations, without rescanning queries.
+
+    :param buckets: Start of every bucket as datetime64, consecutive and in ascending order
+    :param names: Entity names per kind (``tables``, ``columns``), row order of the counts
+    :param counts: Count arrays per kind, shaped (entities, buckets)
+    """
+
+    def __init__(
+        self,
+        buckets: np.ndarray,
+        names: typing.Dict[str, typing.List[str]],
+        counts: typing.Dict[str, np.ndarray],
+    ):
+        self.buckets = buckets
+        self.names = names
+        self.counts = counts
+        self._rows = {kind: {name: i for i, name in enumerate(names[kind])} for kind in names}
+
+    def _slice(
+        self, since: typing.Optional[typing.Any], until: typing.Optional[typing.Any]
+    ) -> slice:
+        unit = np.datetime_data(self.buckets.dtype)[0]
+        start = 0 if since is None else np.searchsorted(
+            self.buckets, np.datetime64(since, unit), side="left"
+        )
+        stop = len(self.buckets) if until is None else np.searchsorted(
+            self.buckets, np.datetime64(until, unit), side="left"
+        )
+        return slice(int(start), int(stop))
+
+    def _totals(self, kind: str, columns: slice) -> dict:
+        totals = self.counts[kind][:, columns].sum(axis=1)
+        order = np.argsort(-totals, kind="stable")
+        names = self.names[kind]
+        return {names[i]: int(totals[i]) for i in order.tolist() if totals[i] > 0}
+
+    def window(
+        self,
+        since: typing.Optional[typing.Any] = None,
+        until: typing.Optional[typing.Any] = None,
+    ) -> Frequencies:
+        """
+        Return frequencies of tables and columns in the window, sorted by count in descending order.
+
+        :param since: Start of the window, inclusive, as datetime64 or ISO string
+        :param until: End of the window, exclusive, as datetime64 or ISO string
+        """
+        columns = self._slice(since, until)
+        return Frequencies(
+            tables=self._totals("tables", columns),
+            columns=self._totals("columns", columns),
+            queries={},
+        )
+
+    def rolling(self, periods: int) -> Frequencies:
+        """
+        Return frequencies of tables and columns in the last ``periods`` buckets.
+
+        :param periods: Number of buckets, e.g. days for a daily timeline
+        """
+        return self.window(since=self.buckets[max(len(self.buckets) - periods, 0)])
+
+    def series(self, name: str, kind: str = "tables") -> np.ndarray:
+        """
+        Return usage counts of a table or column in every bucket.
+
+        :param name: Name of the table or column
+        :param kind: ``tables`` or ``columns``
+        """
+        row = self._rows[kind].get(name)
+        if row is None:
+            return np.zeros(len(self.buckets), dtype=self.counts[kind].dtype)
+        return self.counts[kind][row]
+
+    def last_used(self, kind: str = "tables") -> typing.Dict[str, np.datetime64]:
+        """
+        Return start of the last bucket every table or column was used in.
+
+        :param kind: ``tables`` or ``columns``
+        """
+        used = self.counts[kind] > 0
+        if not used.size:
+            return {}
+
+        last = used.shape[1] - 1 - np.argmax(used[:, ::-1], axis=1)
+        return dict(zip(self.names[kind], self.buckets[last]))
+
+
+def get_usage_timeline(
+    queries: typing.Iterable[QueryData],
+    *,
+    freq: str = "D",
+    cache: typing.Optional[QueryCache] = None,
+) -> UsageTimeline:
+    """
+    Get usage of tables and columns in the queries bucketed by query start time.
+
+    :param queries: Iterable of queries to analyze, consumed in a single pass
+    :param freq: Bucket size as numpy datetime unit, ``h`` for hourly or ``D`` for daily buckets
+    :param cache: Cache of parsed queries, a new one is created when not specified
+    """
+    if cache is None:
+        cache = QueryCache()
+
+    aggregators: typing.Dict[int, FrequencyAggregator] = {}
+    for query in queries:
+        bucket = int(parse_timestamp(query.START_TIME).astype(f"datetime64[{freq}]").astype(np.int64))
+        aggregator = aggregators.get(bucket)
+        if aggregator is None:
+            aggregator = aggregators[bucket] = FrequencyAggregator()
+        aggregate_query(aggregator, query, cache=cache)
+
+    if aggregators:
+        first, last = min(aggregators), max(aggregators)
+    else:
+        first, last = 0, -1
+    buckets = np.arange(first, last + 1, dtype=np.int64).astype(f"datetime64[{freq}]")
+
+    names = {}
+    counts = {}
+    for kind in _KINDS:
+        rows = {}
+        for aggregator in aggregators.values():
+            for name in getattr(aggregator, kind):
+                rows.setdefault(name, len(rows))
+
+        matrix = np.zeros((len(rows), len(buckets)), dtype=np.int32)
+        for bucket, aggregator in aggregators.items():
+            counter = getattr(aggregator, kind)
+            if counter:
+                matrix[[rows[name] for name in counter], bucket - first] = list(counter.values())
+
+        names[kind] = list(rows)
+        counts[kind] = matrix
+
+    return UsageTimeline(buckets, names, counts)
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+import re
+import typing
+
+import numpy as np
+
+_TIMESTAMP_RE = re.compile(
+    r"^\s*(\d{4}-\d{2}-\d{2})(?:[T ](\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?))?"
+    r"\s*(?:(Z)|([+-])(\d{2}):?(\d{2}))?\s*$"
+)
+
+
+@lru_cache(maxsize=65_536)
+def parse_timestamp(value: str) -> np.datetime64:
+    """
+    Parse timestamp string to UTC datetime64 with millisecond precision, results are cached.
+
+    Supports ISO 8601 and Snowflake export format (``2024-06-22 17:17:34.245 +0200``),
+    timestamps without offset are treated as UTC.
+
+    :param value: Timestamp to parse
+    :raises ValueError: If the timestamp cannot be parsed
+    """
+    match = _TIMESTAMP_RE.match(value)
+    if match is None:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(parsed, "ms")
+
+    date, time, _, sign, hours, minutes = match.groups()
+    timestamp = np.datetime64(f"{date}T{time}" if time else date, "ms")
+    if sign is not None:
+        offset = np.timedelta64(int(hours) * 60 + int(minutes), "m")
+        timestamp = timestamp - offset if sign == "+" else timestamp + offset
+    return timestamp
+
+
+def parse_timestamps(values: typing.Iterable[str]) -> np.ndarray:
+    """
+    Parse timestamp strings to an array of UTC datetime64 with millisecond precision.
+
+    Every distinct string is matched once, the matched timestamps are converted by numpy
+    in a single call and offsets are applied as an array operation.
+
+    :param values: Timestamps to parse
+    :raises ValueError: If any timestamp cannot be parsed
+    """
+    index = {}
+    inverse = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values), dtype=np.int64
+    )
+
+    bases = []
+    offsets = np.zeros(len(index), dtype=np.int64)
+    for i, value in enumerate(index):
+        match = _TIMESTAMP_RE.match(value)
+        if match is None:
+            bases.append(str(parse_timestamp(value)))
+            continue
+
+        date, time, _, sign, hours, minutes = match.groups()
+        bases.append(f"{date}T{time}" if time else date)
+        if sign is not None:
+            offset = int(hours) * 60 + int(minutes)
+            offsets[i] = offset if sign == "+" else -offset
+
+    parsed = np.array(bases, dtype="datetime64[ms]") - offsets.astype("timedelta64[m]")
+    return parsed[inverse]
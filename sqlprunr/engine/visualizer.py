@@ -1,95 +1,539 @@
+import os
+import re
 import typing
-import seaborn as sns
-import matplotlib.pyplot as plt
 
-from sqlprunr.data.generic import Database
+import numpy as np
+
+from sqlprunr.data.generic import Database, Schema, Table
 from sqlprunr.data.query_data import Frequencies
+from sqlprunr.engine.resolver import TableKey, TableResolver, normalize_identifier, split_reference
+
+
+UNQUALIFIED = "(unqualified)"
+
+
+def top_frequencies(
+    counts: typing.Mapping[str, int], top: int, *, other: bool = True
+) -> typing.Dict[str, int]:
+    """
+    Return the most frequent entries sorted by count in descending order, ties keep their order.
+
+    Entries are selected with a partial sort, the rest is summed in a single long-tail entry.
+
+    :param counts: Name to count, e.g. frequencies.tables
+    :param top: Maximum number of entries to keep
+    :param other: Whether to add the long-tail entry ``other (N entries)``
+    """
+    names = list(counts)
+    values = np.fromiter(counts.values(), dtype=np.int64, count=len(names))
+    if len(names) > top:
+        selected = np.argpartition(-values, top - 1)[:top] if top > 0 else np.zeros(0, np.int64)
+    else:
+        selected = np.arange(len(names))
+    selected = selected[np.lexsort((selected, -values[selected]))]
+
+    result = {names[i]: int(values[i]) for i in selected.tolist()}
+    if other and len(names) > len(selected):
+        result[f"other ({len(names) - len(selected)} entries)"] = int(
+            values.sum() - values[selected].sum()
+        )
+    return result
+
+
+def rollup_frequencies(
+    counts: typing.Mapping[str, int], *, level: str = "schema"
+) -> typing.Dict[str, int]:
+    """
+    Sum counts of table references per schema or database, sorted by count in descending order.
+
+    References are split and normalized like in TableResolver, names are compared
+    case-insensitively and quoted names may contain dots. References that are not qualified
+    down to the level (e.g. bare table names) are summed as ``(unqualified)``, ``schema.table``
+    references are rolled up to the schema name alone.
+
+    :param counts: Table reference to count, e.g. frequencies.tables
+    :param level: ``schema`` or ``database``
+    """
+    if level not in ("schema", "database"):
+        raise ValueError(f"Unsupported level: {level}, use 'schema' or 'database'.")
+
+    rolled = {}
+    for name, count in counts.items():
+        segments = split_reference(name)
+        if len(segments) == 3:
+            key = segments[0] if level == "database" else f"{segments[0]}.{segments[1]}"
+        elif len(segments) == 2 and level == "schema":
+            key = segments[0]
+        else:
+            key = UNQUALIFIED
+        rolled[key] = rolled.get(key, 0) + count
+
+    return dict(sorted(rolled.items(), key=lambda item: item[1], reverse=True))
+
+
+def frequency_distribution(counts: typing.Mapping[str, int]) -> typing.Dict[str, int]:
+    """
+    Return number of entries per count range, ranges grow in powers of two (1, 2-3, 4-7, ...).
+
+    :param counts: Name to count
+    """
+    values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    values = values[values > 0]
+    if not len(values):
+        return {}
+
+    buckets = np.bincount(np.floor(np.log2(values)).astype(np.int64))
+    distribution = {}
+    for bucket, size in enumerate(buckets.tolist()):
+        low, high = 2**bucket, 2 ** (bucket + 1) - 1
+        distribution[str(low) if low == high else f"{low}-{high}"] = size
+    return distribution
 
 
 def visualize_frequencies(
     frequencies: Frequencies,
     *,
     savefig: bool = False,
-    figsize: tuple = (20, 120),
+    figsize: typing.Optional[tuple] = None,
     show_tables: bool = True,
     show_columns: bool = True,
     show_queries: bool = False,
+    top: typing.Optional[int] = None,
 ):
-    fig, axes = plt.subplots(sum([show_tables, show_columns, show_queries]), 1, figsize=figsize)
-
-    if show_tables:
-        ax1 = axes[0]
-        sns.barplot(x=list(frequencies.tables.values()), y=list(frequencies.tables.keys()), ax=ax1)
-        ax1.set_title("Table Frequencies")
-        ax1.set_xlabel("Frequency")
-        ax1.set_ylabel(f"Tables ({len(list(frequencies.tables.keys()))} unique tables)")
-        ax1.tick_params(axis="y", labelsize=12)
-
-    if show_columns:
-        ax2 = axes[1] if show_tables else axes[0]
-
-        sns.barplot(x=list(frequencies.columns.values()), y=list(frequencies.columns.keys()), ax=ax2)
-        ax2.set_title("Column Frequencies")
-        ax2.set_xlabel("Frequency")
-        ax2.set_ylabel(f"Columns ({len(list(frequencies.columns.keys()))} unique columns)")
-        ax2.tick_params(axis="y", labelsize=8)
-
-    if show_queries:
-        ax3 = axes[2] if show_tables and show_columns else axes[0]
-
-        sns.barplot(
-            x=list(frequencies.queries.values()), y=list(frequencies.queries.keys()), ax=ax3
+    """
+    Draw bar plots of table, column and query frequencies.
+
+    Large frequency sets should be drawn with ``top``, every bar is a separate artist.
+
+    :param frequencies: Frequencies to draw
+    :param savefig: Whether to save the figure to frequencies.png
+    :param figsize: Size of the figure, sized by the number of bars when not specified
+    :param show_tables: Whether to draw table frequencies
+    :param show_columns: Whether to draw column frequencies
+    :param show_queries: Whether to draw query frequencies
+    :param top: Number of most frequent entries to draw, the rest is drawn as a single bar
+    """
+    plots = [
+        (counts, title, label, labelsize)
+        for show, counts, title, label, labelsize in (
+            (show_tables, frequencies.tables, "Table Frequencies", "tables", 12),
+            (show_columns, frequencies.columns, "Column Frequencies", "columns", 8),
+            (show_queries, frequencies.queries, "Query Frequencies", "queries", 8),
         )
-        ax3.set_title("Query Frequencies")
-        ax3.set_xlabel("Frequency")
-        ax3.set_ylabel(f"Queries ({len(frequencies.queries)} unique queries)")
-        ax3.tick_params(axis="y", labelsize=8)
+        if show
+    ]
+    if not plots:
+        raise ValueError("Nothing to draw, enable show_tables, show_columns or show_queries.")
+
+    bars = [
+        counts if top is None else top_frequencies(counts, top) for counts, _, _, _ in plots
+    ]
+    if figsize is None:
+        figsize = (20, sum(max(2.0, 0.25 * len(counts)) for counts in bars))
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # squeeze=False keeps axes indexable when a single plot is drawn
+    fig, axes = plt.subplots(len(plots), 1, figsize=figsize, squeeze=False)
+
+    for ax, counts, (original, title, label, labelsize) in zip(axes[:, 0], bars, plots):
+        sns.barplot(x=list(counts.values()), y=list(counts.keys()), ax=ax)
+        ax.set_title(title)
+        ax.set_xlabel("Frequency")
+        ax.set_ylabel(f"{label.capitalize()} ({len(original)} unique {label})")
+        ax.tick_params(axis="y", labelsize=labelsize)
 
     plt.tight_layout()
     if savefig:
         plt.savefig("frequencies.png")
+    return fig
 
 
-def visualize_structure(databases: typing.List[Database]):
-    from graphviz import Digraph
+def _shorten(text: str, width: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[: width - 1] + "\u2026"
 
-    dot = Digraph(comment="Database Schema")
 
-    for db in databases:
-        db_id = f"db_{db.name}"
-        dot.node(db_id, db.name, shape="box", style="filled", color="lightblue")
-
-        for schema in db.schemas:
-            schema_id = f"schema_{db.name}_{schema.name}"
-            dot.node(
-                schema_id,
-                schema.name,
-                shape="box",
-                style="filled",
-                color="lightyellow",
+def frequencies_report(
+    frequencies: Frequencies,
+    path: typing.Optional[typing.Union[str, os.PathLike]] = None,
+    *,
+    top: int = 50,
+    level: str = "schema",
+    include_plotlyjs: typing.Union[bool, str] = "cdn",
+) -> str:
+    """
+    Render an interactive plotly HTML report of the frequencies.
+
+    Everything is aggregated before plotting, the report contains top entries with a long-tail
+    bar, per-schema (or per-database) rollup of tables and distribution of counts, so its size
+    does not depend on the number of distinct tables, columns and queries.
+
+    :param frequencies: Frequencies to report
+    :param path: File to write the report to
+    :param top: Number of most frequent entries of every kind
+    :param level: Level of the table rollup, ``schema`` or ``database``
+    :param include_plotlyjs: How plotly.js is included, see plotly.io.to_html, ``"cdn"`` keeps
+        the report small, ``True`` embeds it for offline use
+    :return: HTML of the report
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    panels = [
+        (f"Top {top} of {len(frequencies.tables)} tables", top_frequencies(frequencies.tables, top)),
+        (
+            f"Tables by {level}",
+            top_frequencies(rollup_frequencies(frequencies.tables, level=level), top),
+        ),
+        (f"Top {top} of {len(frequencies.columns)} columns", top_frequencies(frequencies.columns, top)),
+        (f"Top {top} of {len(frequencies.queries)} queries", top_frequencies(frequencies.queries, top)),
+    ]
+    distributions = [
+        (name, frequency_distribution(counts))
+        for name, counts in (
+            ("tables", frequencies.tables),
+            ("columns", frequencies.columns),
+            ("queries", frequencies.queries),
+        )
+    ]
+
+    heights = [max(len(counts), 1) * 18 + 80 for _, counts in panels] + [300]
+    fig = make_subplots(
+        rows=len(heights),
+        cols=1,
+        subplot_titles=[title for title, _ in panels] + ["Number of entries by count"],
+        row_heights=heights,
+        vertical_spacing=40 / sum(heights),
+    )
+    for row, (_, counts) in enumerate(panels, start=1):
+        names = list(counts)
+        fig.add_trace(
+            go.Bar(
+                x=list(counts.values()),
+                y=[_shorten(name, 80) for name in names],
+                hovertext=[_shorten(name, 1000) for name in names],
+                hoverinfo="x+text",
+                orientation="h",
+                showlegend=False,
+            ),
+            row=row,
+            col=1,
+        )
+        fig.update_yaxes(autorange="reversed", row=row, col=1)
+
+    for name, distribution in distributions:
+        fig.add_trace(
+            go.Bar(x=list(distribution), y=list(distribution.values()), name=name),
+            row=len(heights),
+            col=1,
+        )
+    fig.update_yaxes(type="log", row=len(heights), col=1)
+    fig.update_layout(height=sum(heights), title="SQLPrunr frequencies", barmode="group")
+
+    html = fig.to_html(full_html=True, include_plotlyjs=include_plotlyjs)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+    return html
+
+
+def table_usage(
+    frequencies: Frequencies,
+    databases: typing.Union[Database, typing.List[Database], TableResolver],
+) -> typing.Dict[TableKey, int]:
+    """
+    Return number of uses of every table of the schema, unused tables are left out.
+
+    References are resolved like in find_unused_tables, an ambiguous reference counts for
+    every table it matches.
+
+    :param frequencies: Frequencies of the queries
+    :param databases: Database schema, list of databases or prebuilt TableResolver
+    """
+    resolver = databases if isinstance(databases, TableResolver) else TableResolver(databases)
+    usage = {}
+    for reference, count in frequencies.tables.items():
+        for key in resolver.resolve(reference):
+            usage[key] = usage.get(key, 0) + count
+    return usage
+
+
+def _column_usage(
+    frequencies: Frequencies, resolver: TableResolver
+) -> typing.Dict[typing.Tuple[TableKey, int], int]:
+    usage = {}
+    for reference, columns in frequencies.table_columns.items():
+        for key in resolver.resolve(reference):
+            for column, count in columns.items():
+                position = resolver.column_position(key, column)
+                if position is not None:
+                    usage[key, position] = usage.get((key, position), 0) + count
+    return usage
+
+
+def _escape_record(text: str) -> str:
+    return re.sub(r'([\\{}|<>"])', r"\\\1", text)
+
+
+class _StructureGraph:
+    """
+    Digraph of schemas drawn as clusters, with a budget of database, schema and table nodes.
+
+    Columns are drawn inside the table node, never as separate nodes, so the size of the graph
+    depends on the number of tables only.
+    """
+
+    def __init__(
+        self,
+        usage: typing.Optional[typing.Dict[TableKey, int]],
+        column_usage: typing.Optional[typing.Dict[typing.Tuple[TableKey, int], int]],
+        show_columns: bool,
+        max_columns: int,
+    ):
+        from graphviz import Digraph
+
+        self.dot = Digraph(comment="Database Schema")
+        self.dot.attr(rankdir="LR")
+        self.usage = usage
+        self.column_usage = column_usage
+        self.show_columns = show_columns
+        self.max_columns = max_columns
+        self.nodes = 0
+        self.drawn: typing.Dict[str, str] = {}
+
+    def node(self, graph, label: str, **attrs) -> str:
+        self.nodes += 1
+        node_id = f"n{self.nodes}"
+        graph.node(node_id, label, **attrs)
+        return node_id
+
+    def database(self, database: Database) -> str:
+        node_id = self.drawn.get(database.name)
+        if node_id is None:
+            node_id = self.drawn[database.name] = self.node(
+                self.dot, database.name, shape="box", style="filled", color="lightblue"
             )
-            dot.edge(db_id, schema_id)
-
-            for table in schema.tables:
-                table_id = f"table_{db.name}_{schema.name}_{table.name}"
-                dot.node(
-                    table_id,
-                    table.name,
-                    shape="box",
-                    style="filled",
-                    color="lightgreen",
-                )
-                dot.edge(schema_id, table_id)
-
-                for column in table.columns:
-                    column_id = (
-                        f"column_{db.name}_{schema.name}_{table.name}_{column.name}"
-                    )
-                    dot.node(
-                        column_id,
-                        f"{column.name}\n({column.data_type})",
-                        shape="ellipse",
-                    )
-                    dot.edge(table_id, column_id)
-
-    return dot
+        return node_id
+
+    def table_label(self, key: TableKey, table: Table) -> typing.Tuple[str, dict]:
+        uses = None if self.usage is None else self.usage.get(key, 0)
+        title = table.name if uses is None else f"{table.name}\n{uses} uses"
+        # Unused tables are the candidates for pruning
+        color = "mistyrose" if uses == 0 else "lightgreen"
+
+        if not self.show_columns:
+            return f"{title}\n({len(table.columns)} columns)", {
+                "shape": "box",
+                "style": "filled",
+                "color": color,
+            }
+
+        lines = []
+        for position, column in enumerate(table.columns[: self.max_columns]):
+            line = f"{column.name} ({column.data_type})"
+            if self.column_usage is not None:
+                line += f" {self.column_usage.get((key, position), 0)} uses"
+            lines.append(_escape_record(line) + "\\l")
+        if len(table.columns) > self.max_columns:
+            lines.append(f"\u2026 {len(table.columns) - self.max_columns} more columns\\l")
+
+        label = "{" + _escape_record(title).replace("\n", "\\n") + "|" + "".join(lines) + "}"
+        return label, {"shape": "record", "style": "filled", "color": color}
+
+    def schema(
+        self,
+        database: Database,
+        schema: Schema,
+        tables: typing.Sequence[Table],
+        *,
+        label: typing.Optional[str] = None,
+        hidden: int = 0,
+    ) -> None:
+        database_id = self.database(database)
+        with self.dot.subgraph(name=f"cluster_{self.nodes + 1}") as cluster:
+            cluster.attr(label=label or schema.name, style="filled", color="lightyellow")
+            schema_id = self.node(cluster, schema.name, shape="box", style="filled", color="khaki")
+            self.dot.edge(database_id, schema_id)
+
+            database_name = normalize_identifier(database.name)
+            schema_name = normalize_identifier(schema.name)
+            for table in tables:
+                key = (database_name, schema_name, normalize_identifier(table.name))
+                table_label, attrs = self.table_label(key, table)
+                self.dot.edge(schema_id, self.node(cluster, table_label, **attrs))
+
+            if hidden:
+                more_id = self.node(cluster, f"\u2026 {hidden} more tables", shape="plaintext")
+                self.dot.edge(schema_id, more_id, style="dashed")
+
+
+def _select_schemas(
+    databases: typing.Iterable[Database],
+    database: typing.Optional[str],
+    schema: typing.Optional[str],
+) -> typing.Iterator[typing.Tuple[Database, Schema]]:
+    database = None if database is None else normalize_identifier(database)
+    schema = None if schema is None else normalize_identifier(schema)
+    for db in databases:
+        if database is not None and normalize_identifier(db.name) != database:
+            continue
+        for db_schema in db.schemas:
+            if schema is None or normalize_identifier(db_schema.name) == schema:
+                yield db, db_schema
+
+
+def _usage(
+    databases: typing.List[Database],
+    frequencies: typing.Optional[Frequencies],
+    show_columns: bool,
+    *,
+    database: typing.Optional[str] = None,
+    schema: typing.Optional[str] = None,
+    default_database: typing.Optional[str] = None,
+    default_schema: typing.Optional[str] = None,
+) -> tuple:
+    if frequencies is None:
+        return None, None
+
+    selected = _select_schemas(databases, database, schema)
+    if (database is not None or schema is not None) and default_database is not None:
+        # Only the drawn schemas are indexed, together with the schemas of the default database
+        # that references to them could resolve to instead, so counts match the whole account
+        selected = list(selected)
+        drawn = {id(db_schema) for _, db_schema in selected}
+        names = {normalize_identifier(db_schema.name) for _, db_schema in selected}
+        if default_schema is not None:
+            names.add(normalize_identifier(default_schema))
+        selected.extend(
+            (db, db_schema)
+            for db, db_schema in _select_schemas(databases, default_database, None)
+            if normalize_identifier(db_schema.name) in names and id(db_schema) not in drawn
+        )
+
+    resolver = TableResolver([], default_database=default_database, default_schema=default_schema)
+    for db, db_schema in selected:
+        for table in db_schema.tables:
+            resolver.add(db, db_schema, table)
+
+    column_usage = _column_usage(frequencies, resolver) if show_columns else None
+    return table_usage(frequencies, resolver), column_usage
+
+
+def visualize_structure(
+    databases: typing.List[Database],
+    *,
+    frequencies: typing.Optional[Frequencies] = None,
+    database: typing.Optional[str] = None,
+    schema: typing.Optional[str] = None,
+    show_columns: bool = False,
+    max_columns: int = 50,
+    max_nodes: int = 1_000,
+    default_database: typing.Optional[str] = None,
+    default_schema: typing.Optional[str] = None,
+):
+    """
+    Draw schemas as clusters of tables, columns are collapsed into a count by default.
+
+    The graph never has more than ``max_nodes`` database, schema and table nodes, tables and
+    schemas over the budget are summarized as ``… N more`` nodes. Draw a single database or
+    schema on demand with ``database`` and ``schema``, or all of them with paginate_structure.
+
+    :param databases: Databases to draw
+    :param frequencies: Frequencies of the queries, tables (and columns) are annotated with
+        number of uses and unused tables are highlighted
+    :param database: Name of the database to draw, case-insensitive
+    :param schema: Name of the schema to draw, case-insensitive
+    :param show_columns: Whether to list columns inside the table nodes
+    :param max_columns: Maximum number of columns listed in a table node
+    :param max_nodes: Maximum number of nodes of the graph
+    :param default_database: Database of references without a database, see TableResolver
+    :param default_schema: Schema of references without a schema
+    :return: graphviz.Digraph
+    """
+    usage, column_usage = _usage(
+        databases,
+        frequencies,
+        show_columns,
+        database=database,
+        schema=schema,
+        default_database=default_database,
+        default_schema=default_schema,
+    )
+    graph = _StructureGraph(usage, column_usage, show_columns, max_columns)
+
+    schemas = _select_schemas(databases, database, schema)
+    for db, db_schema in schemas:
+        # Database (when not drawn yet), schema and summaries of hidden tables and schemas
+        remaining = max_nodes - graph.nodes - (db.name not in graph.drawn) - 3
+        if remaining < 1:
+            hidden = 1 + sum(1 for _ in schemas)
+            graph.node(graph.dot, f"\u2026 {hidden} more schemas", shape="plaintext")
+            break
+
+        tables = db_schema.tables
+        if len(tables) > remaining:
+            graph.schema(db, db_schema, tables[:remaining], hidden=len(tables) - remaining)
+        else:
+            graph.schema(db, db_schema, tables)
+
+    return graph.dot
+
+
+def paginate_structure(
+    databases: typing.List[Database],
+    *,
+    frequencies: typing.Optional[Frequencies] = None,
+    show_columns: bool = False,
+    max_columns: int = 50,
+    max_nodes: int = 1_000,
+    default_database: typing.Optional[str] = None,
+    default_schema: typing.Optional[str] = None,
+) -> typing.Iterator:
+    """
+    Draw all schemas as pages of at most ``max_nodes`` nodes, lazily.
+
+    Pages hold whole schemas, a schema larger than a page is split into parts. Only the
+    current page is kept in memory, render or save every page before taking the next one.
+
+    :param databases: Databases to draw
+    :param frequencies: Frequencies of the queries, see visualize_structure
+    :param show_columns: Whether to list columns inside the table nodes
+    :param max_columns: Maximum number of columns listed in a table node
+    :param max_nodes: Maximum number of nodes of a page
+    :param default_database: Database of references without a database, see TableResolver
+    :param default_schema: Schema of references without a schema
+    :return: Iterator of graphviz.Digraph
+    """
+    if max_nodes < 3:
+        raise ValueError("max_nodes must allow a database, a schema and a table on a page.")
+
+    usage, column_usage = _usage(
+        databases,
+        frequencies,
+        show_columns,
+        default_database=default_database,
+        default_schema=default_schema,
+    )
+    page_size = max_nodes - 2
+
+    def new_page() -> _StructureGraph:
+        return _StructureGraph(usage, column_usage, show_columns, max_columns)
+
+    graph = new_page()
+    for db, db_schema in _select_schemas(databases, None, None):
+        tables = db_schema.tables
+        parts = max(1, -(-len(tables) // page_size))
+        for part in range(parts):
+            chunk = tables[part * page_size:(part + 1) * page_size]
+            needed = (db.name not in graph.drawn) + 1 + len(chunk)
+            if graph.nodes and graph.nodes + needed > max_nodes:
+                yield graph.dot
+                graph = new_page()
+
+            label = db_schema.name if parts == 1 else f"{db_schema.name} ({part + 1}/{parts})"
+            graph.schema(db, db_schema, chunk, label=label)
+
+    if graph.nodes:
+        yield graph.dot
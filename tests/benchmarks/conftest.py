@@ -0,0 +1,71 @@
+import json
+import os
+import typing
+
+import big_o
+import pytest
+
+MIN_N = int(os.getenv("SQLPRUNR_BENCHMARK_MIN_N", 1_000))
+MAX_N = int(os.getenv("SQLPRUNR_BENCHMARK_MAX_N", 10_000))
+SIZES = [10**k for k in range(3, 7) if MIN_N <= 10**k <= MAX_N]
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Margin over the baseline exponent before scaling is reported as a regression, fits are noisy
+EXPONENT_MARGIN = 0.25
+# Cubic fit is rank deficient for n in the millions
+CLASSES = [c for c in big_o.complexities.ALL_CLASSES if c is not big_o.complexities.Cubic]
+
+
+@pytest.fixture(scope="session")
+def scaling_results() -> typing.Iterator[dict]:
+    results = {}
+    yield results
+
+    path = os.getenv("SQLPRUNR_BENCHMARK_SAVE")
+    if path and results:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+@pytest.fixture
+def measure_scaling(scaling_results, capsys) -> typing.Callable:
+    """
+    Fit time complexity of the function with big_o and compare it with the baseline.
+
+    The exponent of the polynomial fit (1 for linear, 2 for quadratic) is compared with
+    ``baseline.json``, set SQLPRUNR_BENCHMARK_SAVE to a path to write new results.
+    """
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+
+    def measure(name: str, function: typing.Callable, data_generator: typing.Callable) -> dict:
+        best, others = big_o.big_o(
+            function,
+            data_generator,
+            min_n=MIN_N,
+            max_n=MAX_N,
+            n_measures=5,
+            n_repeats=1,
+            classes=CLASSES,
+            return_raw_data=True,
+        )
+        polynomial = next(c for c in others if isinstance(c, big_o.complexities.Polynomial))
+        result = {
+            "complexity": type(best).__name__,
+            "exponent": round(float(polynomial.coefficients()[1]), 3),
+            "max_n": MAX_N,
+            "seconds_per_item": others["times"][-1] / others["measures"][-1],
+        }
+        scaling_results[name] = result
+
+        with capsys.disabled():
+            print(
+                f"\n{name} scaling ({MIN_N}-{MAX_N}): {result['complexity']}, "
+                f"x^{result['exponent']}, {result['seconds_per_item'] * 1e6:.2f} us per item"
+            )
+
+        # Fixed costs flatten the fit on small sizes, linear scaling is always accepted
+        expected = max(baseline[name]["exponent"], 1.0) + EXPONENT_MARGIN
+        assert result["exponent"] <= expected, f"{name} scales as x^{result['exponent']}"
+        return result
+
+    return measure
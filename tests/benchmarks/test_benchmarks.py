@@ -0,0 +1,123 @@
+from dataclasses import asdict
+import time
+
+import pandas as pd
+import pytest
+
+from sqlprunr.engine.analyzer import find_unused_tables, get_frequencies, get_time_spent
+from sqlprunr.engine.diff import diff_schema_data
+from sqlprunr.engine.frames import get_frequencies_frame
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData, SnowflakeCSVTableParser
+from sqlprunr.engine.resolver import TableResolver
+from sqlprunr.engine.visualizer import visualize_structure
+from tests.generators import SchemaShape, gen_frequencies, gen_query_history, gen_schema_rows
+
+from .conftest import SIZES
+
+SHAPE = SchemaShape()
+
+
+def gen_unused_tables_data(n: int):
+    # One column per table keeps the schema n tables wide
+    shape = SchemaShape(columns_per_table=1)
+    databases = SnowflakeCSVTableParser().parse_table(gen_schema_rows(n, shape=shape))
+    return gen_frequencies(n, shape=shape), TableResolver(databases)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_parse_table(n, benchmark):
+    rows = gen_schema_rows(n)
+    parser = SnowflakeCSVTableParser()
+
+    databases = benchmark.pedantic(parser.parse_table, args=(rows,), rounds=3)
+
+    assert sum(len(t.columns) for d in databases for s in d.schemas for t in s.tables) == n
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_get_frequencies(n, benchmark):
+    queries = gen_query_history(n)
+
+    frequencies = benchmark.pedantic(get_frequencies, args=(queries,), rounds=3)
+
+    assert sum(frequencies.queries.values()) == n
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_find_unused_tables(n, benchmark):
+    frequencies, resolver = gen_unused_tables_data(n)
+
+    unused_tables = benchmark.pedantic(find_unused_tables, args=(frequencies, resolver), rounds=3)
+
+    assert 0 < len(unused_tables) < n
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_get_time_spent(n, benchmark):
+    queries = gen_query_history(n)
+
+    time_spent = benchmark.pedantic(get_time_spent, args=(queries,), rounds=3)
+
+    assert len(time_spent) <= n
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_visualize_structure_budget(n, benchmark):
+    databases = SnowflakeCSVTableParser().parse_table(gen_schema_rows(n))
+
+    dot = benchmark.pedantic(
+        visualize_structure, args=(databases,), kwargs={"max_nodes": 500}, rounds=3
+    )
+
+    # The graph is bounded by the budget, not by the size of the schema
+    assert sum(1 for line in dot.body if " [label=" in line) <= 500
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_diff_schema_data(n, benchmark):
+    old = gen_schema_rows(n)
+    new = old[20:] + [SnowflakeCSVData("NEW", "SCHEMA0", "TABLE0", "id", "NUMBER")]
+
+    diff = benchmark.pedantic(diff_schema_data, args=(old, new), rounds=3)
+
+    assert len(diff.dropped_tables) == len(diff.added_tables) == 1
+
+
+def test_parse_table_scaling(measure_scaling):
+    measure_scaling("parse_table", SnowflakeCSVTableParser().parse_table, gen_schema_rows)
+
+
+def test_get_frequencies_scaling(measure_scaling):
+    measure_scaling("get_frequencies", get_frequencies, gen_query_history)
+
+
+def test_find_unused_tables_scaling(measure_scaling):
+    measure_scaling(
+        "find_unused_tables",
+        lambda data: find_unused_tables(*data),
+        gen_unused_tables_data,
+    )
+
+
+def test_get_time_spent_scaling(measure_scaling):
+    measure_scaling("get_time_spent", get_time_spent, gen_query_history)
+
+
+def test_get_frequencies_frame_speedup(benchmark, capsys):
+    # Dashboards and schedulers rerun the very same texts, the history repeats every text 10 times
+    queries = gen_query_history(20_000, tables=1_000, templates=500, seed=5) * 10
+    frame = pd.DataFrame([asdict(query) for query in queries])
+
+    start = time.perf_counter()
+    expected = get_frequencies(queries)
+    rows_time = time.perf_counter() - start
+
+    frames = benchmark.pedantic(get_frequencies_frame, args=(frame,), rounds=1)
+    frame_time = benchmark.stats.stats.mean
+
+    # Only distinct texts are analyzed, the ratio is recorded, timings are too noisy to assert
+    benchmark.extra_info["speedup"] = rows_time / frame_time
+    with capsys.disabled():
+        print(f"\nFrequencies frame speedup over rows: {rows_time / frame_time:.1f}x")
+
+    assert frames.to_frequencies() == expected
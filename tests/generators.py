@@ -0,0 +1,147 @@
+import random
+import typing
+
+import numpy as np
+
+from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData
+
+COLUMN_NAMES = [
+    "id", "name", "status", "created_at", "updated_at", "user_id", "account_id", "amount",
+    "currency", "country", "email", "type", "category", "price", "quantity", "description",
+]
+DATA_TYPES = ["NUMBER", "TEXT", "TIMESTAMP_NTZ", "BOOLEAN", "FLOAT", "VARIANT", "DATE"]
+
+
+class SchemaShape(typing.NamedTuple):
+    schemas_per_database: int = 10
+    tables_per_schema: int = 50
+    columns_per_table: int = 20
+
+
+def table_name(table: int, shape: SchemaShape = SchemaShape()) -> str:
+    """
+    Return fully qualified name of the n-th table of a generated schema.
+    """
+    schema, table = divmod(table, shape.tables_per_schema)
+    database, schema = divmod(schema, shape.schemas_per_database)
+    return f"DB{database}.SCHEMA{schema}.TABLE{table}"
+
+
+def column_name(column: int) -> str:
+    name = COLUMN_NAMES[column % len(COLUMN_NAMES)]
+    return name if column < len(COLUMN_NAMES) else f"{name}_{column // len(COLUMN_NAMES)}"
+
+
+def gen_schema_rows(
+    n: int, *, shape: SchemaShape = SchemaShape(), seed: int = 0
+) -> typing.List[SnowflakeCSVData]:
+    """
+    Generate n rows of a Snowflake schema export, databases x schemas x tables x columns.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        table, column = divmod(i, shape.columns_per_table)
+        database, schema, table = table_name(table, shape).split(".")
+        rows.append(
+            SnowflakeCSVData(database, schema, table, column_name(column), rng.choice(DATA_TYPES))
+        )
+    return rows
+
+
+def _gen_template(rng: random.Random, tables: int, shape: SchemaShape) -> str:
+    def table() -> str:
+        # Queries reference tables fully qualified, by schema.table or by bare name
+        name = table_name(rng.randrange(tables), shape)
+        return name.split(".", rng.choice([0, 0, 1, 2]))[-1]
+
+    def columns(k: int) -> typing.List[str]:
+        return [column_name(rng.randrange(shape.columns_per_table)) for _ in range(k)]
+
+    kind = rng.random()
+    if kind < 0.5:
+        select = ", ".join(dict.fromkeys(columns(rng.randint(1, 6))))
+        where = " AND ".join(f"{column} = %d" for column in dict.fromkeys(columns(rng.randint(1, 3))))
+        return f"SELECT {select} FROM {table()} WHERE {where}"
+    if kind < 0.65:
+        first, second = columns(2)
+        return (
+            f"SELECT a.{first}, b.{second}, COUNT(*) FROM {table()} a "
+            f"JOIN {table()} b ON a.id = b.{second} WHERE a.{first} > %d GROUP BY a.{first}, b.{second}"
+        )
+    if kind < 0.8:
+        names = list(dict.fromkeys(columns(rng.randint(1, 5))))
+        values = ", ".join("%d" for _ in names)
+        return f"INSERT INTO {table()} ({', '.join(names)}) VALUES ({values})"
+    if kind < 0.95:
+        first, second = columns(2)
+        return f"UPDATE {table()} SET {first} = %d WHERE {second} = %d"
+    first, second = columns(2)
+    return (
+        f"BEGIN; DELETE FROM {table()} WHERE {first} < %d; "
+        f"INSERT INTO {table()} ({second}) SELECT {second} FROM {table()} WHERE {first} = %d; COMMIT;"
+    )
+
+
+def gen_query_history(
+    n: int,
+    *,
+    tables: int = 1_000,
+    templates: int = 1_000,
+    zipf: float = 1.1,
+    shape: SchemaShape = SchemaShape(),
+    seed: int = 0,
+) -> typing.List[QueryData]:
+    """
+    Generate n queries, templates are reused following Zipf's law like in real query histories.
+
+    Queries of the same template differ in literals only, so they share a fingerprint.
+
+    :param n: Number of queries
+    :param tables: Number of tables of the generated schema the queries read from
+    :param templates: Number of distinct query templates
+    :param zipf: Exponent of the template popularity distribution
+    """
+    rng = random.Random(seed)
+    generated = [_gen_template(rng, tables, shape) for _ in range(templates)]
+    placeholders = [template.count("%d") for template in generated]
+
+    np_rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, templates + 1) ** zipf
+    picks = np_rng.choice(templates, size=n, p=weights / weights.sum())
+    literals = np_rng.integers(0, 1_000_000, size=(n, max(placeholders)))
+
+    start = np.datetime64("2024-06-01T00:00:00.000") + np.sort(
+        np_rng.integers(0, 30 * 24 * 3600 * 1000, size=n)
+    ).astype("timedelta64[ms]")
+    duration = np_rng.lognormal(5, 1.5, size=n).astype("timedelta64[ms]")
+    start_times = np.datetime_as_string(start, unit="ms").tolist()
+    end_times = np.datetime_as_string(start + duration, unit="ms").tolist()
+
+    return [
+        QueryData(
+            generated[template] % tuple(literals[i, :placeholders[template]].tolist()),
+            start_times[i],
+            end_times[i],
+        )
+        for i, template in enumerate(picks.tolist())
+    ]
+
+
+def gen_frequencies(
+    n: int, *, used: float = 0.5, shape: SchemaShape = SchemaShape(), seed: int = 0
+) -> Frequencies:
+    """
+    Generate frequencies that use a share of the first n tables of a generated schema.
+
+    Tables are referenced fully qualified in mixed case, shorter references would be ambiguous
+    across the generated databases.
+    """
+    rng = random.Random(seed)
+    tables = {}
+    for table in range(n):
+        if rng.random() < used:
+            name = table_name(table, shape)
+            tables[name.lower() if rng.random() < 0.5 else name] = rng.randint(1, 1_000)
+    return Frequencies(tables=tables, columns={}, queries={})
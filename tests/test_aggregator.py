@@ -0,0 +1,37 @@
+from sqlprunr.engine.aggregator import FrequencyAggregator
+
+
+def test_frequency_aggregator(benchmark):
+    def aggregate():
+        aggregator = FrequencyAggregator()
+        aggregator.add("SELECT column1 FROM table1", ["table1"], ["column1"])
+        aggregator.add("SELECT column1 FROM table1", ["table1"], ["column1"])
+        aggregator.add("SELECT column2 FROM table2", ["table2"], ["column2"])
+        return aggregator.to_frequencies()
+
+    frequencies = benchmark(aggregate)
+
+    assert frequencies.tables == {"table1": 2, "table2": 1}
+    assert list(frequencies.tables) == ["table1", "table2"]
+    assert frequencies.columns == {"column1": 2, "column2": 1}
+    assert frequencies.queries == {
+        "SELECT column1 FROM table1": 2,
+        "SELECT column2 FROM table2": 1,
+    }
+
+
+def test_frequency_aggregator_merge():
+    first = FrequencyAggregator()
+    first.add("SELECT column1 FROM table1", ["table1"], ["column1"])
+    second = FrequencyAggregator()
+    second.add("SELECT column2 FROM table2", ["table2"], ["column2"])
+    second.add("SELECT column2 FROM table2", ["table2"], ["column2"])
+
+    frequencies = first.merge(second).to_frequencies()
+
+    assert list(frequencies.tables.items()) == [("table2", 2), ("table1", 1)]
+    assert frequencies.columns == {"column2": 2, "column1": 1}
+    assert frequencies.queries == {
+        "SELECT column2 FROM table2": 2,
+        "SELECT column1 FROM table1": 1,
+    }
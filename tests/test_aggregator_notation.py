@@ -0,0 +1,49 @@
+import big_o
+
+from sqlprunr.engine.aggregator import FrequencyAggregator
+
+MIN_N = 10_000
+MAX_N = 100_000
+# Fits are noisy, anything up to x^1.25 is accepted as linear
+MAX_EXPONENT = 1.25
+# Cubic fit is rank deficient for n in the millions
+CLASSES = [c for c in big_o.complexities.ALL_CLASSES if c is not big_o.complexities.Cubic]
+
+
+def gen_analyzed_queries(n: int):
+    return [
+        (
+            f"SELECT column{i % 500} FROM db1.schema1.table{i % 100}",
+            [f"db1.schema1.table{i % 100}"],
+            [f"column{i % 500}"],
+        )
+        for i in range(n)
+    ]
+
+
+def aggregate(analyzed_queries):
+    aggregator = FrequencyAggregator()
+    for query_text, tables, columns in analyzed_queries:
+        aggregator.add(query_text, tables, columns)
+    return aggregator.to_frequencies()
+
+
+def test_frequency_aggregator_notation(capsys):
+    best, others = big_o.big_o(
+        aggregate,
+        gen_analyzed_queries,
+        min_n=MIN_N,
+        max_n=MAX_N,
+        n_measures=10,
+        n_repeats=1,
+        classes=CLASSES,
+    )
+    polynomial = next(c for c in others if isinstance(c, big_o.complexities.Polynomial))
+    exponent = float(polynomial.coefficients()[1])
+    with capsys.disabled():
+        print(
+            f"\nFrequency aggregator report ({MIN_N}-{MAX_N} dummy analyzed queries):\n{'-'*30}\n"
+            + big_o.reports.big_o_report(best, others)
+        )
+
+    assert exponent <= MAX_EXPONENT, f"Frequency aggregator scales as x^{exponent:.2f}"
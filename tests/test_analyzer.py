@@ -1,5 +1,15 @@
-from sqlprunr.engine.analyzer import analyze_query, find_unused_tables, get_frequencies
+import pytest
+
+from sqlprunr.data.generic import Column
+from sqlprunr.engine.analyzer import (
+    analyze_query,
+    analyze_script,
+    find_unused_columns,
+    find_unused_tables,
+    get_frequencies,
+)
 from sqlprunr.data.query_data import Frequencies, QueryData
+from sqlprunr.engine.fingerprint import QueryCache
 
 
 def test_analyze_query(benchmark):
@@ -58,3 +68,117 @@ def test_get_frequencies_no_columns(query_data, benchmark):
     assert frequencies.queries == {
         query.QUERY_TEXT: queries.count(query.QUERY_TEXT) for query in query_data
     }
+
+
+def test_get_frequencies_workers(query_data):
+    queries = query_data * 50
+    serial = get_frequencies(queries)
+    parallel = get_frequencies(queries, workers=2, chunksize=7)
+
+    assert list(parallel.tables.items()) == list(serial.tables.items())
+    assert list(parallel.columns.items()) == list(serial.columns.items())
+    assert list(parallel.queries.items()) == list(serial.queries.items())
+
+
+def test_get_frequencies_workers_mixed_case():
+    queries = [
+        QueryData("SELECT Col1 FROM Tbl1", "", ""),
+        QueryData("select col1 from tbl1", "", ""),
+        QueryData("SELECT col1 FROM Tbl1 WHERE id = 1", "", ""),
+    ] * 3
+    serial = get_frequencies(queries)
+
+    # Every chunk goes to a worker with its own cache, results must not depend on which
+    # spelling a worker parsed first
+    for chunksize in (1, 2, 4):
+        parallel = get_frequencies(queries, workers=2, chunksize=chunksize)
+        assert parallel.tables == serial.tables == {"Tbl1": 6, "tbl1": 3}
+        assert parallel.columns == serial.columns
+        assert parallel.table_columns == serial.table_columns
+
+
+def test_get_frequencies_workers_cache(query_data):
+    with pytest.raises(ValueError, match="cache"):
+        get_frequencies(query_data, workers=2, cache=QueryCache())
+
+
+def test_get_frequencies_table_columns(query_data):
+    frequencies = get_frequencies(query_data)
+
+    assert frequencies.table_columns == {
+        "db1.schema1.table1": {"column1": 1, "column2": 1},
+        "db1.schema1.table2": {"column1": 1},
+    }
+
+
+def test_find_unused_columns(query_data, database, benchmark):
+    frequencies = get_frequencies(query_data)
+
+    unused_columns = benchmark(lambda: find_unused_columns(frequencies, database))
+
+    assert unused_columns == {
+        "db1.schema1.table2": [Column(name="column3", data_type="NUMBER")],
+    }
+
+
+def test_find_unused_columns_qualified_and_star(database):
+    frequencies = get_frequencies(
+        [
+            QueryData("SELECT t.COLUMN2 FROM schema1.table1 t JOIN table2 ON 1 = 1", "", ""),
+            QueryData("SELECT * FROM db1.schema1.table2", "", ""),
+        ]
+    )
+
+    unused_columns = find_unused_columns(frequencies, database)
+
+    assert unused_columns == {
+        "db1.schema1.table1": [Column(name="column1", data_type="TEXT")],
+    }
+
+
+def test_analyze_script():
+    query = QueryData(
+        "USE DATABASE db1; SELECT column1 FROM table1 WHERE name = 'a;b';\n"
+        "-- copy; rows\nINSERT INTO table2 (column2) SELECT column1 FROM table1;",
+        "",
+        "",
+    )
+
+    statements = analyze_script(query)
+    assert [statement["tables"] for statement in statements] == [
+        ["table1"],
+        ["table2", "table1"],
+    ]
+
+    result = analyze_query(query)
+    assert result["tables"] == ["table1", "table2"]
+    assert result["columns"] == ["column1", "name", "column2"]
+
+
+def test_analyze_query_skips_unparseable_statements():
+    query = QueryData("USE x; SELECT column1 FROM table1; BEGIN;", "", "")
+
+    result = analyze_query(query)
+
+    assert result["query_ref"] == query.QUERY_TEXT
+    assert result["tables"] == ["table1"]
+    assert result["columns"] == ["column1"]
+    # A query without any statement that can be analyzed is an error, not an empty result
+    with pytest.raises(ValueError, match="cannot be analyzed"):
+        analyze_query(QueryData("BEGIN", "", ""))
+
+
+def test_get_frequencies_script():
+    script = (
+        "BEGIN; SELECT column1 FROM table1 WHERE name = 'a;b';"
+        "SELECT column2 FROM table1; COMMIT;"
+    )
+
+    frequencies = get_frequencies([QueryData(script, "", ""), QueryData(script, "", "")])
+
+    assert frequencies.tables == {"table1": 4}
+    assert frequencies.columns == {"column1": 2, "name": 2, "column2": 2}
+    assert frequencies.queries == {script: 2}
+    assert frequencies.table_columns == {
+        "table1": {"column1": 2, "name": 2, "column2": 2}
+    }
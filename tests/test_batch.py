@@ -0,0 +1,97 @@
+import pytest
+
+from sqlprunr.engine.aggregator import FrequencyAggregator
+from sqlprunr.engine.analyzer import get_frequencies
+from sqlprunr.engine.batch import CheckpointExistsError, _estimate_size, run_batch
+from tests.generators import gen_query_history
+
+
+@pytest.fixture(scope="module")
+def history():
+    return gen_query_history(2_000, tables=200, templates=100, seed=5)
+
+
+def _failing(queries, after):
+    for i, query in enumerate(queries):
+        if i == after:
+            raise RuntimeError("Connection lost")
+        yield query
+
+
+def _assert_same(frequencies, expected):
+    assert frequencies.tables == expected.tables
+    assert frequencies.columns == expected.columns
+    assert frequencies.queries == expected.queries
+    assert frequencies.table_columns == expected.table_columns
+
+
+def test_run_batch(history, tmp_path, benchmark):
+    checkpoint = tmp_path / "checkpoint.sqlite"
+    frequencies = benchmark.pedantic(
+        run_batch, args=(history, checkpoint), kwargs={"chunk_size": 300}, rounds=1
+    )
+
+    _assert_same(frequencies, get_frequencies(history))
+
+
+def test_run_batch_resume(history, tmp_path):
+    checkpoint = tmp_path / "checkpoint.sqlite"
+    with pytest.raises(RuntimeError):
+        run_batch(_failing(history, 1_550), checkpoint, chunk_size=100, checkpoint_every=2)
+
+    progress = []
+    frequencies = run_batch(
+        history, checkpoint, resume=True, chunk_size=100, progress=progress.append
+    )
+
+    # The last checkpoint was written after 1400 queries, only the rest is analyzed again
+    assert progress[0].resumed == 1_400
+    assert progress[0].processed == 1_500
+    assert progress[-1].processed == 2_000
+    _assert_same(frequencies, get_frequencies(history))
+
+
+def test_run_batch_resume_checks(history, tmp_path):
+    checkpoint = tmp_path / "checkpoint.sqlite"
+    run_batch(history[:500], checkpoint, source="queries.csv")
+
+    with pytest.raises(CheckpointExistsError, match="resume it or remove it"):
+        run_batch(history, checkpoint, source="queries.csv")
+    with pytest.raises(ValueError, match="source"):
+        run_batch(history, checkpoint, source="other.csv", resume=True)
+    with pytest.raises(ValueError, match="has only 100"):
+        run_batch(history[:100], checkpoint, source="queries.csv", resume=True)
+
+    # New queries appended to the history are picked up by a finished checkpoint
+    frequencies = run_batch(history, checkpoint, source="queries.csv", resume=True)
+    _assert_same(frequencies, get_frequencies(history))
+
+
+def test_run_batch_memory_budget(history, tmp_path):
+    progress = []
+    run_batch(
+        history,
+        tmp_path / "checkpoint.sqlite",
+        chunk_size=500,
+        checkpoint_every=100,
+        memory_budget=1,
+        progress=progress.append,
+    )
+
+    assert [item.checkpoints for item in progress] == [1, 2, 3, 4]
+
+
+def test_estimate_size_table_columns():
+    aggregator = FrequencyAggregator()
+    aggregator.add("SELECT c FROM t", ["t"], ["c"], [("t", "c")])
+    size = _estimate_size(aggregator)
+
+    # Columns attributed to long qualified table names are counted with their names
+    aggregator.add("SELECT c FROM t", [], [], [("db" * 500 + ".t", "c" * 1000)])
+    assert _estimate_size(aggregator) > size + 2_000
+
+
+def test_run_batch_workers(history, tmp_path):
+    frequencies = run_batch(history, tmp_path / "checkpoint.sqlite", chunk_size=250, workers=2)
+
+    _assert_same(frequencies, get_frequencies(history))
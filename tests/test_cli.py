@@ -0,0 +1,115 @@
+import csv
+import subprocess
+import sys
+
+import pytest
+
+from sqlprunr.cli import main
+from tests.generators import gen_query_history, gen_schema_rows
+
+
+@pytest.fixture
+def files(tmp_path):
+    schema = tmp_path / "schema.csv"
+    with open(schema, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["DATABASE_NAME", "SCHEMA_NAME", "TABLE_NAME", "COLUMN_NAME", "DATA_TYPE"])
+        writer.writerows(
+            [row.DATABASE_NAME, row.SCHEMA_NAME, row.TABLE_NAME, row.COLUMN_NAME, row.DATA_TYPE]
+            for row in gen_schema_rows(4_000)
+        )
+
+    queries = tmp_path / "queries.csv"
+    with open(queries, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["QUERY_TEXT", "START_TIME", "END_TIME"])
+        writer.writerows(
+            [query.QUERY_TEXT, query.START_TIME, query.END_TIME]
+            for query in gen_query_history(1_000, tables=100, templates=50, seed=2)
+        )
+    return schema, queries
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_main(files, tmp_path, capsys, benchmark):
+    schema, queries = files
+    output = tmp_path / "report"
+    arguments = [str(schema), str(queries), "-o", str(output), "--chunk-size", "200", "-q"]
+
+    assert benchmark.pedantic(main, args=(arguments,), rounds=1) == 0
+    assert "1000 queries analyzed" in capsys.readouterr().out
+
+    tables = _read(output / "unused_tables.csv")
+    columns = _read(output / "unused_columns.csv")
+    assert 0 < len(tables) < 200
+    assert all(row["DATABASE_NAME"] == "DB0" for row in tables)
+    assert columns and set(columns[0]) == {"TABLE", "COLUMN_NAME", "DATA_TYPE"}
+    assert (output / "checkpoint.sqlite").exists()
+
+    # The checkpoint is kept, running again requires --resume or --force
+    with pytest.raises(SystemExit):
+        main(arguments)
+    assert "--force" in capsys.readouterr().err
+    assert main([*arguments, "--resume"]) == 0
+    assert _read(output / "unused_tables.csv") == tables
+    assert main([*arguments, "--force"]) == 0
+    assert "1000 queries analyzed" in capsys.readouterr().out
+
+
+def test_main_quoted_identifiers(tmp_path):
+    schema = tmp_path / "schema.csv"
+    schema.write_text("DATABASE_NAME,SCHEMA_NAME,TABLE_NAME,COLUMN_NAME,DATA_TYPE\nDB,PUBLIC,Orders,Id,NUMBER\n")
+    queries = tmp_path / "queries.csv"
+    with open(queries, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["QUERY_TEXT", "START_TIME", "END_TIME"])
+        writer.writerow(['SELECT "Id" FROM db.public."Orders"', "2021-01-01T00:00:00", "2021-01-01T00:01:00"])
+    output = tmp_path / "report"
+
+    result = subprocess.run(
+        [sys.executable, "-m", "sqlprunr", str(schema), str(queries), "-o", str(output), "-q"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Snowflake folds unquoted db.public, the quoted Orders and Id keep their case
+    assert _read(output / "unused_tables.csv") == []
+    assert _read(output / "unused_columns.csv") == []
+    # Warnings of the analyzer are not printed with -q
+    assert result.stderr == ""
+
+
+def test_main_errors(files, tmp_path):
+    schema, queries = files
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "missing.csv"), str(queries), "-o", str(tmp_path)])
+    with pytest.raises(SystemExit):
+        main([str(schema), str(queries), "--workers", "0"])
+
+
+def test_main_malformed_queries(files, tmp_path, capsys):
+    schema, _ = files
+    queries = tmp_path / "malformed.csv"
+    queries.write_text("START_TIME,END_TIME\n2021-01-01T00:00:00,2021-01-01T00:01:00\n")
+    output = tmp_path / "report"
+
+    with pytest.raises(SystemExit):
+        main([str(schema), str(queries), "-o", str(output), "-q"])
+
+    error = capsys.readouterr().err
+    assert "QUERY_TEXT" in error
+    assert "use --resume" not in error
+    # The failed run leaves no checkpoint that would block the next one
+    assert not (output / "checkpoint.sqlite").exists()
+
+
+def test_module_help():
+    result = subprocess.run(
+        [sys.executable, "-m", "sqlprunr", "--help"], capture_output=True, text=True, check=True
+    )
+    assert "--resume" in result.stdout
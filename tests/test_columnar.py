@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from sqlprunr.data.columnar import (
+    load_databases,
+    load_frequencies,
+    save_databases,
+    save_frequencies,
+)
+from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.data.query_data import Frequencies
+from sqlprunr.engine.analyzer import find_unused_columns, find_unused_tables, get_frequencies
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData, SnowflakeCSVTableParser
+
+
+def test_databases_roundtrip(database, tmp_path):
+    databases = [
+        database,
+        Database("empty", []),
+        Database("Bäckerei", [Schema("öffentlich", [Table("Größe", [Column("maß", "TEXT")])])]),
+    ]
+
+    save_databases(databases, tmp_path / "schema")
+    loaded = load_databases(tmp_path / "schema")
+
+    assert len(loaded) == 3
+    assert loaded.names() == ["db1", "empty", "Bäckerei"]
+    assert loaded.table_count() == 3
+    assert loaded.column_count() == 4
+    assert loaded.to_databases() == databases
+    assert loaded.get_database("Bäckerei").schemas[0].get_table("Größe").get_column("maß")
+    assert loaded.get_database("missing") is None
+
+
+def test_frequencies_roundtrip(query_data, tmp_path):
+    frequencies = get_frequencies(query_data)
+
+    save_frequencies(frequencies, tmp_path / "frequencies")
+    loaded = load_frequencies(tmp_path / "frequencies")
+
+    assert loaded.to_frequencies() == frequencies
+    assert list(loaded.tables) == list(frequencies.tables)
+    assert loaded.counts("columns").tolist() == list(frequencies.columns.values())
+
+
+def test_load_wrong_kind(query_data, tmp_path):
+    save_frequencies(Frequencies({}, {}, {}), tmp_path / "frequencies")
+
+    assert load_frequencies(tmp_path / "frequencies").to_frequencies() == Frequencies({}, {}, {})
+    with pytest.raises(ValueError):
+        load_databases(tmp_path / "frequencies")
+
+
+def test_columnar_large_account(tmp_path, capsys):
+    rows = [
+        SnowflakeCSVData(f"db{i // 100_000}", f"schema{i // 10_000}", f"table{i // 20}", f"column{i % 20}", "NUMBER")
+        for i in range(1_000_000)
+    ]
+    databases = SnowflakeCSVTableParser().parse_table(rows)
+    frequencies = Frequencies(
+        tables={f"db0.schema0.table{i}": 1 for i in range(0, 500, 2)},
+        columns={},
+        queries={},
+        table_columns={f"db0.schema0.table{i}": {"column1": 1} for i in range(0, 500, 2)},
+    )
+    save_databases(databases, tmp_path / "schema")
+    save_frequencies(frequencies, tmp_path / "frequencies")
+
+    start = time.perf_counter()
+    loaded_databases = load_databases(tmp_path / "schema")
+    loaded_frequencies = load_frequencies(tmp_path / "frequencies")
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first = loaded_databases[0]
+    first_time = time.perf_counter() - start
+
+    with capsys.disabled():
+        print(
+            f"\nColumnar report (1M columns):\n{'-'*30}\n"
+            f"load: {load_time * 1000:.1f} ms, first database (100k columns): {first_time * 1000:.1f} ms"
+        )
+
+    assert load_time < 0.1
+    assert first == databases[0]
+    assert loaded_databases._databases[1:] == [None] * 9
+    # db0 has 5000 tables, 250 of them in schema0 are used
+    unused_tables = find_unused_tables(loaded_frequencies, first)
+    assert len(unused_tables) == 4_750
+    unused_columns = find_unused_columns(loaded_frequencies, first)
+    assert unused_columns == find_unused_columns(frequencies, databases[0])
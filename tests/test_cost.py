@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from sqlprunr.data.query_data import QueryCost, QueryData
+from sqlprunr.engine.analyzer import get_time_spent
+from sqlprunr.engine.cost import get_query_costs
+from sqlprunr.engine.timestamps import parse_timestamps
+
+
+@pytest.fixture
+def snowflake_query_data():
+    return [
+        QueryData(
+            QUERY_TEXT="SELECT column1 FROM table1 WHERE id = 1",
+            START_TIME="2024-06-22 17:17:34.245 +0200",
+            END_TIME="2024-06-22 17:17:34.565 +0200",
+        ),
+        QueryData(
+            QUERY_TEXT="SELECT column1 FROM table1 WHERE id = 1",
+            START_TIME="2024-06-22 17:18:00.000 +0200",
+            END_TIME="2024-06-22 17:18:01.000 +0200",
+        ),
+        QueryData(
+            QUERY_TEXT="SELECT column1 FROM table1 WHERE id = 2",
+            START_TIME="2024-06-22 17:19:00.000 +0200",
+            END_TIME="2024-06-22 17:19:02.000 +0200",
+        ),
+    ]
+
+
+def test_parse_timestamps():
+    parsed = parse_timestamps(
+        ["2024-06-22 17:17:34.245 +0200", "2021-01-01T00:00:00", "2024-06-22 17:17:34.245 +0200"]
+    )
+
+    assert parsed.tolist() == np.array(
+        ["2024-06-22T15:17:34.245", "2021-01-01T00:00:00.000", "2024-06-22T15:17:34.245"],
+        dtype="datetime64[ms]",
+    ).tolist()
+
+
+def test_get_time_spent(snowflake_query_data, benchmark):
+    time_spent = benchmark(lambda: get_time_spent(snowflake_query_data))
+
+    assert time_spent == pytest.approx(
+        {
+            "SELECT column1 FROM table1 WHERE id = 2": 2.0,
+            "SELECT column1 FROM table1 WHERE id = 1": 1.32,
+        }
+    )
+    assert list(time_spent) == [
+        "SELECT column1 FROM table1 WHERE id = 2",
+        "SELECT column1 FROM table1 WHERE id = 1",
+    ]
+
+
+def test_get_query_costs(snowflake_query_data):
+    costs = get_query_costs(snowflake_query_data)
+
+    cost = costs["SELECT column1 FROM table1 WHERE id = 1"]
+    assert isinstance(cost, QueryCost)
+    assert cost.count == 2
+    assert [cost.total, cost.mean, cost.p50, cost.p95, cost.max] == pytest.approx(
+        [1.32, 0.66, 0.66, 0.966, 1.0]
+    )
+
+
+def test_get_query_costs_by_fingerprint(snowflake_query_data):
+    costs = get_query_costs(snowflake_query_data, by="fingerprint")
+    durations = [0.32, 1.0, 2.0]
+
+    assert list(costs) == ["select column1 from table1 where id = ?"]
+    cost = costs["select column1 from table1 where id = ?"]
+    assert cost.count == 3
+    assert cost.total == pytest.approx(sum(durations))
+    assert cost.p50 == pytest.approx(np.percentile(durations, 50))
+    assert cost.p95 == pytest.approx(np.percentile(durations, 95))
+    assert cost.max == 2.0
+
+
+def test_get_query_costs_scale(benchmark):
+    start = np.datetime64("2024-01-01T00:00:00.000")
+    queries = [
+        QueryData(
+            QUERY_TEXT=f"SELECT column1 FROM table{i % 1_000}",
+            START_TIME=str(start + np.timedelta64(i, "s")),
+            END_TIME=str(start + np.timedelta64(i * 1000 + i % 7, "ms")),
+        )
+        for i in range(200_000)
+    ]
+
+    costs = benchmark.pedantic(get_query_costs, args=(queries,), rounds=1)
+
+    assert len(costs) == 1_000
+    assert sum(cost.count for cost in costs.values()) == 200_000
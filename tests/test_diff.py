@@ -0,0 +1,125 @@
+import copy
+import io
+
+from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.engine import diff as diff_module
+from sqlprunr.engine.diff import (
+    SchemaDiff,
+    apply_diff,
+    diff_databases,
+    diff_schema_csv,
+    diff_schema_data,
+    table_hashes,
+)
+from sqlprunr.data.query_data import Frequencies
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData
+from sqlprunr.engine.store import FrequencyStore
+from tests.generators import gen_schema_rows
+
+HEADER = "DATABASE_NAME,SCHEMA_NAME,TABLE_NAME,COLUMN_NAME,DATA_TYPE\n"
+
+
+def changed(database: Database) -> Database:
+    database = copy.deepcopy(database)
+    table1, table2 = database.schemas[0].tables
+    table1.columns = [Column("column1", "VARCHAR"), Column("column4", "DATE")]
+    database.schemas[0].tables = [table1]
+    database.add_schema(Schema("schema2", [Table("table3", [Column("column1", "TEXT")])]))
+    return database
+
+
+def test_diff_databases(database):
+    diff = diff_databases([database], [changed(database)])
+
+    assert diff == SchemaDiff(
+        added_tables={("db1", "schema2", "table3"): [("column1", "TEXT")]},
+        dropped_tables=[("db1", "schema1", "table2")],
+        added_columns={("db1", "schema1", "table1"): [("column4", "DATE")]},
+        dropped_columns={("db1", "schema1", "table1"): ["column2"]},
+        retyped_columns={("db1", "schema1", "table1"): [("column1", "TEXT", "VARCHAR")]},
+    )
+    assert diff.changed_tables() == {("db1", "schema1", "table1")}
+    assert not diff_databases([database], [copy.deepcopy(database)])
+
+
+def test_apply_diff(database):
+    new = changed(database)
+
+    databases = apply_diff([copy.deepcopy(database)], diff_databases([database], [new]))
+
+    assert databases == [new]
+    assert databases[0].schemas[0].get_table("table2") is None
+    table = databases[0].schemas[0].get_table("table1")
+    assert table.get_column("column4") == Column("column4", "DATE")
+
+
+def test_diff_schema_csv(database):
+    old = HEADER + "db1,schema1,table1,column1,TEXT\ndb1,schema1,table1,column2,NUMBER\n"
+    new = HEADER + "db1,schema1,table1,column1,TEXT\ndb1,schema1,table2,column3,NUMBER\n"
+
+    diff = diff_schema_csv(io.StringIO(old), io.StringIO(new))
+
+    assert diff.added_tables == {("db1", "schema1", "table2"): [("column3", "NUMBER")]}
+    assert diff.dropped_columns == {("db1", "schema1", "table1"): ["column2"]}
+
+
+def test_table_hashes(database):
+    hashes = table_hashes([database])
+    reordered = copy.deepcopy(database)
+    reordered.schemas[0].tables[0].columns.reverse()
+
+    assert hashes == table_hashes([copy.deepcopy(database)])
+    # Reordered columns are not a change
+    assert table_hashes([reordered]) == hashes
+    assert not diff_databases([database], [reordered])
+    assert hashes != table_hashes([changed(database)])
+
+
+def test_diff_precomputed_hashes(database, monkeypatch):
+    new = changed(database)
+    old_hashes, new_hashes = table_hashes([database]), table_hashes([new])
+    expected = diff_databases([database], [new])
+
+    hashed = []
+    content_hash = diff_module._content_hash
+    monkeypatch.setattr(
+        diff_module, "_content_hash", lambda columns: hashed.append(columns) or content_hash(columns)
+    )
+
+    diff = diff_databases([database], [new], old_hashes=old_hashes, new_hashes=new_hashes)
+    assert diff == expected
+    assert hashed == []
+    # Tables missing in the hashes are hashed on the fly, only table1 is in both snapshots
+    assert diff_databases([database], [new], old_hashes=old_hashes) == expected
+    assert len(hashed) == 1
+
+
+def test_store_apply_diff(database, query_data):
+    with FrequencyStore() as store:
+        store.add(query_data)
+        store.merge(
+            Frequencies(
+                tables={}, columns={}, queries={}, table_columns={"DB1.SCHEMA1.TABLE1": {"COLUMN2": 1}}
+            ),
+            "2021-01-01",
+        )
+
+        store.apply_diff(diff_databases([database], [changed(database)]))
+
+        assert store.tables == {"db1.schema1.table1": 2}
+        assert store.table_columns == {"db1.schema1.table1": {"column1": 1}}
+
+
+def test_diff_large_account():
+    old = gen_schema_rows(10_000)
+    new = list(old)
+    # Drop a table, retype a column and add a table
+    del new[:20]
+    new[500] = SnowflakeCSVData(*[*vars(new[500]).values()][:4], "VARIANT")
+    new.append(SnowflakeCSVData("NEW", "SCHEMA0", "TABLE0", "id", "NUMBER"))
+
+    diff = diff_schema_data(old, new)
+
+    assert diff.dropped_tables == [("DB0", "SCHEMA0", "TABLE0")]
+    assert len(diff.retyped_columns) == 1
+    assert diff.added_tables == {("NEW", "SCHEMA0", "TABLE0"): [("id", "NUMBER")]}
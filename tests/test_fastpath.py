@@ -0,0 +1,212 @@
+import random
+import re
+import time
+import typing
+
+import pytest
+from sql_metadata import Parser
+
+from sqlprunr.engine.fastpath import _SQL_KEYWORDS, extract_simple
+
+NAMES = ["a", "b", "col1", "user_id", "amount", "created_at", "status", "x", "t", "t2"]
+TABLES = ["t", "t2", "orders", "db1.schema1.table1", "schema1.orders", "DB.PUBLIC.ORDERS"]
+ALIASES = ["", " x", " AS x", " t2", " o"]
+LITERALS = ["1", "-2", "3.5", "'abc'", "'it''s'", "NULL", "TRUE", "?", ":p", "1e3"]
+OPERATORS = ["=", "<>", "!=", "<", ">=", "LIKE"]
+
+
+def gen_column(rng: random.Random, qualifiers: typing.List[str]) -> str:
+    name = rng.choice(NAMES)
+    if qualifiers and rng.random() < 0.3:
+        return f"{rng.choice(qualifiers)}.{name}"
+    return name
+
+
+def gen_predicate(rng: random.Random, qualifiers: typing.List[str]) -> str:
+    column = gen_column(rng, qualifiers)
+    not_ = "NOT " if rng.random() < 0.5 else ""
+    r = rng.random()
+    if r < 0.4:
+        value = rng.choice(LITERALS + [gen_column(rng, qualifiers)])
+        return f"{column} {rng.choice(OPERATORS)} {value}"
+    if r < 0.55:
+        return f"{column} IS {not_}NULL"
+    if r < 0.7:
+        values = ", ".join(rng.choice(LITERALS + NAMES) for _ in range(rng.randint(1, 3)))
+        return f"{column} {not_}IN ({values})"
+    if r < 0.8:
+        return f"{column} BETWEEN {rng.choice(LITERALS)} AND {rng.choice(LITERALS)}"
+    if r < 0.9:
+        return f"NOT {column} = {rng.choice(LITERALS)}"
+    return f"({gen_predicate(rng, qualifiers)} OR {gen_predicate(rng, qualifiers)})"
+
+
+def gen_select(rng: random.Random, table: str) -> str:
+    alias = rng.choice(ALIASES)
+    qualifiers = [alias.split()[-1]] if alias else []
+    qualifiers.append(table.split(".")[-1] if rng.random() < 0.5 else table)
+
+    items = []
+    for _ in range(rng.randint(1, 4)):
+        r = rng.random()
+        if r < 0.1:
+            items.append("*")
+        elif r < 0.2:
+            items.append(f"{qualifiers[0]}.*")
+        elif r < 0.4:
+            as_ = "AS " if rng.random() < 0.5 else ""
+            items.append(f"{gen_column(rng, qualifiers)} {as_}{rng.choice(NAMES)}")
+        else:
+            items.append(gen_column(rng, qualifiers))
+
+    distinct = "DISTINCT " if rng.random() < 0.1 else ""
+    query = f"SELECT {distinct}{', '.join(items)} FROM {table}{alias}"
+    if rng.random() < 0.6:
+        conjunction = f" {rng.choice(['AND', 'OR'])} "
+        query += " WHERE " + conjunction.join(
+            gen_predicate(rng, qualifiers) for _ in range(rng.randint(1, 3))
+        )
+    if rng.random() < 0.2:
+        query += " GROUP BY " + ", ".join(
+            gen_column(rng, qualifiers) for _ in range(rng.randint(1, 2))
+        )
+    if rng.random() < 0.3:
+        query += " ORDER BY " + ", ".join(
+            rng.choice([gen_column(rng, qualifiers), "1"])
+            + rng.choice(["", " ASC", " DESC", " DESC NULLS LAST"])
+            for _ in range(rng.randint(1, 2))
+        )
+    if rng.random() < 0.2:
+        query += f" LIMIT {rng.randint(1, 100)}" + (" OFFSET 5" if rng.random() < 0.3 else "")
+    return query
+
+
+def gen_insert(rng: random.Random, table: str) -> str:
+    columns = [rng.choice(NAMES) for _ in range(rng.randint(1, 3))]
+    column_list = f" ({', '.join(columns)})" if rng.random() < 0.8 else ""
+    rows = ", ".join(
+        "(" + ", ".join(rng.choice(LITERALS) for _ in columns) + ")"
+        for _ in range(rng.randint(1, 3))
+    )
+    return f"INSERT INTO {table}{column_list} VALUES {rows}"
+
+
+def gen_update(rng: random.Random, table: str) -> str:
+    assignments = ", ".join(
+        f"{rng.choice(NAMES)} = {rng.choice(LITERALS + NAMES)}" for _ in range(rng.randint(1, 3))
+    )
+    query = f"UPDATE {table} SET {assignments}"
+    if rng.random() < 0.7:
+        query += " WHERE " + gen_predicate(rng, [])
+    return query
+
+
+def gen_query(rng: random.Random) -> str:
+    table = rng.choice(TABLES)
+    r = rng.random()
+    if r < 0.7:
+        query = gen_select(rng, table)
+    elif r < 0.85:
+        query = gen_insert(rng, table)
+    else:
+        query = gen_update(rng, table)
+
+    if rng.random() < 0.2:
+        query = query.lower()
+    if rng.random() < 0.1:
+        query += ";"
+    return query
+
+
+def parse_with_sql_metadata(query: str):
+    parser = Parser(query, disable_logging=True)
+    return parser.tables, parser.columns
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT column1, column2 FROM table1",
+        "select A, b from DB.S.T where C = 'x' and D > 2 or e <> 3",
+        "SELECT x.a, x.b FROM db.s.t x WHERE x.c = 1 ORDER BY x.d DESC",
+        "SELECT x.* FROM db.s.t AS x",
+        "SELECT a AS b FROM t WHERE b = 1 GROUP BY a LIMIT 10",
+        "SELECT a FROM t WHERE b IS NOT NULL AND c IN (1, 2, 3) AND d BETWEEN 1 AND 2",
+        "INSERT INTO t (a, b) VALUES (1, 'x'), (-2, NULL)",
+        "UPDATE db.s.t SET a = b, c = 'x' WHERE d = 2;",
+    ],
+)
+def test_extract_simple(query):
+    assert extract_simple(query) == parse_with_sql_metadata(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT COUNT(*) FROM t",
+        "SELECT a FROM t JOIN t2 ON t.id = t2.id",
+        "SELECT a FROM t WHERE id IN (SELECT id FROM t2)",
+        'SELECT "a" FROM "t"',
+        "SELECT a FROM t -- comment",
+        "SELECT date FROM t",
+        "WITH c AS (SELECT a FROM t) SELECT a FROM c",
+        "INSERT INTO t2 SELECT a FROM t1",
+    ],
+)
+def test_extract_simple_falls_back(query):
+    assert extract_simple(query) is None
+
+
+def test_sql_keywords_cover_sqlparse():
+    from sqlparse import keywords
+
+    names = set()
+    for name in dir(keywords):
+        if name.startswith("KEYWORDS"):
+            names.update(word for word in getattr(keywords, name) if re.fullmatch(r"\w+", word))
+
+    # Keywords added by a newer sqlparse must be added to the static set as well
+    assert sorted(names - _SQL_KEYWORDS) == []
+
+
+def test_extract_simple_differential():
+    rng = random.Random(0)
+    handled = 0
+    for _ in range(2_000):
+        query = gen_query(rng)
+        result = extract_simple(query)
+        if result is None:
+            continue
+
+        handled += 1
+        assert result == parse_with_sql_metadata(query), query
+
+    assert handled > 1_000
+
+
+def test_extract_simple_speedup(benchmark, capsys):
+    rng = random.Random(1)
+    queries = [query for query in (gen_query(rng) for _ in range(500)) if extract_simple(query)]
+
+    start = time.perf_counter()
+    for query in queries:
+        parse_with_sql_metadata(query)
+    sql_metadata_time = time.perf_counter() - start
+
+    def extract_all():
+        return [extract_simple(query) for query in queries]
+
+    benchmark(extract_all)
+    start = time.perf_counter()
+    extract_all()
+    fast_path_time = time.perf_counter() - start
+
+    with capsys.disabled():
+        print(
+            f"\nFast path report ({len(queries)} simple queries):\n{'-'*30}\n"
+            f"sql_metadata: {sql_metadata_time * 1000:.1f} ms, fast path: {fast_path_time * 1000:.1f} ms "
+            f"({sql_metadata_time / fast_path_time:.0f}x)"
+        )
+
+    # The ratio is reported only, wall-clock timings are too noisy on shared runners to assert
+    benchmark.extra_info["speedup"] = sql_metadata_time / fast_path_time
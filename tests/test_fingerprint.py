@@ -0,0 +1,97 @@
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import analyze_query, get_frequencies
+from sqlprunr.engine.fingerprint import QueryCache, fingerprint_query
+
+
+def test_fingerprint_query(benchmark):
+    query = "SELECT column1,   column2\nFROM db1.schema1.table1 WHERE id = 42 AND name = 'it''s' -- tag"
+
+    fingerprint = benchmark(lambda: fingerprint_query(query))
+
+    assert fingerprint == "select column1, column2 from db1.schema1.table1 where id = ? and name = ?"
+
+
+def test_fingerprint_query_same_template():
+    assert fingerprint_query("select * from t where id in (1, 2, 3)") == fingerprint_query(
+        "SELECT *\n  FROM t WHERE id IN (7)"
+    )
+    assert fingerprint_query("insert into t values (1, 'a'), (2, 'b')") == fingerprint_query(
+        "INSERT INTO t VALUES (3, 'c')"
+    )
+
+
+def test_fingerprint_query_keeps_identifier_case():
+    # The parser returns identifiers as written, queries differing in their case must not
+    # share a cached result
+    assert fingerprint_query("SELECT Col1 FROM Tbl1") == "select Col1 from Tbl1"
+    assert fingerprint_query("SELECT Col1 FROM Tbl1") != fingerprint_query("select col1 from tbl1")
+    assert fingerprint_query("Select Name, Date From Orders") == "select Name, Date from Orders"
+
+
+def test_get_frequencies_order_independent():
+    queries = [QueryData("SELECT Col1 FROM Tbl1", "", ""), QueryData("select col1 from tbl1", "", "")]
+
+    frequencies = get_frequencies(queries, cache=QueryCache())
+    reversed_frequencies = get_frequencies(queries[::-1], cache=QueryCache())
+
+    assert frequencies.tables == reversed_frequencies.tables == {"Tbl1": 1, "tbl1": 1}
+    assert frequencies.columns == reversed_frequencies.columns == {"Col1": 1, "col1": 1}
+
+
+def test_fingerprint_query_keeps_quoted_identifiers():
+    assert fingerprint_query('SELECT "Column1" FROM "Table1"') == 'select "Column1" from "Table1"'
+    assert fingerprint_query("SELECT column1 FROM table1") != fingerprint_query(
+        "SELECT column1 FROM table2"
+    )
+
+
+def test_query_cache_eviction():
+    cache = QueryCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.cache_info() == (2, 1, 2, 2)
+
+
+def test_analyze_query_cache():
+    cache = QueryCache()
+    first = analyze_query(
+        QueryData("SELECT column1 FROM table1 WHERE id = 1", "", ""), cache=cache
+    )
+    second = analyze_query(
+        QueryData("select column1 from table1   where id = 2", "", ""), cache=cache
+    )
+
+    assert first["tables"] == second["tables"] == ["table1"]
+    assert first["columns"] == second["columns"] == ["column1", "id"]
+    assert second["query_ref"] == "select column1 from table1   where id = 2"
+    assert cache.cache_info() == (1, 1, 10_000, 1)
+
+
+def test_get_frequencies_parses_template_once(query_data):
+    cache = QueryCache()
+    repeated = query_data * 10
+
+    frequencies = get_frequencies(repeated, cache=cache)
+
+    assert frequencies.tables == {"db1.schema1.table1": 20, "db1.schema1.table2": 10}
+    assert frequencies.columns == {"column1": 20, "column2": 10}
+    assert cache.misses == len(query_data)
+    assert cache.hits == len(repeated) - len(query_data)
+
+
+def test_get_frequencies_caches_failures():
+    cache = QueryCache()
+    queries = [QueryData("BEGIN", "", ""), QueryData("BEGIN -- transaction", "", "")]
+
+    frequencies = get_frequencies(queries, cache=cache)
+
+    assert frequencies.tables == {}
+    assert sum(frequencies.queries.values()) == 2
+    assert cache.cache_info() == (1, 1, 10_000, 1)
+    # Only the type and arguments of the error are kept, not the exception and its traceback
+    assert not isinstance(cache.get(fingerprint_query("BEGIN")), BaseException)
@@ -0,0 +1,140 @@
+from dataclasses import asdict
+
+import pandas as pd
+import pytest
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import get_frequencies
+from sqlprunr.engine.cost import get_query_costs
+from sqlprunr.engine.frames import get_frequencies_frame, get_time_spent_frame, parse_schema_frame
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVTableParser
+from tests.generators import gen_query_history, gen_schema_rows
+
+
+def to_frame(records) -> pd.DataFrame:
+    return pd.DataFrame([asdict(record) for record in records])
+
+
+def test_parse_schema_frame(database):
+    frame = pd.DataFrame(
+        {
+            "DATABASE_NAME": ["db1", "db1", "db1", "db1"],
+            "SCHEMA_NAME": ["schema1", "schema1", "schema1", "schema1"],
+            "TABLE_NAME": ["table1", "table2", "table1", "table1"],
+            "COLUMN_NAME": ["column1", "column3", "column2", "column1"],
+            "DATA_TYPE": ["TEXT", "NUMBER", "NUMBER", "TEXT"],
+            "ORDINAL_POSITION": [1, 1, 2, 1],
+        }
+    )
+
+    assert parse_schema_frame(frame) == [database]
+    assert parse_schema_frame(frame.iloc[:0]) == []
+
+
+def test_parse_schema_frame_matches_parser():
+    rows = gen_schema_rows(20_000)
+
+    databases = parse_schema_frame(to_frame(rows))
+
+    assert databases == SnowflakeCSVTableParser().parse_table(rows)
+    assert databases[0].schemas[0].tables[0].get_column(rows[0].COLUMN_NAME)
+    # Data types are interned like in the CSV parser
+    columns = [c for d in databases for s in d.schemas for t in s.tables for c in t.columns]
+    assert len({id(c.data_type) for c in columns}) == len({c.data_type for c in columns})
+
+
+def test_parse_schema_frame_missing_columns():
+    with pytest.raises(ValueError, match="DATA_TYPE"):
+        parse_schema_frame(
+            pd.DataFrame({"DATABASE_NAME": [], "SCHEMA_NAME": [], "TABLE_NAME": [], "COLUMN_NAME": []})
+        )
+
+
+def test_parse_schema_frame_missing_values():
+    frame = to_frame(gen_schema_rows(100))
+    frame.loc[3, "TABLE_NAME"] = None
+
+    with pytest.raises(ValueError, match="TABLE_NAME"):
+        parse_schema_frame(frame)
+
+
+def test_get_frequencies_frame(query_data):
+    frames = get_frequencies_frame(to_frame(query_data * 2))
+
+    assert frames.tables.to_dict("records") == [
+        {"TABLE": "db1.schema1.table1", "COUNT": 4},
+        {"TABLE": "db1.schema1.table2", "COUNT": 2},
+    ]
+    assert frames.table_columns.columns.tolist() == ["TABLE", "COLUMN", "COUNT"]
+    assert frames.queries["COUNT"].tolist() == [2, 2, 2]
+    assert frames.to_frequencies() == get_frequencies(query_data * 2)
+
+
+def test_get_frequencies_frame_matches_rows():
+    queries = gen_query_history(5_000, tables=100, templates=200, seed=3)
+    queries.append(QueryData("BEGIN; SELECT a FROM t; SELECT a FROM t", "2021-01-01", "2021-01-01"))
+
+    frames = get_frequencies_frame(to_frame(queries))
+
+    assert frames.to_frequencies() == get_frequencies(queries)
+    assert get_frequencies_frame(to_frame(queries), columns=False).columns.empty
+
+
+def test_get_time_spent_frame(query_data):
+    frame = to_frame(query_data * 2)
+
+    costs = get_time_spent_frame(frame)
+
+    assert costs.columns.tolist() == ["QUERY_TEXT", "COUNT", "TOTAL", "MEAN", "P50", "P95", "MAX"]
+    assert costs.to_dict("list") == {
+        "QUERY_TEXT": list(get_query_costs(query_data * 2)),
+        **{
+            column.upper(): [getattr(cost, column) for cost in get_query_costs(query_data * 2).values()]
+            for column in ("count", "total", "mean", "p50", "p95", "max")
+        },
+    }
+
+
+def test_frames_missing_query_text(query_data):
+    frame = to_frame(query_data)
+    frame.loc[1, "QUERY_TEXT"] = None
+    rows = [query_data[0], query_data[2]]
+
+    assert get_frequencies_frame(frame).to_frequencies() == get_frequencies(rows)
+    assert get_time_spent_frame(frame)["QUERY_TEXT"].tolist() == list(get_query_costs(rows))
+
+
+def test_get_time_spent_frame_datetimes():
+    start_times = ["2024-06-22 17:17:34.245", "2024-06-22 17:18:00", "2024-06-22 17:19:00"]
+    end_times = ["2024-06-22 15:17:34.565", "2024-06-22 15:18:01", "2024-06-22 15:19:02"]
+    frame = pd.DataFrame(
+        {
+            "QUERY_TEXT": ["SELECT 1", "SELECT 2", "SELECT 1"],
+            "START_TIME": pd.to_datetime(start_times, format="ISO8601").tz_localize("Europe/Warsaw"),
+            "END_TIME": pd.to_datetime(end_times, format="ISO8601").tz_localize("UTC"),
+        }
+    )
+
+    costs = get_time_spent_frame(frame, by="fingerprint")
+
+    assert costs.to_dict("records") == [
+        {
+            "FINGERPRINT": "select ?",
+            "COUNT": 3,
+            "TOTAL": pytest.approx(3.32),
+            "MEAN": pytest.approx(3.32 / 3),
+            "P50": 1.0,
+            "P95": pytest.approx(1.9),
+            "MAX": 2.0,
+        }
+    ]
+    with pytest.raises(ValueError):
+        get_time_spent_frame(frame, by="user")
+
+
+def test_get_frequencies_frame_benchmark(query_data, benchmark):
+    frame = to_frame(query_data * 1_000)
+
+    frames = benchmark(get_frequencies_frame, frame)
+
+    assert frames.tables["COUNT"].sum() == 3_000
@@ -0,0 +1,113 @@
+from dataclasses import asdict
+import pickle
+from types import SimpleNamespace
+import tracemalloc
+import typing
+
+import pytest
+
+from sqlprunr.data.generic import Column, Schema, Table
+from sqlprunr.engine.parser import builder
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData, SnowflakeCSVTableParser
+
+
+def gen_csv_data(n: int) -> typing.Iterator[SnowflakeCSVData]:
+    for i in range(n):
+        yield SnowflakeCSVData(
+            DATABASE_NAME="db1",
+            SCHEMA_NAME="schema1",
+            TABLE_NAME=f"table{i // 100}",
+            COLUMN_NAME=f"column{i % 100}",
+            # Every CSV row carries its own copy of the data type
+            DATA_TYPE="".join(["VARCHAR(", "16777216", ")"]),
+        )
+
+
+def bytes_per_column(build: typing.Callable, n: int) -> float:
+    tracemalloc.start()
+    result = build(gen_csv_data(n))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / n
+
+
+def test_database_lookup(database):
+    schema = database.get_schema("schema1")
+    table = schema.get_table("table2")
+
+    assert schema is database.schemas[0]
+    assert table is schema.tables[1]
+    assert table.get_column("column3") == Column(name="column3", data_type="NUMBER")
+    assert database.get_schema("schema2") is None
+    assert schema.get_table("table3") is None
+    assert table.get_column("column1") is None
+
+
+def test_database_add(database):
+    schema = database.add_schema(Schema(name="schema2", tables=[]))
+    table = schema.add_table(Table(name="table3", columns=[]))
+    table.add_column(Column(name="column1", data_type="TEXT"))
+
+    assert database.get_schema("schema2") is schema
+    assert schema.get_table("table3") is table
+    assert table.column_position("column1") == 0
+
+    with pytest.raises(ValueError):
+        table.add_column(Column(name="column1", data_type="NUMBER"))
+
+
+def test_index_follows_list_changes(database):
+    table = database.schemas[0].tables[0]
+    assert table.column_position("column2") == 1
+
+    table.columns.append(Column(name="column4", data_type="TEXT"))
+    assert table.column_position("column4") == 2
+
+    table.columns = [Column(name="column5", data_type="TEXT")]
+    assert table.get_column("column1") is None
+    assert table.column_position("column5") == 0
+
+
+def test_index_follows_in_place_changes(database):
+    table = database.schemas[0].tables[0]
+    assert table.column_position("column2") == 1
+
+    table.columns[1] = Column(name="column3", data_type="TEXT")
+    assert table.get_column("column2") is None
+    assert table.column_position("column3") == 1
+
+    del table.columns[0]
+    table.columns.append(Column(name="column4", data_type="TEXT"))
+    assert table.get_column("column1") is None
+    assert table.column_position("column3") == 0
+    assert table.column_position("column4") == 1
+
+
+def test_schema_tree_serialization(database):
+    assert asdict(database)["schemas"][0]["tables"][1] == {
+        "name": "table2",
+        "columns": [{"name": "column3", "data_type": "NUMBER"}],
+    }
+
+    restored = pickle.loads(pickle.dumps(database))
+    assert restored == database
+    assert restored.get_schema("schema1").get_table("table1").get_column("column2").data_type == "NUMBER"
+
+
+def test_schema_tree_memory(capsys, monkeypatch):
+    n = 100_000
+    parser = SnowflakeCSVTableParser()
+    after = bytes_per_column(parser.parse_table, n)
+    # The same tree built without interning, every column keeps its own copy of the data type
+    monkeypatch.setattr(builder, "sys", SimpleNamespace(intern=lambda value: value))
+    before = bytes_per_column(parser.parse_table, n)
+
+    with capsys.disabled():
+        print(
+            f"\nSchema tree memory report ({n} columns):\n{'-'*30}\n"
+            f"Parsed schema tree without interning: {before:.1f} bytes/column\n"
+            f"Parsed schema tree with interning: {after:.1f} bytes/column"
+        )
+
+    assert after < before
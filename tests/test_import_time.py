@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import sqlprunr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must not be imported until a function that needs them runs
+HEAVY = (
+    "numpy",
+    "pandas",
+    "matplotlib",
+    "seaborn",
+    "plotly",
+    "graphviz",
+    "sql_metadata",
+    "sqlparse",
+    "multiprocessing",
+    "asyncio",
+)
+
+
+def _importtime(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    # import time: self [us] | cumulative | imported package
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import sqlprunr",
+        "import sqlprunr; sqlprunr.get_frequencies, sqlprunr.find_unused_tables, sqlprunr.read_query_data",
+        "import sqlprunr.engine.analyzer, sqlprunr.engine.parser, sqlprunr.engine.resolver",
+        "import sqlprunr.cli",
+    ],
+)
+def test_heavy_dependencies_are_deferred(code):
+    modules = _importtime(code)
+
+    assert "sqlprunr" in modules
+    assert [name for name in HEAVY if name in modules] == []
+
+
+def test_visualizer_defers_plotting():
+    modules = _importtime("import sqlprunr.engine.visualizer")
+
+    assert not {"matplotlib", "seaborn", "plotly", "graphviz"} & modules.keys()
+
+
+def test_fast_path_defers_sql_parsers():
+    code = """
+import sys
+from sqlprunr import QueryData, get_frequencies
+frequencies = get_frequencies([QueryData("SELECT a FROM t", "", "")])
+assert frequencies.tables == {"t": 1}, frequencies
+assert "sqlparse" not in sys.modules and "sql_metadata" not in sys.modules
+"""
+    modules = _importtime(code)
+
+    assert "sqlprunr.engine.fastpath" in modules
+    assert not {"sqlparse", "sql_metadata"} & modules.keys()
+
+
+def test_import_time(benchmark):
+    def run():
+        return _importtime("import sqlprunr.engine.analyzer")
+
+    modules = benchmark.pedantic(run, rounds=5)
+    benchmark.extra_info["sqlprunr_us"] = modules["sqlprunr"]
+    benchmark.extra_info["analyzer_us"] = modules["sqlprunr.engine.analyzer"]
+
+
+def test_lazy_api():
+    from sqlprunr.engine.analyzer import get_frequencies
+
+    assert sqlprunr.get_frequencies is get_frequencies
+    assert set(sqlprunr.__all__) <= set(dir(sqlprunr))
+    for name in sqlprunr.__all__:
+        assert getattr(sqlprunr, name) is not None
+    with pytest.raises(AttributeError):
+        sqlprunr.missing
@@ -0,0 +1,112 @@
+import subprocess
+import sys
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import find_unused_tables, get_frequencies
+from sqlprunr.engine.fingerprint import QueryCache
+from sqlprunr.engine.instrumentation import Instrumentation, get_instrumentation, instrument
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData, SnowflakeCSVTableParser
+
+
+def test_instrumentation_disabled_by_default():
+    assert get_instrumentation() is None
+
+
+def test_instrument_get_frequencies(query_data, database):
+    queries = query_data * 10 + [
+        QueryData("BEGIN; SELECT column1 FROM table1 WHERE x = 1; COMMIT", "", ""),
+        QueryData("COMMIT", "", ""),
+    ]
+
+    with instrument(Instrumentation(slowest=3)) as instrumentation:
+        frequencies = get_frequencies(queries, cache=QueryCache())
+        find_unused_tables(frequencies, database)
+    assert get_instrumentation() is None
+
+    # The second COMMIT is a cached failure
+    assert instrumentation.counters == {
+        "parsed": 4,
+        "fast_path": 4,
+        "cached": 28,
+        "failed": 3,
+        "skipped": 1,
+    }
+    stages = instrumentation.to_dict()["stages"]
+    assert stages["analyze"]["count"] == 32
+    assert stages["parse"]["count"] == 4
+    assert stages["find_unused_tables"]["count"] == 1
+    assert stages["analyze"]["max_seconds"] >= stages["analyze"]["mean_seconds"]
+
+    slowest = instrumentation.slowest_queries()
+    assert len(slowest) == 3
+    assert [seconds for _, seconds in slowest] == sorted(
+        (seconds for _, seconds in slowest), reverse=True
+    )
+
+
+def test_instrument_workers(query_data):
+    queries = query_data * 50
+
+    with instrument() as instrumentation:
+        get_frequencies(queries, workers=2, chunksize=10)
+
+    counters = instrumentation.counters
+    assert counters["parsed"] + counters["cached"] == 150
+    assert instrumentation.to_dict()["stages"]["analyze"]["count"] == 150
+    assert instrumentation.to_dict()["stages"]["merge"]["count"] == 15
+
+
+def test_instrument_parse_schema():
+    rows = [SnowflakeCSVData("db1", "schema1", "table1", f"column{i}", "TEXT") for i in range(10)]
+
+    with instrument() as instrumentation:
+        SnowflakeCSVTableParser().parse_table(rows)
+
+    assert instrumentation.to_dict()["stages"]["parse_schema"]["count"] == 1
+
+
+def test_instrumentation_merge():
+    first = Instrumentation(slowest=2)
+    first.increment("parsed", 2)
+    first.observe_query("a", 1.0)
+    first.observe_query("b", 3.0)
+    second = Instrumentation(slowest=2)
+    second.increment("parsed")
+    second.increment("failed")
+    second.observe_query("c", 2.0)
+
+    first.merge(second)
+
+    assert first.counters == {"parsed": 3, "failed": 1}
+    assert first.stages["analyze"] == [3, 6.0, 3.0]
+    assert first.slowest_queries() == [("b", 3.0), ("c", 2.0)]
+
+
+def test_to_prometheus():
+    instrumentation = Instrumentation()
+    instrumentation.increment("parsed", 5)
+    instrumentation.record("parse", 0.5)
+    instrumentation.record("parse", 0.25)
+
+    text = instrumentation.to_prometheus()
+
+    assert "# TYPE sqlprunr_stage_seconds_total counter\n" in text
+    assert 'sqlprunr_stage_seconds_total{stage="parse"} 0.75\n' in text
+    assert 'sqlprunr_stage_runs_total{stage="parse"} 2\n' in text
+    assert 'sqlprunr_stage_max_seconds{stage="parse"} 0.5\n' in text
+    assert 'sqlprunr_events_total{event="parsed"} 5\n' in text
+
+
+def test_import_does_not_configure_logging():
+    code = "import logging, sqlprunr.engine.analyzer; assert not logging.getLogger().handlers"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_get_frequencies_instrumented(query_data, benchmark):
+    queries = query_data * 1_000
+    cache = QueryCache()
+
+    with instrument() as instrumentation:
+        benchmark(lambda: get_frequencies(queries, cache=cache))
+
+    assert instrumentation.counters["cached"] > 0
@@ -0,0 +1,104 @@
+import random
+import time
+
+import pytest
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.lineage import TableGraph, analyze_lineage, build_table_graph
+
+
+@pytest.mark.parametrize(
+    "statement, tables, target",
+    [
+        ("SELECT a FROM t1 JOIN t2 ON t1.id = t2.id", ["t1", "t2"], None),
+        ("INSERT INTO db.s.t1 (a) SELECT a FROM db.s.t2", ["db.s.t1", "db.s.t2"], "db.s.t1"),
+        ('INSERT INTO "My".t1 SELECT * FROM t2', ["My.t1", "t2"], "My.t1"),
+        ("UPDATE t1 SET b = t2.b FROM t2 WHERE t1.a = t2.a", ["t1", "t2"], "t1"),
+        ("CREATE OR REPLACE TRANSIENT TABLE x.y AS SELECT a FROM t2 JOIN t3 ON t2.a = t3.a", ["x.y", "t2", "t3"], "x.y"),
+        ("CREATE TABLE x (a INT) AS (SELECT a FROM t2)", ["x", "t2"], "x"),
+        ("CREATE TABLE x (a INT)", ["x"], "x"),
+        ("MERGE INTO t1 USING t2 ON t1.a = t2.a WHEN MATCHED THEN UPDATE SET t1.b = t2.b", ["t1", "t2"], "t1"),
+        ("MERGE INTO t1 USING (SELECT a FROM t2 WHERE (a > 1)) s ON t1.a = s.a", ["t1", "t2"], "t1"),
+    ],
+)
+def test_analyze_lineage(statement, tables, target):
+    assert analyze_lineage(statement) == (tables, target)
+
+
+@pytest.fixture
+def graph():
+    return build_table_graph(
+        [
+            QueryData("INSERT INTO staging.orders SELECT * FROM raw.orders", "", ""),
+            QueryData(
+                "CREATE TABLE mart.revenue AS SELECT o.amount FROM staging.orders o JOIN staging.fx f ON o.c = f.c; "
+                "INSERT INTO mart.report SELECT * FROM mart.revenue",
+                "",
+                "",
+            ),
+            QueryData("SELECT a FROM staging.orders JOIN staging.fx ON 1 = 1", "", ""),
+            QueryData("BEGIN", "", ""),
+        ]
+    )
+
+
+def test_table_graph(graph):
+    assert len(graph) == 5
+    assert graph.downstream("RAW.ORDERS") == ["staging.orders", "mart.revenue", "mart.report"]
+    assert graph.upstream("mart.report") == ["mart.revenue", "staging.orders", "staging.fx", "raw.orders"]
+    assert graph.reachable("staging.fx", "mart.report")
+    assert not graph.reachable("mart.report", "staging.fx")
+    assert graph.co_accessed("staging.orders") == {"staging.fx": 2, "raw.orders": 1, "mart.revenue": 1}
+    assert graph.downstream("missing") == []
+
+
+def test_table_graph_incremental(graph):
+    graph.downstream("raw.orders")
+    other = TableGraph()
+    other.add_statement(["mart.report", "export.report"], target="export.report", count=3)
+
+    graph.merge(other)
+
+    assert graph.downstream("raw.orders")[-1] == "export.report"
+    indptr, indices, counts = graph.to_csr()
+    assert indptr[-1] == len(indices) == len(counts) == 5
+    assert counts.sum() == 7
+
+
+def test_table_graph_large(capsys):
+    # Layered lineage of 100k tables, every table is written from two tables of the previous layer
+    rng = random.Random(0)
+    graph = TableGraph()
+    layer = 10_000
+    for node in range(layer, 100_000):
+        base = (node // layer - 1) * layer
+        graph.add_statement(
+            [f"t{node}", f"t{base + rng.randrange(layer)}", f"t{base + rng.randrange(layer)}"],
+            target=f"t{node}",
+        )
+    graph.to_csr()
+    graph.to_csr("upstream")
+
+    start = time.perf_counter()
+    for node in range(90_000, 90_100):
+        graph.upstream(f"t{node}")
+    upstream_time = (time.perf_counter() - start) / 100
+
+    start = time.perf_counter()
+    for node in range(0, 100):
+        graph.reachable(f"t{node}", f"t{node + layer}")
+    reachable_time = (time.perf_counter() - start) / 100
+
+    with capsys.disabled():
+        print(
+            f"\nTable graph (100k tables):\n{'-'*30}\n"
+            f"upstream: {upstream_time * 1000:.3f} ms, reachable: {reachable_time * 1000:.3f} ms"
+        )
+
+    assert len(graph.downstream("t0")) > 100
+
+
+def test_table_graph_downstream_benchmark(graph, benchmark):
+    result = benchmark(graph.downstream, "raw.orders")
+
+    assert result == ["staging.orders", "mart.revenue", "mart.report"]
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from sqlprunr.data.loaders import read_csv, read_query_data
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import get_frequencies
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVData, SnowflakeCSVTableParser
+
+
+@pytest.fixture
+def query_csv(tmp_path):
+    path = tmp_path / "queries.csv"
+    path.write_text(
+        "QUERY_TEXT,START_TIME,END_TIME,WAREHOUSE_NAME\n"
+        '"SELECT column1\nFROM db1.schema1.table1",2021-01-01T00:00:00,2021-01-01T00:01:00,WH\n'
+        '"SELECT column2 FROM db1.schema1.table1",2021-01-01T00:01:00,2021-01-01T00:02:00,WH\n'
+    )
+    return path
+
+
+def test_read_query_data(query_csv):
+    records = read_query_data(query_csv)
+
+    assert next(records) == QueryData(
+        QUERY_TEXT="SELECT column1\nFROM db1.schema1.table1",
+        START_TIME="2021-01-01T00:00:00",
+        END_TIME="2021-01-01T00:01:00",
+    )
+    assert len(list(records)) == 1
+
+
+def test_read_csv_file_object():
+    f = io.StringIO(
+        "DATABASE_NAME,SCHEMA_NAME,TABLE_NAME,COLUMN_NAME,DATA_TYPE\n"
+        "db1,schema1,table1,column1,TEXT\n"
+        "db1,schema1,table1,column2,NUMBER\n"
+    )
+
+    databases = SnowflakeCSVTableParser().parse_table(read_csv(f, SnowflakeCSVData))
+
+    assert [column.name for column in databases[0].schemas[0].tables[0].columns] == [
+        "column1",
+        "column2",
+    ]
+
+
+def test_read_csv_missing_columns():
+    with pytest.raises(ValueError):
+        list(read_query_data(io.StringIO("QUERY_TEXT\nSELECT 1\n")))
+
+
+def test_get_frequencies_from_stream(query_csv):
+    frequencies = get_frequencies(read_query_data(query_csv))
+
+    assert frequencies.tables == {"db1.schema1.table1": 2}
+    assert frequencies.columns == {"column1": 1, "column2": 1}
@@ -0,0 +1,136 @@
+from dataclasses import asdict, astuple
+import io
+
+import pytest
+
+from sqlprunr.engine.parser import dialects
+from sqlprunr.engine.parser.dialects import (
+    BIGQUERY,
+    POSTGRES,
+    REDSHIFT,
+    SNOWFLAKE,
+    Dialect,
+    available_dialects,
+    get_dialect,
+    get_parser,
+    register_dialect,
+)
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVTableParser
+from sqlprunr.engine.resolver import TableResolver
+from tests.generators import gen_schema_rows
+
+POSTGRES_CSV = '''table_catalog,table_schema,table_name,column_name,data_type
+shop,public,orders,id,integer
+shop,public,orders,total,numeric
+shop,public,"""Customers""",id,integer
+shop,audit,log,id,bigint
+'''
+
+
+def test_available_dialects():
+    assert {"snowflake", "postgres", "redshift", "bigquery"} <= set(available_dialects())
+    assert get_dialect("Snowflake") is SNOWFLAKE
+    with pytest.raises(ValueError, match="Unknown dialect"):
+        get_dialect("oracle")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # Dialects registered by a test do not leak into the global registry
+    monkeypatch.setattr(dialects, "_DIALECTS", dict(dialects._DIALECTS))
+
+
+def test_register_dialect(registry):
+    dialect = register_dialect(Dialect("duckdb", fold_case="lower"))
+    assert get_dialect("duckdb") is dialect
+    assert get_parser("duckdb").dialect is dialect
+
+
+def test_parse_csv_postgres():
+    databases = get_parser("postgres").parse_csv(io.StringIO(POSTGRES_CSV))
+    assert [database.name for database in databases] == ["shop"]
+    public, audit = databases[0].schemas
+    assert [table.name for table in public.tables] == ["orders", "Customers"]
+    assert [column.name for column in public.tables[0].columns] == ["id", "total"]
+    assert audit.tables[0].columns[0].data_type == "bigint"
+
+
+def test_parse_table_mappings():
+    rows = [
+        {"project_id": "proj", "dataset_id": "sales", "TABLE_NAME": "Orders", "column_name": "Id", "data_type": "INT64"},
+        {"project_id": "proj", "dataset_id": "sales", "TABLE_NAME": "Orders", "column_name": "Id", "data_type": "INT64"},
+        {"project_id": "proj", "dataset_id": "sales", "TABLE_NAME": "Items", "column_name": "Sku", "data_type": "STRING"},
+    ]
+    databases = get_parser("bigquery").parse_table(rows)
+    tables = databases[0].schemas[0].tables
+    assert [table.name for table in tables] == ["Orders", "Items"]
+    assert len(tables[0].columns) == 1
+    assert get_parser("bigquery").parse_table([]) == []
+
+
+def test_missing_column():
+    with pytest.raises(ValueError, match="data_type"):
+        get_parser("postgres").parse_csv(io.StringIO("table_catalog,table_schema,table_name,column_name\n"))
+
+
+def test_snowflake_dialect_matches_snowflake_parser():
+    rows = gen_schema_rows(2_000, seed=3)
+    records = [asdict(row) for row in rows]
+    assert get_parser("snowflake").parse_table(records) == SnowflakeCSVTableParser().parse_table(rows)
+
+
+@pytest.mark.parametrize(
+    "dialect, reference, expected",
+    [
+        (SNOWFLAKE, 'db.public."Orders"', ["DB", "PUBLIC", "Orders"]),
+        (SNOWFLAKE, '"a.b".c', ["a.b", "C"]),
+        (POSTGRES, 'Shop.Public."Orders"', ["shop", "public", "Orders"]),
+        (REDSHIFT, 'Shop."Orders"', ["shop", "orders"]),
+        (BIGQUERY, "`proj.Sales.Orders`", ["proj", "Sales", "Orders"]),
+        (BIGQUERY, "`my-proj`.Sales.Orders", ["my-proj", "Sales", "Orders"]),
+    ],
+)
+def test_split_reference(dialect, reference, expected):
+    assert dialect.split_reference(reference) == expected
+
+
+def test_resolver_with_dialect():
+    databases = get_parser("snowflake").parse_table(
+        [
+            {"DATABASE_NAME": "DB", "SCHEMA_NAME": "PUBLIC", "TABLE_NAME": name, "COLUMN_NAME": "ID", "DATA_TYPE": "NUMBER"}
+            for name in ("ORDERS", "Orders")
+        ]
+    )
+    resolver = TableResolver(databases, dialect=SNOWFLAKE)
+    assert resolver.resolve("db.public.orders") == [("DB", "PUBLIC", "ORDERS")]
+    assert resolver.resolve('public."Orders"') == [("DB", "PUBLIC", "Orders")]
+    assert resolver.resolve('"orders"') == []
+
+    # Without a dialect names are matched case-insensitively
+    assert len(TableResolver(databases)) == 1
+
+
+def test_resolver_with_dialect_unquoted_by_parser():
+    databases = get_parser("snowflake").parse_table(
+        [{"DATABASE_NAME": "DB", "SCHEMA_NAME": "PUBLIC", "TABLE_NAME": "Orders", "COLUMN_NAME": "Id", "DATA_TYPE": "NUMBER"}]
+    )
+    resolver = TableResolver(databases, dialect=SNOWFLAKE)
+    key = ("DB", "PUBLIC", "Orders")
+
+    # The parser returns db.public."Orders" as db.public.Orders
+    assert resolver.unused({"db.public.Orders": 1}) == []
+    assert resolver.resolve("public.orders") == [key]
+    assert resolver.resolve('db.public."ORDERS"') == []
+    assert resolver.column_position(key, "Id") == 0
+    assert resolver.column_position(key, "id") == 0
+    assert resolver.column_position(key, '"ID"') is None
+
+
+def test_parse_csv_speed(benchmark):
+    header = "table_catalog,table_schema,table_name,column_name,data_type\n"
+    rows = gen_schema_rows(20_000, seed=1)
+    content = header + "".join(",".join(astuple(row)) + "\n" for row in rows)
+    parser = get_parser("postgres")
+
+    databases = benchmark(lambda: parser.parse_csv(io.StringIO(content)))
+    assert databases == SnowflakeCSVTableParser().parse_table(rows)
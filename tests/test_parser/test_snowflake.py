@@ -58,3 +58,22 @@ def test_snowflake_parse_table(parser, csv_data, benchmark):
     schema2 = databases[0].schemas[1]
     assert schema2.name == "schema2"
     assert len
+
+
+def test_snowflake_parse_wide_table(parser, benchmark):
+    csv_data = [
+        SnowflakeCSVData(
+            DATABASE_NAME="db1",
+            SCHEMA_NAME="schema1",
+            TABLE_NAME="table1",
+            COLUMN_NAME=f"column{n}",
+            DATA_TYPE="VARCHAR(16777216)",
+        )
+        for n in range(100_000)
+    ]
+
+    databases = benchmark.pedantic(parser.parse_table, args=(csv_data,), rounds=3)
+
+    table = databases[0].schemas[0].tables[0]
+    assert len(table.columns) == 100_000
+    assert table.get_column("column99999").data_type == "VARCHAR(16777216)"
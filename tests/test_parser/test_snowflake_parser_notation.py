@@ -53,3 +53,32 @@ def test_snowflake_parser_notation(parser, rtest_database, capsys):
             f"\nSnowflake parser report ({len(rtest_database)} rows):\n{'-'*30}\n"
             + big_o.reports.big_o_report(best, others)
         )
+
+
+def get_wide_csv_data(n: int) -> typing.List[SnowflakeCSVData]:
+    return [
+        SnowflakeCSVData(
+            DATABASE_NAME="db",
+            SCHEMA_NAME=f"schema{i % 10}",
+            TABLE_NAME=f"table{i % 1_000}",
+            COLUMN_NAME=f"column{i}",
+            DATA_TYPE="VARCHAR(16777216)",
+        ) for i in range(n)
+    ]
+
+
+def test_snowflake_parser_notation_for_fake_data(parser, capsys):
+    MAX_N = 200_000
+    best, others = big_o.big_o(
+        parser.parse_table,
+        get_wide_csv_data,
+        min_n=1_000,
+        max_n=MAX_N,
+        n_measures=10,
+        n_repeats=1,
+    )
+    with capsys.disabled():
+        print(
+            f"\nSnowflake parser report ({MAX_N} dummy rows [10 schemas, 1000 tables, column added every n]):\n{'-'*30}\n"
+            + big_o.reports.big_o_report(best, others)
+        )
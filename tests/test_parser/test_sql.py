@@ -0,0 +1,13 @@
+from sqlprunr.data.generic import Column
+from sqlprunr.engine.parser.sql import SQLTableParser
+
+
+def test_sql_parse_table():
+    tables = SQLTableParser().parse_table(
+        "INSERT INTO table1 (column1, column2) VALUES ('a;b', 1);"
+        "SELECT column3 FROM table2 -- trailing; comment"
+    )
+
+    assert [table.name for table in tables] == ["table1", "table2"]
+    assert tables[0].columns == [Column("column1", ""), Column("column2", "")]
+    assert tables[1].columns == [Column("column3", "")]
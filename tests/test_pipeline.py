@@ -0,0 +1,125 @@
+import asyncio
+
+from sqlprunr.data.loaders import follow_query_data, read_query_stream
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import get_frequencies
+from sqlprunr.engine.pipeline import IngestionPipeline, stream_frequencies
+
+HEADER = "QUERY_TEXT,START_TIME,END_TIME\n"
+
+
+def test_stream_frequencies(query_data):
+    queries = query_data * 100
+
+    frequencies = asyncio.run(stream_frequencies(queries, batch_size=7))
+
+    assert frequencies == get_frequencies(queries)
+
+
+def test_stream_frequencies_workers(query_data):
+    queries = query_data * 100
+
+    frequencies = asyncio.run(stream_frequencies(queries, batch_size=7, workers=2))
+
+    assert frequencies == get_frequencies(queries)
+
+
+def test_pipeline_backpressure(query_data):
+    pipeline = IngestionPipeline(queue_size=10, batch_size=5)
+    depths = []
+
+    async def feed():
+        for query in query_data * 200:
+            metrics = pipeline.metrics()
+            depths.append((metrics.queued, metrics.received - metrics.aggregated))
+            yield query
+
+    metrics = None
+
+    async def main():
+        nonlocal metrics
+        await pipeline.run(feed())
+        metrics = pipeline.metrics()
+
+    asyncio.run(main())
+
+    # Queries wait either in the queue or in one of the batches in flight or being submitted
+    assert max(queued for queued, _ in depths) <= 10
+    assert max(pending for _, pending in depths) <= 10 + 5 * (2 + 2)
+    assert metrics.received == metrics.aggregated == 600
+    assert metrics.queued == metrics.in_flight == 0
+    assert metrics.throughput > 0
+
+
+def test_pipeline_snapshot(query_data):
+    pipeline = IngestionPipeline()
+
+    async def feed(first_seen: asyncio.Event):
+        yield query_data[0]
+        await first_seen.wait()
+        yield query_data[1]
+
+    async def main():
+        first_seen = asyncio.Event()
+        run = asyncio.ensure_future(pipeline.run(feed(first_seen)))
+        while pipeline.metrics().aggregated < 1:
+            await asyncio.sleep(0.01)
+
+        snapshot = pipeline.snapshot()
+        first_seen.set()
+        return snapshot, await run
+
+    snapshot, frequencies = asyncio.run(main())
+
+    assert snapshot.columns == {"column1": 1}
+    assert frequencies.columns == {"column1": 1, "column2": 1}
+
+
+def test_follow_query_data(tmp_path):
+    path = tmp_path / "queries.csv"
+    path.write_text(HEADER + '"SELECT column1\nFROM table1",2021-01-01,2021-01-01\n')
+
+    async def main():
+        stop = asyncio.Event()
+        records = []
+
+        async def collect():
+            async for record in follow_query_data(path, poll_interval=0.01, stop=stop):
+                records.append(record)
+
+        task = asyncio.ensure_future(collect())
+        await asyncio.sleep(0.05)
+        with open(path, "a") as f:
+            # A partially written row is picked up once the rest of it arrives
+            f.write("SELECT column2 FROM ")
+            f.flush()
+            await asyncio.sleep(0.05)
+            f.write("table1,2021-01-02,2021-01-02\n")
+        await asyncio.sleep(0.05)
+        stop.set()
+        await task
+        return records
+
+    records = asyncio.run(main())
+
+    assert records == [
+        QueryData("SELECT column1\nFROM table1", "2021-01-01", "2021-01-01"),
+        QueryData("SELECT column2 FROM table1", "2021-01-02", "2021-01-02"),
+    ]
+
+
+def test_read_query_stream():
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(
+            b"START_TIME,QUERY_TEXT,END_TIME\n"
+            b'2021-01-01,"SELECT ""column1"" FROM table1",2021-01-01\n'
+            b"2021-01-02,SELECT column2 FROM table1,2021-01-02\n"
+        )
+        reader.feed_eof()
+        return await stream_frequencies(read_query_stream(reader))
+
+    frequencies = asyncio.run(main())
+
+    assert frequencies.tables == {"table1": 2}
+    assert frequencies.columns == {"column1": 1, "column2": 1}
@@ -0,0 +1,108 @@
+from sqlprunr.data.generic import Column, Database, Schema, Table
+from sqlprunr.data.query_data import Frequencies
+from sqlprunr.engine.analyzer import find_unused_columns, find_unused_tables
+from sqlprunr.engine.resolver import TableResolver, split_reference
+
+
+def test_split_reference():
+    assert split_reference('DB1."Schema.1".Table1') == ["db1", "schema.1", "table1"]
+
+
+def test_resolve(database):
+    other = Database(
+        name="db2",
+        schemas=[Schema(name="schema1", tables=[Table(name="table1", columns=[])])],
+    )
+    resolver = TableResolver([database, other])
+
+    assert resolver.resolve("DB1.SCHEMA1.TABLE1") == [("db1", "schema1", "table1")]
+    assert resolver.resolve("db3.schema1.table1") == []
+    assert resolver.resolve("table2") == [("db1", "schema1", "table2")]
+    assert resolver.resolve("schema1.table1") == [
+        ("db1", "schema1", "table1"),
+        ("db2", "schema1", "table1"),
+    ]
+
+
+def test_resolve_default_context(database):
+    other = Database(
+        name="db2",
+        schemas=[Schema(name="schema1", tables=[Table(name="table1", columns=[])])],
+    )
+    resolver = TableResolver(
+        [database, other], default_database="DB2", default_schema="SCHEMA1"
+    )
+
+    assert resolver.resolve("table1") == [("db2", "schema1", "table1")]
+    assert resolver.resolve("schema1.table1") == [("db2", "schema1", "table1")]
+    assert resolver.resolve("table2") == [("db1", "schema1", "table2")]
+
+
+def test_find_unused_tables_qualified(database):
+    frequencies = Frequencies(
+        tables={"db1.schema1.table1": 2},
+        columns={"column1": 2},
+        queries={"SELECT column1 FROM db1.schema1.table1": 2},
+    )
+
+    unused_tables = find_unused_tables(frequencies, TableResolver(database))
+
+    assert [table.name for table in unused_tables] == ["table2"]
+
+
+def test_find_unused_tables_100k_tables(benchmark):
+    database = Database(
+        name="db1",
+        schemas=[
+            Schema(
+                name=f"schema{s}",
+                tables=[
+                    Table(name=f"table{t}", columns=[Column(name="id", data_type="NUMBER")])
+                    for t in range(10_000)
+                ],
+            )
+            for s in range(10)
+        ],
+    )
+    frequencies = Frequencies(
+        tables={f"db1.schema{s}.table{t}": 1 for s in range(10) for t in range(0, 10_000, 2)},
+        columns={},
+        queries={},
+    )
+    resolver = TableResolver(database)
+
+    unused_tables = benchmark.pedantic(
+        find_unused_tables, args=(frequencies, resolver), rounds=3
+    )
+
+    assert len(unused_tables) == 50_000
+
+
+def test_find_unused_columns_1m_columns(benchmark):
+    columns = [Column(name=f"column{c}", data_type="NUMBER") for c in range(100)]
+    database = Database(
+        name="db1",
+        schemas=[
+            Schema(
+                name="schema1",
+                tables=[Table(name=f"table{t}", columns=list(columns)) for t in range(10_000)],
+            )
+        ],
+    )
+    frequencies = Frequencies(
+        tables={f"db1.schema1.table{t}": 1 for t in range(0, 10_000, 2)},
+        columns={},
+        queries={},
+        table_columns={
+            f"db1.schema1.table{t}": {f"column{c}": 1 for c in range(0, 100, 2)}
+            for t in range(0, 10_000, 2)
+        },
+    )
+    resolver = TableResolver(database)
+
+    unused_columns = benchmark.pedantic(
+        find_unused_columns, args=(frequencies, resolver), rounds=1
+    )
+
+    assert len(unused_columns) == 10_000
+    assert sum(len(columns) for columns in unused_columns.values()) == 750_000
@@ -0,0 +1,34 @@
+import pytest
+
+from sqlprunr.engine.statements import split_statements
+
+
+@pytest.mark.parametrize(
+    "script, statements",
+    [
+        ("SELECT a FROM t", ["SELECT a FROM t"]),
+        ("SELECT a FROM t;", ["SELECT a FROM t"]),
+        ("  ;;SELECT a FROM t;\n\n;", ["SELECT a FROM t"]),
+        ("SELECT a FROM t; SELECT b FROM t2", ["SELECT a FROM t", "SELECT b FROM t2"]),
+        ("SELECT 'a;b' FROM t; SELECT 1", ["SELECT 'a;b' FROM t", "SELECT 1"]),
+        ("SELECT 'it''s;' FROM t", ["SELECT 'it''s;' FROM t"]),
+        ('SELECT "a;b" FROM t', ['SELECT "a;b" FROM t']),
+        ("CREATE FUNCTION f() AS $$ SELECT 1; $$; SELECT 2", ["CREATE FUNCTION f() AS $$ SELECT 1; $$", "SELECT 2"]),
+        ("SELECT a -- first; statement\nFROM t", ["SELECT a  \nFROM t"]),
+        ("SELECT a /* ; */ FROM t; /* only a comment; */", ["SELECT a   FROM t"]),
+        ("SELECT '--not a comment' FROM t", ["SELECT '--not a comment' FROM t"]),
+        ("SELECT 'unterminated; FROM t", ["SELECT 'unterminated; FROM t"]),
+        ("", []),
+    ],
+)
+def test_split_statements(script, statements):
+    assert list(split_statements(script)) == statements
+
+
+def test_split_statements_script(benchmark):
+    script = ";\n".join(f"INSERT INTO t (a, b) VALUES ({i}, 'x;{i}')" for i in range(10_000))
+
+    statements = benchmark(lambda: list(split_statements(script)))
+
+    assert len(statements) == 10_000
+    assert statements[-1] == "INSERT INTO t (a, b) VALUES (9999, 'x;9999')"
@@ -0,0 +1,75 @@
+import pytest
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.analyzer import find_unused_columns, find_unused_tables, get_frequencies
+from sqlprunr.engine.store import FrequencyStore, get_bucket
+
+
+@pytest.fixture
+def store(tmp_path):
+    with FrequencyStore(tmp_path / "frequencies.sqlite") as store:
+        yield store
+
+
+def test_store_add(store, query_data, benchmark):
+    benchmark.pedantic(store.add, args=(query_data,), rounds=1)
+
+    assert store.buckets() == ["2021-01-01"]
+    assert store.tables == {"db1.schema1.table1": 2, "db1.schema1.table2": 1}
+    assert store.columns == {"column1": 2, "column2": 1}
+    assert store.table_columns == get_frequencies(query_data).table_columns
+
+
+def test_store_incremental(store, query_data):
+    store.add(query_data)
+    store.add(
+        [
+            QueryData(
+                QUERY_TEXT="SELECT column3 FROM db1.schema1.table2",
+                START_TIME="2021-01-02T00:00:00",
+                END_TIME="2021-01-02T00:01:00",
+            )
+        ]
+    )
+
+    assert store.tables == {"db1.schema1.table1": 2, "db1.schema1.table2": 2}
+    assert store.frequencies(since="2021-01-02").tables == {"db1.schema1.table2": 1}
+    assert store.frequencies(until="2021-01-02").columns == {"column1": 2, "column2": 1}
+
+    store.expire("2021-01-02")
+    assert store.buckets() == ["2021-01-02"]
+    assert store.tables == {"db1.schema1.table2": 1}
+
+
+def test_store_subtract(store, query_data):
+    store.add(query_data)
+    store.subtract(get_frequencies(query_data[:1]), "2021-01-01")
+
+    assert store.tables == {"db1.schema1.table1": 1, "db1.schema1.table2": 1}
+    assert store.columns == {"column1": 1, "column2": 1}
+    assert "SELECT column1 FROM db1.schema1.table1" not in store.queries
+
+
+def test_store_persistence(tmp_path, query_data, database):
+    path = tmp_path / "frequencies.sqlite"
+    with FrequencyStore(path) as store:
+        store.add(query_data[:2])
+
+    with FrequencyStore(path) as store:
+        assert [table.name for table in find_unused_tables(store, database)] == ["table2"]
+        assert [
+            column.name for column in find_unused_columns(store, database)["db1.schema1.table2"]
+        ] == ["column3"]
+
+
+def test_store_buckets_utc(store):
+    queries = [
+        QueryData("SELECT column1 FROM table1", "2024-06-22 01:00:00.000 +0200", ""),
+        QueryData("SELECT column1 FROM table1", "2024-06-22T23:30:00-01:00", ""),
+    ]
+
+    store.add(queries)
+
+    # Buckets match the UTC days of UsageTimeline
+    assert store.buckets() == ["2024-06-21", "2024-06-23"]
+    assert [get_bucket(query) for query in queries] == store.buckets()
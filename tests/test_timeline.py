@@ -0,0 +1,49 @@
+import numpy as np
+
+from sqlprunr.data.query_data import QueryData
+from sqlprunr.engine.timeline import get_usage_timeline
+from sqlprunr.engine.timestamps import parse_timestamp
+
+
+def gen_query_data(days: int):
+    return [
+        QueryData(
+            QUERY_TEXT=f"SELECT column{day % 3} FROM db1.schema1.table{day % 2}",
+            START_TIME=str(np.datetime64("2024-01-01T12:00") + np.timedelta64(day, "D")),
+            END_TIME=str(np.datetime64("2024-01-01T12:01") + np.timedelta64(day, "D")),
+        )
+        for day in range(days)
+    ]
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("2024-06-22 17:17:34.245 +0200") == np.datetime64(
+        "2024-06-22T15:17:34.245"
+    )
+    assert parse_timestamp("2021-01-01T00:00:00") == np.datetime64("2021-01-01T00:00:00.000")
+    assert parse_timestamp("2021-01-01T00:00:00Z") == np.datetime64("2021-01-01T00:00:00.000")
+
+
+def test_usage_timeline(query_data):
+    timeline = get_usage_timeline(query_data, freq="h")
+
+    assert timeline.buckets.tolist() == [np.datetime64("2021-01-01T00", "h").item()]
+    assert timeline.window().tables == {"db1.schema1.table1": 2, "db1.schema1.table2": 1}
+    assert timeline.window().columns == {"column1": 2, "column2": 1}
+
+
+def test_usage_timeline_rolling(benchmark):
+    timeline = get_usage_timeline(gen_query_data(365))
+
+    frequencies = benchmark(lambda: timeline.rolling(7))
+    last_used = timeline.last_used("columns")
+
+    assert len(timeline.buckets) == 365
+    assert frequencies.tables == {"db1.schema1.table0": 4, "db1.schema1.table1": 3}
+    assert last_used["column0"] == np.datetime64("2024-12-29")
+    assert last_used["column1"] == np.datetime64("2024-12-30")
+    assert timeline.window(since="2024-01-01", until="2024-01-03").columns == {
+        "column0": 1,
+        "column1": 1,
+    }
+    assert timeline.series("db1.schema1.table1")[:4].tolist() == [0, 1, 0, 1]
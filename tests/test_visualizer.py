@@ -0,0 +1,201 @@
+import re
+import time
+
+import matplotlib
+import pytest
+
+from sqlprunr.data.query_data import Frequencies
+from sqlprunr.engine.visualizer import (
+    frequencies_report,
+    frequency_distribution,
+    paginate_structure,
+    rollup_frequencies,
+    top_frequencies,
+    visualize_frequencies,
+    visualize_structure,
+)
+from sqlprunr.engine.parser.snowflake import SnowflakeCSVTableParser
+from sqlprunr.engine.resolver import TableResolver
+from tests.generators import gen_frequencies, gen_schema_rows
+
+matplotlib.use("Agg")
+
+
+@pytest.fixture
+def frequencies():
+    return Frequencies(
+        tables={
+            "db1.schema1.table1": 5,
+            "DB1.SCHEMA1.TABLE2": 3,
+            "schema2.table3": 3,
+            "table4": 1,
+        },
+        columns={"column1": 4, "column2": 1},
+        queries={"SELECT column1 FROM table1": 4, "SELECT column2\nFROM table2": 1},
+    )
+
+
+def test_top_frequencies(frequencies):
+    assert top_frequencies(frequencies.tables, 2) == {
+        "db1.schema1.table1": 5,
+        "DB1.SCHEMA1.TABLE2": 3,
+        "other (2 entries)": 4,
+    }
+    assert top_frequencies({"a": 1, "b": 2, "c": 2}, 2, other=False) == {"b": 2, "c": 2}
+    assert top_frequencies(frequencies.columns, 10) == frequencies.columns
+
+
+def test_rollup_frequencies(frequencies):
+    assert rollup_frequencies(frequencies.tables) == {
+        "db1.schema1": 8,
+        "schema2": 3,
+        "(unqualified)": 1,
+    }
+    assert rollup_frequencies(frequencies.tables, level="database") == {
+        "db1": 8,
+        "(unqualified)": 4,
+    }
+    # Dots inside quoted names do not split the reference
+    assert rollup_frequencies({'"raw.events".public.table1': 2, "RAW.public.table1": 1}) == {
+        "raw.events.public": 2,
+        "raw.public": 1,
+    }
+    with pytest.raises(ValueError):
+        rollup_frequencies(frequencies.tables, level="table")
+
+
+def test_frequency_distribution():
+    assert frequency_distribution({"a": 1, "b": 2, "c": 3, "d": 9, "e": 0}) == {
+        "1": 1,
+        "2-3": 2,
+        "4-7": 0,
+        "8-15": 1,
+    }
+    assert frequency_distribution({}) == {}
+
+
+def test_visualize_frequencies_single_plot(frequencies):
+    fig = visualize_frequencies(frequencies, show_columns=False, top=2)
+
+    assert len(fig.axes) == 1
+    assert [label.get_text() for label in fig.axes[0].get_yticklabels()] == [
+        "db1.schema1.table1",
+        "DB1.SCHEMA1.TABLE2",
+        "other (2 entries)",
+    ]
+
+
+def test_frequencies_report(frequencies, tmp_path):
+    html = frequencies_report(frequencies, tmp_path / "report.html", top=2)
+
+    assert (tmp_path / "report.html").read_text(encoding="utf-8") == html
+    assert "other (2 entries)" in html
+    assert "SELECT column2 FROM table2" in html
+
+
+def test_frequencies_report_large(capsys):
+    frequencies = gen_frequencies(100_000, seed=1)
+    frequencies.columns = {f"column{i}": i % 1000 + 1 for i in range(100_000)}
+    frequencies.queries = {f"SELECT column{i} FROM table{i}": 1 for i in range(100_000)}
+
+    start = time.perf_counter()
+    html = frequencies_report(frequencies)
+    elapsed = time.perf_counter() - start
+
+    with capsys.disabled():
+        print(f"\nFrequencies report (100k entities): {elapsed:.2f} s, {len(html) / 1024:.0f} KiB")
+
+    # Size depends on top only, not on the number of entities
+    assert len(html) < 100_000
+
+
+def count_nodes(dot) -> int:
+    return sum(1 for line in dot.body if re.match(r"\s*n\d+ \[", line))
+
+
+def test_visualize_structure(database):
+    frequencies = Frequencies(
+        tables={"schema1.table1": 3},
+        columns={},
+        queries={},
+        table_columns={"schema1.table1": {"COLUMN1": 3}},
+    )
+
+    dot = visualize_structure([database], frequencies=frequencies)
+
+    assert count_nodes(dot) == 4
+    assert "table1\n3 uses\n(2 columns)" in dot.source
+    assert "table2\n0 uses\n(1 columns)" in dot.source
+    assert "mistyrose" in dot.source
+
+    dot = visualize_structure([database], frequencies=frequencies, show_columns=True, max_columns=1)
+    assert r"column1 (TEXT) 3 uses\l" in dot.source
+    assert r"… 1 more columns\l" in dot.source
+
+    assert count_nodes(visualize_structure([database], schema="SCHEMA2")) == 0
+
+
+def test_visualize_structure_budget():
+    # 3 schemas of 50 tables
+    databases = SnowflakeCSVTableParser().parse_table(gen_schema_rows(3_000))
+
+    dot = visualize_structure(databases, max_nodes=60)
+
+    # Database, the first schema with all its tables, the second one with the tables that fit
+    assert count_nodes(dot) == 60
+    assert dot.source.count("subgraph cluster_") == 2
+    assert dot.source.count("(20 columns)") == 55
+    assert "\u2026 45 more tables" in dot.source
+    assert "\u2026 1 more schemas" in dot.source
+
+    dot = visualize_structure(databases, database="db0", schema="schema0", show_columns=True)
+    assert count_nodes(dot) == 52
+
+
+def test_visualize_structure_selected_usage(monkeypatch):
+    # db0 with 2 schemas of 50 tables, the same table names repeat in every schema
+    databases = SnowflakeCSVTableParser().parse_table(gen_schema_rows(2_000))
+    frequencies = Frequencies(
+        tables={"table1": 2, "schema1.table2": 3, "db0.schema1.table3": 1},
+        columns={},
+        queries={},
+    )
+    expected = visualize_structure(databases, frequencies=frequencies).source
+
+    added = []
+    add = TableResolver.add
+    monkeypatch.setattr(
+        TableResolver, "add", lambda self, *args: added.append(args) or add(self, *args)
+    )
+    dot = visualize_structure(databases, frequencies=frequencies, database="db0", schema="schema1")
+
+    # Only the drawn schema is indexed, usage of its tables is the same as for the whole account
+    assert len(added) == 50
+    assert "TABLE1\n2 uses" in dot.source and "TABLE2\n3 uses" in dot.source
+    assert all(line in expected for line in dot.source.splitlines() if "uses" in line)
+
+    added.clear()
+    dot = visualize_structure(
+        databases,
+        frequencies=frequencies,
+        schema="schema1",
+        default_database="db0",
+        default_schema="schema0",
+    )
+    # The default schema is indexed as well, bare table1 resolves to schema0 only
+    assert len(added) == 100
+    assert "TABLE1\n0 uses" in dot.source and "TABLE2\n3 uses" in dot.source
+
+
+def test_paginate_structure():
+    databases = SnowflakeCSVTableParser().parse_table(gen_schema_rows(20 * 50 * 12))
+
+    pages = list(paginate_structure(databases, max_nodes=120))
+
+    assert all(count_nodes(page) <= 120 for page in pages)
+    # 12 schemas of 50 tables, two of them fit on a page with their database
+    assert len(pages) == 6
+    assert sum(page.source.count("(20 columns)") for page in pages) == 600
+
+    pages = list(paginate_structure(databases, max_nodes=30))
+    assert 'label="SCHEMA0 (1/2)"' in pages[0].source